@@ -0,0 +1,68 @@
+import statistics
+import time
+from typing import Callable, NamedTuple
+
+from django.db import connection, transaction
+
+
+class Case(NamedTuple):
+    name: str
+    setup: Callable  # setup(data) -> función sin argumentos a medir
+    number: int
+
+
+CASES = {}
+
+
+def benchmark(name, number=200):
+    """Registra un caso. `number` es cuántas llamadas se miden por tamaño."""
+    def decorator(setup):
+        CASES[name] = Case(name, setup, number)
+        return setup
+    return decorator
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def run_case(case, data, number=None):
+    """
+    Mide un caso sobre los datos sembrados y devuelve un dict con tiempos
+    por llamada (ms) y consultas por llamada.
+
+    Cada caso corre dentro de una transacción que se revierte al final,
+    así los casos que escriben no alteran el tamaño de los datos para los
+    demás (y los tiempos de escritura no incluyen el COMMIT).
+    """
+    number = number or case.number
+    timings = []
+    counter = _QueryCounter()
+
+    with transaction.atomic():
+        func = case.setup(data)
+        func()  # calentamiento: caches, plantillas, sentencias preparadas
+        with connection.execute_wrapper(counter):
+            for _ in range(number):
+                start = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - start) * 1000)
+        transaction.set_rollback(True)
+
+    timings.sort()
+    return {
+        "name": case.name,
+        "tickets": data.ticket_count,
+        "number": number,
+        "min_ms": timings[0],
+        "median_ms": statistics.median(timings),
+        "mean_ms": statistics.fmean(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "max_ms": timings[-1],
+        "queries": counter.count / number,
+    }
@@ -0,0 +1,124 @@
+import uuid
+from itertools import count
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory
+
+from apps.common.benchmarks import benchmark
+from apps.common.ids import uuid7
+from apps.dashboard.views import DashboardView
+from apps.stores.models import UnitOccupancy
+from apps.stores.selectors import (
+    get_current_store_for_unit,
+    get_current_stores_for_units,
+    get_occupancy_index,
+    get_store_for_unit_at,
+)
+from apps.tickets.models import Ticket
+from apps.tickets.services.codes import decode_ticket_code, new_ticket_code
+
+
+def _ticket(data):
+    return (Ticket.objects
+            .select_related("parking")
+            .get(code=data.random_ticket_code()))
+
+
+@benchmark("ticket.save.insert")
+def ticket_save_insert(data):
+    numbers = count()
+
+    def run():
+        Ticket(parking=data.rng.choice(data.parkings),
+               code=f"BENCH-{next(numbers)}",
+               plate_number="ABC-123").save()
+    return run
+
+
+@benchmark("ticket.save.update")
+def ticket_save_update(data):
+    ticket = _ticket(data)
+
+    def run():
+        ticket.notes = "benchmark"
+        ticket.save()
+    return run
+
+
+@benchmark("ticket.clean", number=5000)
+def ticket_clean(data):
+    return _ticket(data).clean
+
+
+@benchmark("ticket.calculate_fee", number=5000)
+def ticket_calculate_fee(data):
+    return _ticket(data).calculate_fee
+
+
+@benchmark("ticket.is_expired", number=5000)
+def ticket_is_expired(data):
+    return _ticket(data).is_expired
+
+
+@benchmark("ids.uuid4", number=5000)
+def ids_uuid4(data):
+    return uuid.uuid4
+
+
+@benchmark("ids.uuid7", number=5000)
+def ids_uuid7(data):
+    return uuid7
+
+
+@benchmark("tickets.code.new", number=5000)
+def ticket_code_new(data):
+    parking_id = data.rng.choice(data.parkings).pk
+    return lambda: new_ticket_code(parking_id)
+
+
+@benchmark("tickets.code.decode", number=5000)
+def ticket_code_decode(data):
+    code = new_ticket_code(data.rng.choice(data.parkings).pk)
+    return lambda: decode_ticket_code(code)
+
+
+@benchmark("stores.get_current_store_for_unit")
+def store_for_unit(data):
+    return lambda: get_current_store_for_unit(data.random_unit())
+
+
+@benchmark("stores.get_current_stores_for_units", number=50)
+def stores_for_units(data):
+    return lambda: get_current_stores_for_units(data.units)
+
+
+@benchmark("stores.get_store_for_unit_at", number=5000)
+def store_for_unit_indexed(data):
+    # Índices de todas las ubicaciones: se mide la búsqueda, no su construcción
+    for location_id in {unit.location_id for unit in data.units}:
+        get_occupancy_index(location_id)
+    return lambda: get_store_for_unit_at(data.random_unit())
+
+
+@benchmark("stores.unit_occupancy.clean", number=5000)
+def unit_occupancy_clean(data):
+    return UnitOccupancy.objects.select_related("unit").first().clean
+
+
+@benchmark("dashboard.view.cold", number=10)
+def dashboard_cold(data):
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+
+    def run():
+        cache.clear()
+        DashboardView.as_view()(request).render()
+    return run
+
+
+@benchmark("dashboard.view.warm", number=100)
+def dashboard_warm(data):
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    return lambda: DashboardView.as_view()(request).render()
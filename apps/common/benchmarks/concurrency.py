@@ -0,0 +1,138 @@
+import multiprocessing
+import random
+import shutil
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.db import OperationalError, connections, transaction
+
+from apps.locations.models import Location
+from apps.parkings.models import Parking
+from apps.tickets.models import Ticket
+from apps.tickets.selectors.tickets import get_ticket_row
+from apps.tickets.services.state_machine import TicketStateMachine
+
+# SQLite "plano": journal de rollback, BEGIN diferido y 5 s de espera
+PLAIN_OPTIONS = {'init_command': 'PRAGMA journal_mode=DELETE;'}
+
+
+def prepare_template(path, parkings=4):
+    """
+    Crea la base de plantilla (migrada y con estacionamientos) que se
+    copia para cada perfil. Debe llamarse con la conexión default ya
+    apuntando a `path`.
+    """
+    for n in range(parkings):
+        location = Location.objects.create(name=f"Carga {n + 1}")
+        Parking.objects.create(location=location, capacity=10 ** 6)
+    connections.close_all()
+    return Path(path)
+
+
+def run_profile(template, workdir, name, options, workers, duration, seed=0):
+    """
+    Corre `workers` procesos contra una copia de la plantilla con las
+    OPTIONS dadas durante `duration` segundos. Cada proceso simula una
+    caseta: emite (leyendo el contador dentro de la transacción, como el
+    chequeo de lleno), consulta, paga y da salida a tickets.
+    """
+    database = Path(workdir) / f"{name}.sqlite3"
+    shutil.copyfile(template, database)
+    connections.close_all()
+
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(
+            queue, str(database), options, duration, seed + i, f"{name}-{i}"))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    samples = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return _summarize(name, workers, duration, samples)
+
+
+def _worker(queue, database, options, duration, seed, worker):
+    connection = connections["default"]
+    connection.settings_dict["NAME"] = database
+    connection.settings_dict["OPTIONS"] = options
+
+    rng = random.Random(seed)
+    parking_ids = list(Parking.objects.values_list("pk", flat=True))
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    open_tickets = []
+    number = 0
+
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        if open_tickets and rng.random() < 0.5:
+            ticket = open_tickets.pop(rng.randrange(len(open_tickets)))
+            operations = [("lookup", lambda: get_ticket_row(ticket.code)),
+                          ("pay", lambda: TicketStateMachine(ticket).pay(amount=20)),
+                          ("exit", lambda: TicketStateMachine(ticket).exit())]
+        else:
+            number += 1
+            ticket = Ticket(parking_id=rng.choice(parking_ids),
+                            code=f"{worker}-{number}")
+            operations = [("issue", lambda: _issue(ticket))]
+            open_tickets.append(ticket)
+
+        for operation, func in operations:
+            started = time.perf_counter()
+            try:
+                func()
+            except OperationalError:
+                # "database is locked": el candado no llegó a tiempo
+                errors[operation] += 1
+                break
+            latencies[operation].append((time.perf_counter() - started) * 1000)
+
+    connections.close_all()
+    queue.put({"latencies": dict(latencies), "errors": dict(errors)})
+
+
+def _issue(ticket):
+    # Lee y luego escribe en la misma transacción: con BEGIN diferido, en
+    # WAL falla sin esperar si otro proceso escribió después de la lectura
+    with transaction.atomic():
+        parking = Parking.objects.select_related("counter").get(pk=ticket.parking_id)
+        counter = getattr(parking, "counter", None)
+        if counter is None or not counter.is_full:
+            ticket.save()
+
+
+def _summarize(name, workers, duration, samples):
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    for sample in samples:
+        for operation, values in sample["latencies"].items():
+            latencies[operation] += values
+        for operation, count in sample["errors"].items():
+            errors[operation] += count
+
+    operations = {}
+    for operation in sorted(set(latencies) | set(errors)):
+        values = sorted(latencies[operation])
+        operations[operation] = {
+            "ok": len(values),
+            "errors": errors[operation],
+            "p50_ms": statistics.median(values) if values else None,
+            "p95_ms": values[int(len(values) * 0.95)] if values else None,
+            "p99_ms": values[int(len(values) * 0.99)] if values else None,
+            "max_ms": values[-1] if values else None,
+        }
+    completed = sum(len(values) for values in latencies.values())
+    return {
+        "profile": name,
+        "workers": workers,
+        "duration_s": duration,
+        "ops_per_s": completed / duration,
+        "errors": sum(errors.values()),
+        "operations": operations,
+    }
@@ -0,0 +1,31 @@
+from apps.common.seeding import ParkingDataSeeder
+
+
+class BenchmarkData:
+    """
+    Datos de los benchmarks, sembrados con ParkingDataSeeder (los mismos
+    que genera seed_parking_data). grow_to() agrega tickets hasta llegar
+    al total pedido, para medir tamaños crecientes sin resembrar.
+    """
+
+    def __init__(self, locations=4, units_per_location=100, days=90, seed=42):
+        self.seeder = ParkingDataSeeder(seed=seed, days=days)
+        self.seeder.seed_locations(locations, units_per_location)
+        self.rng = self.seeder.rng
+        self.parkings = self.seeder.parkings
+        self.units = self.seeder.units
+
+    @property
+    def ticket_count(self):
+        return self.seeder.ticket_count
+
+    def grow_to(self, total):
+        if total > self.ticket_count:
+            self.seeder.seed_tickets(total - self.ticket_count)
+            self.seeder.finish()
+
+    def random_ticket_code(self):
+        return self.seeder.ticket_code(self.rng.randrange(self.ticket_count))
+
+    def random_unit(self):
+        return self.rng.choice(self.units)
@@ -0,0 +1,100 @@
+import time
+import uuid
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.common.ids import uuid7
+from apps.locations.models import Location
+from apps.parkings.models import Parking
+from apps.tickets.models import Ticket
+
+GENERATORS = {4: uuid.uuid4, 7: uuid7}
+
+
+def run_variant(version, rows, chunk=100_000):
+    """
+    Inserta `rows` tickets con llaves UUID de la versión dada en bloques
+    de `chunk` (una transacción por bloque, como casetas que confirman
+    cada emisión) y devuelve el throughput de cada bloque y el tamaño del
+    índice de la llave primaria al final. Debe llamarse sobre una base
+    recién migrada: el resultado depende del tamaño de la tabla.
+
+    Se usa executemany directo para que el costo medido sea el de la base
+    (el índice) y no el del ORM; la llave se genera fila por fila como lo
+    haría default_uuid.
+    """
+    generate = GENERATORS[version]
+    parking = Parking.objects.create(
+        location=Location.objects.create(name=f"UUID v{version}"), capacity=10 ** 9)
+
+    fields = [Ticket._meta.get_field(name) for name in (
+        "id", "code", "parking", "created_at", "updated_at", "amount",
+        "discount_applied", "notes", "status", "plate_normalized")]
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        connection.ops.quote_name(Ticket._meta.db_table),
+        ", ".join(connection.ops.quote_name(field.column) for field in fields),
+        ", ".join(["%s"] * len(fields)),
+    )
+    id_field, created_field = fields[0], fields[3]
+    constants = [field.get_db_prep_save(value, connection) for field, value in zip(
+        fields[5:], (0, 0, "", Ticket.Status.EXITED, ""))]
+    started_at = timezone.now() - timedelta(seconds=rows)
+
+    chunks = []
+    inserted = 0
+    total_s = 0.0
+    while inserted < rows:
+        size = min(chunk, rows - inserted)
+        start = time.perf_counter()
+        batch = []
+        for number in range(inserted, inserted + size):
+            created = created_field.get_db_prep_save(
+                started_at + timedelta(seconds=number), connection)
+            batch.append((id_field.get_db_prep_save(generate(), connection),
+                          f"U{version}-{number}", parking.pk, created, created,
+                          *constants))
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, batch)
+        elapsed = time.perf_counter() - start
+        total_s += elapsed
+        inserted += size
+        chunks.append({"rows": inserted, "rows_per_s": size / elapsed})
+
+    return {
+        "version": version,
+        "rows": rows,
+        "rows_per_s": rows / total_s,
+        "chunks": chunks,
+        "pk_index": primary_key_index_stats(),
+    }
+
+
+def primary_key_index_stats():
+    """
+    Tamaño del índice de la llave primaria de tickets. En SQLite incluye
+    el porcentaje de llenado de las páginas (dbstat). SQLite redistribuye
+    entre páginas hermanas al partir, así que con llaves aleatorias el
+    índice crece poco; la diferencia está en que cada INSERT toca una
+    página distinta (caché). En PostgreSQL las llaves aleatorias dejan
+    el B-tree notablemente más grande que las secuenciales.
+    """
+    table = Ticket._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"PRAGMA index_list({connection.ops.quote_name(table)})")
+            name = next(row[1] for row in cursor.fetchall() if row[3] == "pk")
+            cursor.execute(
+                "SELECT COUNT(*), SUM(pgsize), SUM(unused) FROM dbstat WHERE name = %s",
+                [name])
+            pages, size, unused = cursor.fetchone()
+            return {"name": name, "pages": pages, "bytes": size,
+                    "fill": 1 - unused / size}
+        cursor.execute(
+            "SELECT indexrelid::regclass::text, pg_relation_size(indexrelid), "
+            "pg_relation_size(indexrelid) / current_setting('block_size')::int "
+            "FROM pg_index WHERE indrelid = %s::regclass AND indisprimary",
+            [table])
+        name, size, pages = cursor.fetchone()
+        return {"name": name, "pages": pages, "bytes": size, "fill": None}
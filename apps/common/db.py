@@ -0,0 +1,96 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Lecturas de esta petición/tarea permitidas en réplicas
+_replica_reads = ContextVar("replica_reads", default=False)
+# Hubo una escritura (o la sesión sigue en ventana de stickiness): todo al primario
+_pinned = ContextVar("pinned_to_primary", default=False)
+
+
+def replica_aliases():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+@contextmanager
+def use_replicas(enabled=True):
+    """Permite (o impide) leer de réplicas dentro del bloque."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def pin_to_primary():
+    """Fuerza lecturas y escrituras al primario dentro del bloque."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def wrote_to_primary():
+    return _pinned.get()
+
+
+def replica_reads_allowed():
+    return _replica_reads.get()
+
+
+def allow_replica_reads():
+    """Permite leer de réplicas en lo que resta de routing_scope()."""
+    _replica_reads.set(True)
+
+
+@contextmanager
+def routing_scope(pinned=False):
+    """
+    Aísla el estado de ruteo de una petición: lo que se marque dentro
+    (lecturas en réplica, escrituras) no se filtra a la siguiente
+    petición atendida por el mismo hilo.
+    """
+    replica_token = _replica_reads.set(False)
+    pinned_token = _pinned.set(pinned)
+    try:
+        yield
+    finally:
+        _pinned.reset(pinned_token)
+        _replica_reads.reset(replica_token)
+
+
+class ReadReplicaRouter:
+    """
+    Escrituras siempre al primario (default). Las lecturas van a una
+    réplica al azar solo dentro de use_replicas() (lo activa
+    ReplicaRoutingMiddleware para reportes y listados del admin) y
+    mientras no se haya escrito en el mismo contexto, para que la
+    petición lea lo que acaba de escribir.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if replicas and _replica_reads.get() and not _pinned.get():
+            return random.choice(replicas)
+        return None
+
+    def db_for_write(self, model, **hints):
+        _pinned.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Las réplicas reciben el esquema por replicación
+        if db in replica_aliases():
+            return False
+        return None
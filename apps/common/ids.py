@@ -0,0 +1,57 @@
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7():
+    """
+    UUID versión 7 (RFC 9562): 48 bits de milisegundos Unix, 12 bits de
+    contador dentro del mismo milisegundo y 62 bits aleatorios. Los ids
+    generados por un proceso son crecientes, así que los INSERT caen al
+    final del índice de la llave primaria en lugar de repartirse por todo
+    el árbol.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2)) & 0x7FF  # deja margen al contador
+        else:
+            # Mismo milisegundo (o reloj hacia atrás): se incrementa el
+            # contador y, si se desborda, se avanza el milisegundo
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms += 1
+                _counter = 0
+        timestamp, counter = _last_ms, _counter
+
+    value = (timestamp & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76
+    value |= counter << 64
+    value |= 0b10 << 62
+    value |= int.from_bytes(os.urandom(8)) & 0x3FFF_FFFF_FFFF_FFFF
+    return uuid.UUID(int=value)
+
+
+def uuid7_time(value):
+    """Milisegundos Unix codificados en un UUIDv7."""
+    return value.int >> 80
+
+
+def default_uuid():
+    """
+    Default de UUIDModel.id: uuid4 aleatorio o, con
+    UUID_PRIMARY_KEY_VERSION = 7, uuid7 ordenado por tiempo. Se resuelve
+    en cada llamada, así que cambiar el ajuste no requiere migración.
+    """
+    if getattr(settings, "UUID_PRIMARY_KEY_VERSION", 4) == 7:
+        return uuid7()
+    return uuid.uuid4()
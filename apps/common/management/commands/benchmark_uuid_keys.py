@@ -0,0 +1,69 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.common.benchmarks.uuid_keys import GENERATORS, run_variant
+
+
+class Command(BaseCommand):
+    help = ("Compara el throughput de INSERT y el tamaño del índice de la llave "
+            "primaria de tickets con llaves uuid4 y uuid7, cada una sobre una "
+            "base nueva.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2_000_000,
+                            help="Tickets a insertar por versión.")
+        parser.add_argument("--chunk", type=int, default=100_000,
+                            help="Filas por transacción.")
+        parser.add_argument("--versions", type=int, nargs="+", default=[4, 7],
+                            choices=sorted(GENERATORS))
+        parser.add_argument("--output", help="Guarda los resultados en JSON.")
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ("sqlite", "postgresql"):
+            raise CommandError("Solo aplica a SQLite y PostgreSQL.")
+        settings.DEBUG = False
+
+        results = []
+        with tempfile.TemporaryDirectory() as workdir:
+            for version in options["versions"]:
+                if connection.vendor == "sqlite":
+                    # En archivo: en memoria no hay E/S ni límite de caché
+                    connection.settings_dict.setdefault("TEST", {})["NAME"] = str(
+                        Path(workdir) / f"uuid{version}.sqlite3")
+                old_name = connection.creation.create_test_db(
+                    verbosity=0, autoclobber=True, serialize=False)
+                try:
+                    self.stdout.write(f"uuid{version}: {options['rows']:,} tickets...")
+                    result = run_variant(version, options["rows"], options["chunk"])
+                finally:
+                    connection.creation.destroy_test_db(old_name, verbosity=0)
+                results.append(result)
+                self._report(result)
+
+        if len(results) > 1:
+            self._compare(results[0], results[-1])
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(results, indent=2))
+
+    def _report(self, result):
+        index = result["pk_index"]
+        fill = f", {index['fill']:.0%} lleno" if index["fill"] is not None else ""
+        last = result["chunks"][-1]["rows_per_s"]
+        self.stdout.write(
+            f"  {result['rows_per_s']:,.0f} filas/s en promedio, "
+            f"{last:,.0f} filas/s en el último bloque")
+        self.stdout.write(
+            f"  índice {index['name']}: {index['bytes'] / 2 ** 20:,.1f} MiB "
+            f"({index['pages']:,} páginas{fill})")
+
+    def _compare(self, before, after):
+        speedup = after["rows_per_s"] / before["rows_per_s"]
+        size = after["pk_index"]["bytes"] / before["pk_index"]["bytes"]
+        self.stdout.write(self.style.SUCCESS(
+            f"uuid{after['version']} vs uuid{before['version']}: "
+            f"{speedup:.2f}x throughput, índice {size:.0%} del tamaño"))
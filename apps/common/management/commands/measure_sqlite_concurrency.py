@@ -0,0 +1,66 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.common.benchmarks.concurrency import PLAIN_OPTIONS, prepare_template, run_profile
+
+
+class Command(BaseCommand):
+    help = ("Mide escrituras concurrentes de casetas (varios procesos) sobre "
+            "SQLite con el perfil plano y con SQLITE_TUNED_OPTIONS.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8,
+                            help="Procesos simultáneos (casetas/workers).")
+        parser.add_argument("--duration", type=float, default=10,
+                            help="Segundos por perfil.")
+        parser.add_argument("--profile", choices=["plain", "tuned", "both"],
+                            default="both")
+        parser.add_argument("--output", help="Guarda los resultados en JSON.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Solo aplica a SQLite.")
+        # Sin DEBUG: cada worker registraría todas sus consultas
+        settings.DEBUG = False
+
+        profiles = {"plain": PLAIN_OPTIONS, "tuned": settings.SQLITE_TUNED_OPTIONS}
+        if options["profile"] != "both":
+            profiles = {options["profile"]: profiles[options["profile"]]}
+
+        results = []
+        with tempfile.TemporaryDirectory() as workdir:
+            template = Path(workdir) / "template.sqlite3"
+            connection.settings_dict["OPTIONS"] = PLAIN_OPTIONS
+            connection.settings_dict.setdefault("TEST", {})["NAME"] = str(template)
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False)
+            try:
+                prepare_template(template)
+                for name, profile_options in profiles.items():
+                    self.stdout.write(
+                        f"{name}: {options['workers']} procesos durante {options['duration']} s...")
+                    result = run_profile(template, workdir, name, profile_options,
+                                         options["workers"], options["duration"])
+                    results.append(result)
+                    self._report(result)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(results, indent=2))
+
+    def _report(self, result):
+        style = self.style.SUCCESS if not result["errors"] else self.style.WARNING
+        self.stdout.write(style(
+            f"  {result['ops_per_s']:,.0f} ops/s, {result['errors']} errores de candado"))
+        for operation, stats in result["operations"].items():
+            p95 = f"{stats['p95_ms']:.1f}" if stats["p95_ms"] is not None else "-"
+            p99 = f"{stats['p99_ms']:.1f}" if stats["p99_ms"] is not None else "-"
+            self.stdout.write(
+                f"    {operation:<8} {stats['ok']:>7} ok {stats['errors']:>5} err  "
+                f"p95 {p95} ms  p99 {p99} ms")
@@ -0,0 +1,32 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = ("Copia la base SQLite principal a las réplicas de DATABASE_REPLICAS "
+            "(API de backup de SQLite). Sirve para probar el ruteo de lecturas "
+            "en local; ejecútelo periódicamente para simular el retraso.")
+
+    def handle(self, *args, **options):
+        primary = connections["default"]
+        if primary.vendor != "sqlite":
+            raise CommandError("Solo aplica cuando default es SQLite.")
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError("No hay réplicas configuradas (SQLITE_REPLICAS).")
+
+        primary.ensure_connection()
+        for alias in settings.DATABASE_REPLICAS:
+            replica = connections[alias]
+            if replica.vendor != "sqlite":
+                continue
+            replica.close()
+            target = sqlite3.connect(replica.settings_dict["NAME"])
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            self.stdout.write(self.style.SUCCESS(
+                f"{alias}: copiada a {replica.settings_dict['NAME']}"))
@@ -0,0 +1,144 @@
+import json
+import platform
+import subprocess
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.common.benchmarks import CASES, run_case
+from apps.common.benchmarks import cases  # noqa: F401 registra los casos
+from apps.common.benchmarks.fixtures import BenchmarkData
+
+
+class Command(BaseCommand):
+    help = ("Corre los micro-benchmarks de modelos, selectores y vistas sobre "
+            "una base de datos de prueba sembrada y guarda los resultados en JSON.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default="10000,100000,1000000",
+            help="Tamaños de la tabla de tickets, separados por coma.",
+        )
+        parser.add_argument(
+            "--case", action="append", default=[],
+            help="Solo los casos cuyo nombre empieza con este prefijo (repetible).",
+        )
+        parser.add_argument(
+            "--number", type=int,
+            help="Llamadas medidas por caso (default: la del caso).",
+        )
+        parser.add_argument(
+            "--output",
+            help="Archivo JSON de salida (default: benchmarks/results/<fecha>-<commit>.json).",
+        )
+        parser.add_argument(
+            "--compare",
+            help="JSON de una corrida anterior para mostrar la diferencia de medianas.",
+        )
+        parser.add_argument(
+            "--database-file",
+            help="Archivo SQLite para la base de prueba (default: en memoria).",
+        )
+        parser.add_argument("--list", action="store_true", help="Lista los casos y sale.")
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for name, case in CASES.items():
+                self.stdout.write(f"{name} (x{case.number})")
+            return
+
+        selected = [case for name, case in CASES.items()
+                    if not options["case"]
+                    or any(name.startswith(prefix) for prefix in options["case"])]
+        if not selected:
+            raise CommandError("Ningún caso coincide con --case.")
+        try:
+            sizes = sorted(int(size) for size in options["sizes"].split(","))
+        except ValueError:
+            raise CommandError("--sizes debe ser una lista de enteros.")
+
+        self._load_baseline(options["compare"])
+        results = self._run(selected, sizes, options)
+
+        output = Path(options["output"] or self._default_output())
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(
+            {"meta": self._meta(), "results": results}, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Resultados en {output}"))
+
+    def _run(self, selected, sizes, options):
+        # Sin DEBUG: el registro de consultas distorsiona tiempos y memoria
+        settings.DEBUG = False
+        if options["database_file"]:
+            connection.settings_dict.setdefault("TEST", {})["NAME"] = options["database_file"]
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False)
+        try:
+            data = BenchmarkData()
+            results = []
+            for size in sizes:
+                self.stdout.write(f"Sembrando {size} tickets...")
+                data.grow_to(size)
+                # bulk_create no emite señales: se descartan los caches
+                cache.clear()
+                for case in selected:
+                    result = run_case(case, data, options["number"])
+                    results.append(result)
+                    self._report(result)
+            return results
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def _report(self, result):
+        self.stdout.write(
+            f"  {result['name']:<40} {result['median_ms']:>9.3f} ms  "
+            f"p95 {result['p95_ms']:>9.3f} ms  {result['queries']:>6.1f} q"
+            + self._delta(result))
+
+    def _load_baseline(self, path):
+        self._baseline = {}
+        if not path:
+            return
+        try:
+            previous = json.loads(Path(path).read_text())
+        except (OSError, ValueError) as e:
+            raise CommandError(f"No se pudo leer {path}: {e}")
+        self._baseline = {(r["name"], r["tickets"]): r for r in previous["results"]}
+
+    def _delta(self, result):
+        previous = self._baseline.get((result["name"], result["tickets"]))
+        if not previous or not previous["median_ms"]:
+            return ""
+        change = (result["median_ms"] / previous["median_ms"] - 1) * 100
+        return f"  ({change:+.1f}% vs base)"
+
+    def _meta(self):
+        return {
+            "created_at": timezone.now().isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "database_version": ".".join(map(str, connection.Database.sqlite_version_info))
+            if connection.vendor == "sqlite" else None,
+        }
+
+    def _default_output(self):
+        stamp = timezone.now().strftime("%Y%m%d-%H%M%S")
+        commit = _git_commit() or "local"
+        return settings.BASE_DIR / "benchmarks" / "results" / f"{stamp}-{commit}.json"
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
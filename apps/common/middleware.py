@@ -0,0 +1,270 @@
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from fnmatch import fnmatchcase
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from apps.common.db import (
+    allow_replica_reads,
+    replica_reads_allowed,
+    replica_aliases,
+    routing_scope,
+    wrote_to_primary,
+)
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("queries", "db_ms", "render_ms", "total_ms", "bytes")
+
+
+class RequestBudgetExceeded(Exception):
+    pass
+
+
+class RequestMetrics:
+    """Mediciones de una petición; también es el execute_wrapper de la BD."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_ms = 0.0
+        self.render_ms = 0.0
+        self._render_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - started) * 1000
+
+    def start_render(self):
+        self._render_started = time.perf_counter()
+
+    def end_render(self, response):
+        self.render_ms += (time.perf_counter() - self._render_started) * 1000
+
+    def as_dict(self, response):
+        return {
+            "queries": self.queries,
+            "db_ms": self.db_ms,
+            "render_ms": self.render_ms,
+            "total_ms": (time.perf_counter() - self.started) * 1000,
+            # Las respuestas en streaming no tienen tamaño al salir de la vista
+            "bytes": None if response.streaming else len(response.content),
+        }
+
+
+class RequestStats:
+    """
+    Muestras recientes por nombre de URL, en memoria del proceso (cada
+    worker lleva las suyas). Guarda las últimas REQUEST_STATS_SAMPLES
+    peticiones de cada vista para calcular percentiles.
+    """
+
+    def __init__(self, samples):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._views = defaultdict(
+                lambda: {name: deque(maxlen=self.samples) for name in METRICS})
+            self._counts = defaultdict(int)
+
+    def record(self, view_name, values):
+        with self._lock:
+            samples = self._views[view_name]
+            for name, value in values.items():
+                if value is not None:
+                    samples[name].append(value)
+            self._counts[view_name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            views = {view_name: {name: sorted(values) for name, values in samples.items()}
+                     for view_name, samples in self._views.items()}
+            counts = dict(self._counts)
+        return {
+            view_name: {
+                "requests": counts[view_name],
+                **{name: _percentiles(values) for name, values in samples.items()},
+            }
+            for view_name, samples in sorted(views.items())
+        }
+
+
+def _percentiles(values):
+    if not values:
+        return None
+
+    def at(fraction):
+        return values[min(len(values) - 1, int(len(values) * fraction))]
+
+    return {
+        "p50": at(0.50),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "max": values[-1],
+        "mean": sum(values) / len(values),
+    }
+
+
+request_stats = RequestStats(getattr(settings, "REQUEST_STATS_SAMPLES", 1000))
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Registra por nombre de URL las consultas y el tiempo de BD (con
+    connection.execute_wrapper en todas las conexiones), el tiempo de
+    render de las TemplateResponse, el tiempo total y el tamaño de la
+    respuesta. Compara cada petición con REQUEST_BUDGETS y, si se excede,
+    lo registra en el log o levanta RequestBudgetExceeded según
+    REQUEST_BUDGET_ACTION. Funciona con vistas síncronas y asíncronas.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.budgets = settings.REQUEST_BUDGETS
+        self.action = settings.REQUEST_BUDGET_ACTION
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = request._request_metrics = RequestMetrics()
+        with self._wrap_connections(metrics):
+            response = self.get_response(request)
+        self._finish(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        metrics = request._request_metrics = RequestMetrics()
+        # Las conexiones son por hilo: el ORM (también el asíncrono) consulta
+        # desde el hilo sync_to_async de la petición, así que ahí se instalan
+        wrappers = await sync_to_async(self._wrap_connections)(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(wrappers.close)()
+        self._finish(request, response, metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        # Se llama justo antes de render(); el callback marca el final
+        metrics = request._request_metrics
+        metrics.start_render()
+        response.add_post_render_callback(metrics.end_render)
+        return response
+
+    @staticmethod
+    def _wrap_connections(metrics):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics))
+        return stack
+
+    def _finish(self, request, response, metrics):
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else "<unresolved>"
+        values = metrics.as_dict(response)
+        request_stats.record(view_name, values)
+        self._check_budget(view_name, values)
+
+    def _check_budget(self, view_name, values):
+        budget = self.budgets.get(view_name, self.budgets.get("*"))
+        if not budget:
+            return
+        exceeded = {name: (values[name], limit) for name, limit in budget.items()
+                    if values.get(name) is not None and values[name] > limit}
+        if not exceeded:
+            return
+        detail = ", ".join(f"{name}={value:g} (máx {limit:g})"
+                           for name, (value, limit) in exceeded.items())
+        message = f"{view_name} excedió su presupuesto: {detail}"
+        if self.action == "raise":
+            raise RequestBudgetExceeded(message)
+        logger.warning(message)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Activa las lecturas en réplicas (ver apps.common.db) para las vistas
+    de REPLICA_READ_VIEWS con métodos seguros. Tras una petición que
+    escribe se envía una cookie por REPLICA_STICKY_SECONDS: mientras
+    exista, las peticiones de ese navegador leen del primario y ven sus
+    propios cambios aunque la réplica vaya atrasada.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.views = settings.REPLICA_READ_VIEWS
+        self.cookie = settings.REPLICA_STICKY_COOKIE
+        self.sticky_seconds = settings.REPLICA_STICKY_SECONDS
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with routing_scope(pinned=self._sticky(request)):
+            response = self.get_response(request)
+            return self._finish(request, response)
+
+    async def __acall__(self, request):
+        with routing_scope(pinned=self._sticky(request)):
+            response = await self.get_response(request)
+            return self._finish(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method in ("GET", "HEAD") and self._replica_view(request):
+            allow_replica_reads()
+
+    def _replica_view(self, request):
+        view_name = request.resolver_match.view_name
+        return any(fnmatchcase(view_name, pattern) for pattern in self.views)
+
+    def _sticky(self, request):
+        return request.method not in ("GET", "HEAD", "OPTIONS") or self.cookie in request.COOKIES
+
+    def _finish(self, request, response):
+        if wrote_to_primary() and self.cookie not in request.COOKIES:
+            response.set_cookie(self.cookie, "1", max_age=self.sticky_seconds,
+                                httponly=True, samesite="Lax")
+        if response.streaming and replica_reads_allowed() and not wrote_to_primary():
+            # El contenido se genera después de salir del middleware
+            wrap = _aread_from_replicas if response.is_async else _read_from_replicas
+            response.streaming_content = wrap(response.streaming_content)
+        return response
+
+
+def _read_from_replicas(content):
+    with routing_scope():
+        allow_replica_reads()
+        yield from content
+
+
+async def _aread_from_replicas(content):
+    with routing_scope():
+        allow_replica_reads()
+        async for chunk in content:
+            yield chunk
@@ -1,10 +1,13 @@
-import uuid
 from django.db import models
+from django.utils import timezone
+
+from apps.common.ids import default_uuid
 
 class UUIDModel(models.Model):
+    # uuid4 o uuid7 según UUID_PRIMARY_KEY_VERSION (ver apps.common.ids)
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        default=default_uuid,
         editable=False
     )
 
@@ -13,7 +16,9 @@ class UUIDModel(models.Model):
 
 
 class TimeStampedModel(models.Model):
-    created_at = models.DateTimeField(auto_now_add=True)
+    # default en lugar de auto_now_add: permite registrar la hora real de
+    # entrada cuando los tickets se emiten en lote desde las casetas.
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -0,0 +1,231 @@
+import math
+import random
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from itertools import accumulate
+from typing import NamedTuple
+
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.dashboard.metrics import invalidate_dashboard_metrics
+from apps.locations.models import Location
+from apps.parkings.models import Parking
+from apps.stores.models import CommercialUnit, Store, UnitOccupancy
+from apps.stores.selectors.unit_occupancy import invalidate_occupancy_index
+from apps.tickets.models import Ticket, normalize_plate
+from apps.tickets.services.counters import reconcile_counters
+
+Status = Ticket.Status
+
+# Llegadas relativas por hora local (0-23): valle nocturno, comida y tarde
+HOURLY_ARRIVALS = (
+    1, 1, 1, 1, 1, 2, 4, 8, 12, 14, 16, 20,
+    24, 24, 20, 18, 20, 24, 26, 24, 18, 12, 6, 2,
+)
+# Llegadas relativas por día de la semana (lunes = 0): picos en fin de semana
+WEEKDAY_ARRIVALS = (8, 8, 9, 10, 13, 16, 14)
+
+# Tickets cerrados (la estancia terminó antes de `end`) y abiertos
+CLOSED_STATUSES = {
+    Status.EXITED: 92,
+    Status.EXPIRED: 4,
+    Status.LOST: 2,
+    Status.CANCELED: 2,
+}
+OPEN_STATUSES = {
+    Status.ISSUED: 70,
+    Status.VALIDATED: 15,
+    Status.PAID: 15,
+}
+
+STAY_MEDIAN_MINUTES = 90
+HOURLY_RATE = 20
+VALIDATION_RATE = 0.25  # tickets cerrados con validación de tienda
+PLATE_LETTERS = "ABCDEFGHJKLMNPRSTUVWXYZ"
+
+
+class SeedResult(NamedTuple):
+    locations: int
+    units: int
+    stores: int
+    occupancies: int
+    tickets: int
+
+
+class ParkingDataSeeder:
+    """
+    Genera datos sintéticos realistas y deterministas para una semilla y
+    un instante final `end`: plazas con estacionamiento, unidades con
+    histórico de ocupación sin traslapes y tickets con curvas de llegada
+    por hora y día, estancias log-normales y mezcla de estados.
+
+    Todo se escribe con bulk_create en lotes grandes dentro de
+    transacciones de `transaction_rows` filas; al final una sola sentencia
+    ajusta updated_at (bulk_create siempre pone la hora actual) y se
+    reconcilian los contadores.
+    """
+
+    def __init__(self, seed=42, end=None, days=90, batch_size=5000,
+                 transaction_rows=50000):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.end = end or timezone.now()
+        self.days = days
+        self.batch_size = batch_size
+        self.transaction_rows = transaction_rows
+        self.code_prefix = f"S{seed}-"
+        self.parkings = []
+        self.units = []
+        self.stores = []
+        self.stores_by_location = {}
+        self.occupancy_count = 0
+        self.ticket_count = 0
+        self._slots, self._slot_weights = self._arrival_slots()
+
+    def seeded(self):
+        """True si esta semilla ya sembró tickets (los códigos chocarían)."""
+        return Ticket.objects.filter(code__startswith=self.code_prefix).exists()
+
+    def seed_locations(self, count, units_per_location):
+        with transaction.atomic():
+            for n in range(count):
+                location = Location.objects.create(
+                    name=f"Plaza {self.seed}-{n + 1}",
+                    capacity=self.rng.randint(300, 1500),
+                )
+                self.parkings.append(Parking.objects.create(
+                    location=location, capacity=location.capacity))
+                self.units += CommercialUnit.objects.bulk_create(
+                    CommercialUnit(id=self._uuid(), location=location,
+                                   code=f"L-{i:03d}")
+                    for i in range(units_per_location))
+
+            # Más tiendas que unidades: algunas cierran y otras las reemplazan
+            self.stores = Store.objects.bulk_create(
+                Store(id=self._uuid(), name=f"Tienda {self.seed}-{i}")
+                for i in range(len(self.units) * 3 // 2))
+            self._seed_occupancies()
+        invalidate_occupancy_index()
+
+    def _seed_occupancies(self):
+        # Ocupaciones consecutivas con huecos de al menos un día; la última
+        # suele quedar abierta. El histórico arranca un año antes que los tickets.
+        history_start = self.end - timedelta(days=self.days + 365)
+        occupancies = []
+        for unit in self.units:
+            at = history_start + timedelta(days=self.rng.uniform(0, 60))
+            while at < self.end:
+                length = timedelta(days=self.rng.lognormvariate(math.log(240), 0.7))
+                store = self.rng.choice(self.stores)
+                self.stores_by_location.setdefault(unit.location_id, []).append(store)
+                ends = at + length
+                if ends >= self.end:
+                    # Una de cada diez unidades quedó vacía recientemente
+                    vacated = self.end - timedelta(days=1)
+                    closes = self.rng.random() < 0.1 and at < vacated
+                    occupancies.append(UnitOccupancy(
+                        unit=unit, store=store, start_date=at,
+                        end_date=vacated if closes else None))
+                    break
+                occupancies.append(UnitOccupancy(
+                    unit=unit, store=store, start_date=at, end_date=ends))
+                at = ends + timedelta(days=self.rng.uniform(1, 45))
+        UnitOccupancy.objects.bulk_create(occupancies, batch_size=self.batch_size)
+        self.occupancy_count += len(occupancies)
+
+    def seed_tickets(self, total):
+        """Agrega `total` tickets repartidos entre los estacionamientos."""
+        weights = list(accumulate(parking.capacity for parking in self.parkings))
+        remaining = total
+        while remaining:
+            size = min(self.transaction_rows, remaining)
+            parkings = self.rng.choices(self.parkings, cum_weights=weights, k=size)
+            with transaction.atomic():
+                Ticket.objects.bulk_create(
+                    self._tickets(parkings), batch_size=self.batch_size)
+            self.ticket_count += size
+            remaining -= size
+
+    def finish(self):
+        """Ajusta updated_at de lo sembrado e invalida contadores y caches."""
+        tolerance = timedelta(minutes=15)
+        (Ticket.objects
+         .filter(code__startswith=self.code_prefix)
+         .update(updated_at=Case(
+             When(status=Status.EXPIRED, then=F("created_at") + Value(tolerance)),
+             default=Coalesce("exit_time", "paid_at", "created_at"),
+         )))
+        reconcile_counters()
+        invalidate_dashboard_metrics()
+        return SeedResult(
+            locations=len(self.parkings),
+            units=len(self.units),
+            stores=len(self.stores),
+            occupancies=self.occupancy_count,
+            tickets=self.ticket_count,
+        )
+
+    def ticket_code(self, n):
+        return f"{self.code_prefix}{n:09d}"
+
+    def _uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _arrival_slots(self):
+        # Una franja por hora en la ventana, con peso hora local x día
+        start = (self.end - timedelta(days=self.days)).replace(
+            minute=0, second=0, microsecond=0)
+        slots, weights = [], []
+        at = start
+        while at < self.end:
+            local = timezone.localtime(at)
+            slots.append(at)
+            weights.append(HOURLY_ARRIVALS[local.hour] * WEEKDAY_ARRIVALS[local.weekday()])
+            at += timedelta(hours=1)
+        return slots, list(accumulate(weights))
+
+    def _tickets(self, parkings):
+        rng = self.rng
+        closed, closed_weights = list(CLOSED_STATUSES), list(CLOSED_STATUSES.values())
+        open_, open_weights = list(OPEN_STATUSES), list(OPEN_STATUSES.values())
+        slots = rng.choices(self._slots, cum_weights=self._slot_weights, k=len(parkings))
+
+        for i, (parking, slot) in enumerate(zip(parkings, slots)):
+            created_at = min(slot + timedelta(seconds=rng.randrange(3600)), self.end)
+            minutes = min(max(rng.lognormvariate(math.log(STAY_MEDIAN_MINUTES), 0.6), 5), 720)
+            left_at = created_at + timedelta(minutes=minutes)
+            hours = max(1, math.ceil(minutes / 60))
+
+            ticket = Ticket(
+                id=self._uuid(),
+                parking=parking,
+                code=self.ticket_code(self.ticket_count + i),
+                created_at=created_at,
+            )
+            if left_at < self.end:
+                ticket.status = rng.choices(closed, closed_weights)[0]
+            else:
+                ticket.status = rng.choices(open_, open_weights)[0]
+
+            if ticket.status in (Status.EXITED, Status.PAID):
+                ticket.amount = Decimal(hours * HOURLY_RATE)
+                ticket.paid_at = max(created_at, min(left_at, self.end) - timedelta(
+                    minutes=rng.uniform(0, 10)))
+            if ticket.status == Status.EXITED:
+                ticket.exit_time = left_at
+            if ticket.status == Status.VALIDATED or (
+                    ticket.status == Status.EXITED and rng.random() < VALIDATION_RATE):
+                stores = self.stores_by_location.get(parking.location_id)
+                if stores:
+                    ticket.validated_by_store = rng.choice(stores)
+                    ticket.discount_applied = Decimal(min(hours, 2) * HOURLY_RATE)
+
+            if rng.random() < 0.95:
+                ticket.plate_number = (f"{rng.choice(PLATE_LETTERS)}{rng.choice(PLATE_LETTERS)}"
+                                       f"{rng.choice(PLATE_LETTERS)}-{rng.randint(100, 999)}")
+                ticket.plate_normalized = normalize_plate(ticket.plate_number)
+            yield ticket
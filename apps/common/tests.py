@@ -1,3 +1,104 @@
-from django.test import TestCase
+import uuid
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.common.db import (
+    ReadReplicaRouter,
+    pin_to_primary,
+    routing_scope,
+    use_replicas,
+)
+from apps.common.ids import default_uuid, uuid7, uuid7_time
+from apps.common.middleware import RequestBudgetExceeded, request_stats
+from apps.tickets.models import Ticket
+
+
+class QueryInstrumentationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        request_stats.reset()
+        self.url = reverse("dashboard:metrics")
+
+    def test_samples_per_view(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        stats = request_stats.snapshot()["dashboard:metrics"]
+        self.assertEqual(stats["requests"], 2)
+        self.assertGreater(stats["queries"]["max"], 0)
+        self.assertGreater(stats["bytes"]["p50"], 0)
+        # Render solo en las TemplateResponse
+        self.assertEqual(stats["render_ms"]["max"], 0)
+        self.client.get(reverse("dashboard:index"))
+        self.assertGreater(request_stats.snapshot()["dashboard:index"]["render_ms"]["max"], 0)
+
+    def test_stats_endpoint_is_staff_only(self):
+        stats_url = reverse("common:request-stats")
+        self.assertEqual(self.client.get(stats_url).status_code, 302)
+        self.client.force_login(get_user_model().objects.create_user(
+            "staff@example.com", is_staff=True))
+        self.client.get(self.url)
+        self.assertIn("dashboard:metrics", self.client.get(stats_url).json()["views"])
+        self.client.post(stats_url)
+        self.assertNotIn("dashboard:metrics", request_stats.snapshot())
+
+    @override_settings(REQUEST_BUDGETS={"dashboard:metrics": {"queries": 0}})
+    def test_budget_exceeded_is_logged(self):
+        with self.assertLogs("apps.common.middleware", "WARNING") as logs:
+            self.client.get(self.url)
+        self.assertIn("dashboard:metrics excedió su presupuesto: queries=", logs.output[0])
+
+    @override_settings(REQUEST_BUDGETS={"*": {"queries": 0}}, REQUEST_BUDGET_ACTION="raise")
+    def test_budget_exceeded_raises(self):
+        with self.assertRaises(RequestBudgetExceeded):
+            self.client.get(self.url)
+
+
+class UUID7Tests(SimpleTestCase):
+    def test_layout(self):
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_monotonic_within_process(self):
+        values = [uuid7() for _ in range(10000)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), len(values))
+        self.assertLessEqual(uuid7_time(values[0]), uuid7_time(values[-1]))
+
+    def test_default_uuid_setting(self):
+        self.assertEqual(default_uuid().version, 4)
+        with override_settings(UUID_PRIMARY_KEY_VERSION=7):
+            self.assertEqual(default_uuid().version, 7)
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class ReadReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReadReplicaRouter()
+
+    def test_reads_default_outside_replica_context(self):
+        with routing_scope():
+            self.assertIsNone(self.router.db_for_read(Ticket))
+
+    def test_reads_replica_inside_context(self):
+        with routing_scope(), use_replicas():
+            self.assertEqual(self.router.db_for_read(Ticket), "replica1")
+
+    def test_write_pins_rest_of_context_to_primary(self):
+        with routing_scope(), use_replicas():
+            self.assertEqual(self.router.db_for_write(Ticket), "default")
+            self.assertIsNone(self.router.db_for_read(Ticket))
+        # El pin no se filtra fuera del contexto
+        with routing_scope(), use_replicas():
+            self.assertEqual(self.router.db_for_read(Ticket), "replica1")
+
+    def test_pin_to_primary(self):
+        with routing_scope(), use_replicas(), pin_to_primary():
+            self.assertIsNone(self.router.db_for_read(Ticket))
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica1", "tickets"))
+        self.assertIsNone(self.router.allow_migrate("default", "tickets"))
@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+app_name = 'common'
+
+urlpatterns = [
+    path('requests/', views.request_stats_view, name='request-stats'),
+]
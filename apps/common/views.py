@@ -1,3 +1,26 @@
-from django.shortcuts import render
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
 
-# Create your views here.
+from apps.common.middleware import request_stats
+from apps.tickets.selectors.lookup import (
+    get_ticket_lookup_stats,
+    reset_ticket_lookup_stats,
+)
+
+
+@staff_member_required
+@require_http_methods(['GET', 'POST'])
+def request_stats_view(request):
+    """
+    Percentiles de consultas, tiempo de BD, render, total y tamaño por
+    vista, y aciertos del cache de búsqueda de tickets por código, de
+    este proceso. POST reinicia las muestras y los aciertos.
+    """
+    if request.method == 'POST':
+        request_stats.reset()
+        reset_ticket_lookup_stats()
+    return JsonResponse({
+        'views': request_stats.snapshot(),
+        'ticket_lookup': get_ticket_lookup_stats(),
+    })
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+class Subscription:
+    """
+    Cola acotada de una pantalla conectada. Si el cliente no consume a
+    tiempo se descartan los eventos más viejos; al superar max_dropped la
+    suscripción se cierra para que el cliente reconecte y se resincronice.
+    """
+
+    def __init__(self, loop, maxsize, max_dropped):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.max_dropped = max_dropped
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, event):
+        # Corre en el loop del suscriptor (vía call_soon_threadsafe)
+        if self.closed:
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            if self.dropped > self.max_dropped:
+                self.closed = True
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class EventBroker:
+    """
+    Pub/sub en memoria del proceso. publish() es seguro desde código
+    síncrono (receptores de señales en hilos del ORM): cada evento se
+    entrega al loop de cada suscriptor con call_soon_threadsafe.
+    """
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        subscription = Subscription(
+            asyncio.get_running_loop(),
+            maxsize=settings.DASHBOARD_LIVE_QUEUE_SIZE,
+            max_dropped=settings.DASHBOARD_LIVE_MAX_DROPPED,
+        )
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def publish(self, event_type, data):
+        event = (event_type, data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # Loop cerrado: la conexión ya terminó
+                self.unsubscribe(subscription)
+
+
+broker = EventBroker()
+
+
+def format_event(event_type, data):
+    payload = json.dumps(data, cls=DjangoJSONEncoder)
+    return f"event: {event_type}\ndata: {payload}\n\n"
@@ -0,0 +1,125 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+from django.utils.formats import date_format
+
+from apps.parkings.models import Parking, ParkingCounter
+from apps.stores.models import CommercialUnit, Store
+from apps.tickets.models import Ticket
+from apps.tickets.selectors.occupancy import get_occupancy
+
+_VERSION_KEY = "dashboard:version"
+
+
+def get_metrics_version():
+    """
+    Versión de las métricas cacheadas en este proceso; cambia con cada
+    invalidación local. Solo sirve de llave de cache: los escritos de otros
+    procesos no la cambian (ver get_last_modified).
+    """
+    return cache.get_or_set(_VERSION_KEY, 1, timeout=None)
+
+
+def invalidate_dashboard_metrics():
+    """
+    Descarta las métricas y fragmentos cacheados del dashboard. Se repite
+    al confirmar la transacción para no dejar cacheados datos previos.
+    """
+    _bump_version()
+    transaction.on_commit(_bump_version)
+
+
+def _bump_version():
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, 1, timeout=None)
+
+
+def get_last_modified():
+    """
+    Último cambio en los datos del dashboard, leído de la BD en cada
+    petición (Max de updated_at, con índice en Ticket) para que valga sin
+    importar qué proceso hizo el cambio. Nunca es anterior al inicio del
+    periodo de DASHBOARD_METRICS_TTL vigente: la serie de ocupación cambia
+    con el tiempo aunque no haya escrituras, y las que no dejan marca
+    (borrados, ocupaciones de unidades) se reflejan a más tardar al
+    siguiente periodo, igual que las métricas cacheadas en otros procesos.
+    """
+    ttl = settings.DASHBOARD_METRICS_TTL
+    now = timezone.now()
+    period_start = now - timedelta(seconds=now.timestamp() % ttl)
+    candidates = [
+        Ticket.objects.aggregate(at=Max('updated_at'))['at'],
+        Store.objects.aggregate(at=Max('updated_at'))['at'],
+        ParkingCounter.objects.aggregate(at=Max('updated_at'))['at'],
+    ]
+    return max([at for at in candidates if at is not None] + [period_start])
+
+
+def get_metrics_etag(last_modified=None):
+    last_modified = last_modified or get_last_modified()
+    return f'"{int(last_modified.timestamp() * 1_000_000):x}"'
+
+
+def get_dashboard_metrics():
+    """
+    Tarjetas del dashboard, cacheadas por versión durante
+    DASHBOARD_METRICS_TTL segundos. Sin cache: tres consultas.
+    """
+    key = f"dashboard:metrics:{get_metrics_version()}"
+    metrics = cache.get(key)
+    if metrics is None:
+        metrics = _compute_metrics()
+        cache.set(key, metrics, settings.DASHBOARD_METRICS_TTL)
+    return metrics
+
+
+def _compute_metrics():
+    # Capacidad y tickets abiertos (contadores) en una sola consulta
+    parkings = Parking.objects.aggregate(
+        available_spaces=Sum('capacity'),
+        active_tickets=Sum('counter__open_tickets'),
+    )
+    stores = Store.objects.aggregate(
+        active_stores=Count('pk', filter=Q(is_active=True)),
+    )
+    occupied_units = CommercialUnit.objects.filter(
+        occupancies__end_date__isnull=True
+    ).count()
+    return {
+        'active_tickets': parkings['active_tickets'] or 0,
+        'occupied_units': occupied_units,
+        'available_spaces': parkings['available_spaces'] or 0,
+        'active_stores': stores['active_stores'],
+    }
+
+
+def get_weekly_occupancy():
+    """
+    Ocupación real de los últimos 7 días locales (todos los parkings):
+    promedio ponderado por tiempo y pico de cada día. Cacheada por versión.
+    """
+    key = f"dashboard:occupancy:{get_metrics_version()}"
+    data = cache.get(key)
+    if data is None:
+        today = timezone.localdate()
+        start = timezone.make_aware(
+            datetime.combine(today - timedelta(days=6), time.min))
+        end = start + timedelta(days=7)
+        series = get_occupancy(start, min(end, timezone.now()),
+                               step=timedelta(days=1))
+        data = {
+            'labels': [
+                date_format(timezone.localtime(bucket), 'l').capitalize()
+                for bucket in series.buckets
+            ],
+            'average': [round(value, 1) for value in series.average],
+            'peak': series.peak,
+        }
+        cache.set(key, data, settings.DASHBOARD_CHART_TTL)
+    return data
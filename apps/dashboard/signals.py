@@ -0,0 +1,60 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.dashboard.live import broker
+from apps.dashboard.metrics import invalidate_dashboard_metrics
+from apps.parkings.models import Parking
+from apps.stores.models import Store, UnitOccupancy
+from apps.tickets.models import Ticket
+from apps.tickets.services.counters import counter_deltas
+from apps.tickets.signals import ticket_status_changed
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+@receiver(post_save, sender=UnitOccupancy)
+@receiver(post_delete, sender=UnitOccupancy)
+@receiver(post_save, sender=Store)
+@receiver(post_delete, sender=Store)
+@receiver(post_save, sender=Parking)
+@receiver(post_delete, sender=Parking)
+def invalidate_on_write(sender, **kwargs):
+    invalidate_dashboard_metrics()
+
+
+@receiver(ticket_status_changed)
+def invalidate_on_status_change(sender, **kwargs):
+    # Emisiones en lote y transiciones por update() no disparan post_save
+    invalidate_dashboard_metrics()
+
+
+@receiver(ticket_status_changed)
+def publish_live_events(sender, changes, **kwargs):
+    if not broker.has_subscribers():
+        return
+    # Se publica al confirmar: las pantallas no deben ver cambios revertidos
+    transaction.on_commit(lambda: _publish(changes))
+
+
+def _publish(changes):
+    for change in changes:
+        event_type = "issued" if change.old_status is None else change.new_status
+        broker.publish(f"ticket.{event_type}", {
+            "code": change.code,
+            "parking_id": change.parking_id,
+            "status": change.new_status,
+            "previous_status": change.old_status,
+            "at": change.at,
+        })
+
+    # Incrementos calculados de los propios cambios (sin consultar
+    # ParkingCounter): la página los suma a las tarjetas ya mostradas
+    deltas = {parking_id: delta for parking_id, delta in counter_deltas(changes).items()
+              if delta}
+    if deltas:
+        broker.publish("counters", {
+            "parkings": [{"parking_id": parking_id, **delta.as_dict()}
+                         for parking_id, delta in deltas.items()],
+            "metrics": {"active_tickets": sum(d.open for d in deltas.values())},
+        })
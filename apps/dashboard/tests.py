@@ -1,3 +1,127 @@
-from django.test import TestCase
+import asyncio
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.dashboard import metrics
+from apps.dashboard.live import broker
+from apps.locations.models import Location
+from apps.parkings.models import Parking
+from apps.tickets.models import Ticket
+from apps.tickets.services import TicketEntry, TicketStateMachine, issue_tickets
+from apps.tickets.services import codes
+
+
+def _parking(name="Norte"):
+    return Parking.objects.create(
+        location=Location.objects.create(name=name), capacity=100)
+
+
+class MetricsConditionalGetTests(TestCase):
+    def setUp(self):
+        codes._blocks.clear()
+        cache.clear()
+        self.parking = _parking()
+        self.url = reverse("dashboard:metrics")
+
+    def get(self, response=None):
+        headers = {}
+        if response is not None:
+            headers["HTTP_IF_NONE_MATCH"] = response["ETag"]
+        return self.client.get(self.url, **headers)
+
+    def test_unchanged_poll_is_not_modified(self):
+        first = self.get()
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.has_header("Last-Modified"))
+        self.assertEqual(self.get(first).status_code, 304)
+
+    def test_write_from_another_process_changes_the_etag(self):
+        ticket = issue_tickets([TicketEntry(self.parking)]).created[0]
+        first = self.get()
+        # update() no dispara señales: como un escrito de otro proceso,
+        # que no cambia la versión de este
+        version = metrics.get_metrics_version()
+        Ticket.objects.filter(pk=ticket.pk).update(
+            updated_at=timezone.now() + timedelta(seconds=1))
+        self.assertEqual(metrics.get_metrics_version(), version)
+        self.assertEqual(self.get(first).status_code, 200)
+
+    def test_etag_changes_with_the_metrics_period(self):
+        first = self.get()
+        later = timezone.now() + timedelta(seconds=settings.DASHBOARD_METRICS_TTL)
+        with mock.patch.object(metrics.timezone, "now", return_value=later):
+            self.assertEqual(self.get(first).status_code, 200)
+
+
+class MetricsCacheTests(TestCase):
+    def setUp(self):
+        codes._blocks.clear()
+        cache.clear()
+        self.parking = _parking()
+
+    def test_metrics_are_cached_until_a_ticket_changes(self):
+        self.assertEqual(metrics.get_dashboard_metrics()["active_tickets"], 0)
+        with self.assertNumQueries(0):
+            metrics.get_dashboard_metrics()
+        # Emisión en lote: sin post_save, invalida ticket_status_changed
+        issue_tickets([TicketEntry(self.parking), TicketEntry(self.parking)])
+        self.assertEqual(metrics.get_dashboard_metrics()["active_tickets"], 2)
+
+    def test_recent_tickets_fragment(self):
+        url = reverse("dashboard:index")
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertContains(response, "No hay tickets recientes")
+        ticket = issue_tickets([TicketEntry(self.parking)]).created[0]
+        self.assertContains(self.client.get(url), ticket.pk)
+
+
+class LiveEventsTests(TestCase):
+    def setUp(self):
+        codes._blocks.clear()
+        cache.clear()
+        self.parking = _parking()
+
+    def test_ticket_and_counter_events(self):
+        with mock.patch.object(broker, "has_subscribers", return_value=True), \
+                mock.patch.object(broker, "publish") as publish, \
+                self.captureOnCommitCallbacks(execute=True):
+            tickets = issue_tickets([TicketEntry(self.parking), TicketEntry(self.parking)]).created
+            TicketStateMachine(tickets[0]).pay(amount=Decimal("30"))
+        events = [call.args for call in publish.call_args_list]
+        self.assertEqual([event_type for event_type, _ in events], [
+            "ticket.issued", "ticket.issued", "counters", "ticket.paid", "counters"])
+        issued, paid = events[2][1], events[4][1]
+        self.assertEqual(issued["metrics"], {"active_tickets": 2})
+        self.assertEqual(issued["parkings"][0]["entries_today"], 2)
+        self.assertEqual(paid["metrics"], {"active_tickets": 0})
+        self.assertEqual(paid["parkings"][0]["revenue_today"], Decimal("30"))
+
+    def test_requires_asgi(self):
+        self.assertEqual(self.client.get(reverse("dashboard:events")).status_code, 501)
+
+    @override_settings(DASHBOARD_LIVE_QUEUE_SIZE=1, DASHBOARD_LIVE_MAX_DROPPED=3)
+    async def test_stream_resyncs_after_dropped_events(self):
+        response = await self.async_client.get(reverse("dashboard:events"))
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 5000\n\n")
+        for number in range(3):
+            broker.publish("ticket.issued", {"code": str(number)})
+        await asyncio.sleep(0)
+        self.assertEqual(await anext(stream), b'event: resync\ndata: {"dropped": 2}\n\n')
+        self.assertEqual(await anext(stream), b'event: ticket.issued\ndata: {"code": "2"}\n\n')
+        # Más de max_dropped descartes: se cierra para que el cliente reconecte
+        for number in range(3):
+            broker.publish("ticket.issued", {"code": str(number)})
+        await asyncio.sleep(0)
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+        self.assertFalse(broker.has_subscribers())
@@ -5,4 +5,6 @@ app_name = 'dashboard'
 
 urlpatterns = [
     path('', views.DashboardView.as_view(), name='index'),
+    path('metrics/', views.DashboardMetricsView.as_view(), name='metrics'),
+    path('events/', views.live_events, name='events'),
 ]
\ No newline at end of file
@@ -1,14 +1,23 @@
-from django.shortcuts import render
+import asyncio
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.http import condition
 from django.views.generic import TemplateView
-from django.db.models import Count, Sum
-from django.utils import timezone
-from datetime import timedelta
+from django.conf import settings
 import json
 
-from apps.tickets.models import Ticket
-from apps.stores.models import Store, CommercialUnit
-from apps.parkings.models import Parking
-from apps.stores.selectors.unit_occupancy import get_current_store_for_unit
+from apps.dashboard.live import broker, format_event
+from apps.dashboard.metrics import (
+    get_dashboard_metrics,
+    get_last_modified,
+    get_metrics_etag,
+    get_metrics_version,
+    get_weekly_occupancy,
+)
+from apps.tickets.selectors.tickets import get_recent_ticket_rows
 
 
 class DashboardView(TemplateView):
@@ -17,57 +26,83 @@ class DashboardView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Métricas principales
-        active_statuses = [
-            Ticket.Status.ISSUED, 
-            Ticket.Status.VALIDATED, 
-            Ticket.Status.PAID
-        ]
-        context['active_tickets'] = Ticket.objects.filter(
-            status__in=active_statuses,
-            exit_time__isnull=True
-        ).count()
-        
-        # Usar selector para unidades ocupadas
-        context['occupied_units'] = CommercialUnit.objects.filter(
-            occupancies__end_date__isnull=True
-        ).count()
-        
-        # Total de espacios en todos los parkings
-        context['available_spaces'] = Parking.objects.aggregate(
-            total_capacity=Sum('capacity')
-        )['total_capacity'] or 0
+        # Métricas principales (cacheadas, invalidadas por señales)
+        context.update(get_dashboard_metrics())
         
-        context['active_stores'] = Store.objects.filter(is_active=True).count()
+        # Tickets recientes: se pasa el selector sin evaluar; la plantilla
+        # solo lo llama si el fragmento no está en cache
+        context['recent_tickets'] = get_recent_ticket_rows
+        context['metrics_version'] = get_metrics_version()
+        context['fragment_ttl'] = settings.DASHBOARD_FRAGMENT_TTL
         
-        # Tickets recientes con más información
-        context['recent_tickets'] = Ticket.objects.select_related(
-            'parking__location', 'validated_by_store'
-        ).order_by('-created_at')[:10]
-        
-        # Datos para gráfico - ocupación semanal simulada basada en datos reales
-        context['weekly_occupancy_data'] = json.dumps(
-            self._get_weekly_occupancy_data()
-        )
+        # Datos para gráfico - ocupación real de la última semana
+        context['weekly_occupancy_data'] = json.dumps(get_weekly_occupancy())
         
         return context
-    
-    def _get_weekly_occupancy_data(self):
-        """
-        Genera datos de ocupación semanal.
-        Por ahora simulado, pero se puede extender para usar datos reales.
-        """
-        now = timezone.now()
-        weekly_data = []
-        
-        for i in range(7):  # Últimos 7 días
-            date = now - timedelta(days=6-i)
-            # Simular ocupación basada en día de la semana
-            # Fines de semana más ocupados
-            if date.weekday() >= 5:  # Sábado y Domingo
-                occupancy = 60 + (i * 8)
-            else:  # Días de semana
-                occupancy = 35 + (i * 7)
-            weekly_data.append(occupancy)
-        
-        return weekly_data
+
+
+def _last_modified(request):
+    # condition() pide el ETag y Last-Modified por separado: una sola lectura
+    if not hasattr(request, '_dashboard_last_modified'):
+        request._dashboard_last_modified = get_last_modified()
+    return request._dashboard_last_modified
+
+
+@method_decorator(
+    condition(
+        etag_func=lambda request: get_metrics_etag(_last_modified(request)),
+        last_modified_func=_last_modified,
+    ),
+    name='get',
+)
+class DashboardMetricsView(View):
+    """
+    Métricas del dashboard y serie de ocupación en JSON, para el polling
+    de la página. Con If-None-Match / If-Modified-Since vigentes responde
+    304 sin recalcular nada.
+    """
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({
+            'version': get_metrics_version(),
+            'metrics': get_dashboard_metrics(),
+            'occupancy': get_weekly_occupancy(),
+        })
+
+
+async def live_events(request):
+    """
+    Flujo Server-Sent Events con los cambios de tickets y contadores.
+    Solo bajo ASGI: en WSGI cada conexión ocuparía un worker indefinidamente.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(
+            'Los eventos en vivo requieren el servidor ASGI (config.asgi).',
+            status=501,
+        )
+
+    subscription = broker.subscribe()
+    heartbeat = settings.DASHBOARD_LIVE_HEARTBEAT
+
+    async def stream():
+        dropped = 0
+        try:
+            yield 'retry: 5000\n\n'
+            while not subscription.closed:
+                try:
+                    event_type, data = await subscription.get(heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                if subscription.dropped != dropped:
+                    # Se perdieron incrementos: la página vuelve a pedir /metrics/
+                    dropped = subscription.dropped
+                    yield format_event('resync', {'dropped': dropped})
+                yield format_event(event_type, data)
+        finally:
+            broker.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
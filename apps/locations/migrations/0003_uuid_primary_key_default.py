@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:56
+
+import apps.common.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0002_alter_location_created_at'),
+    ]
+
+    # El default de la llave es solo de Python (apps.common.ids.default_uuid):
+    # no hay cambio de esquema y las llaves uuid4 existentes siguen siendo
+    # válidas. Sin esto SQLite reconstruiría la tabla completa.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='location',
+                    name='id',
+                    field=models.UUIDField(default=apps.common.ids.default_uuid, editable=False, primary_key=True, serialize=False),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:32
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parkings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParkingCounter',
+            fields=[
+                ('parking', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counter', serialize=False, to='parkings.parking')),
+                ('open_tickets', models.IntegerField(default=0)),
+                ('day', models.DateField(default=django.utils.timezone.localdate)),
+                ('entries_today', models.PositiveIntegerField(default=0)),
+                ('exits_today', models.PositiveIntegerField(default=0)),
+                ('revenue_today', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
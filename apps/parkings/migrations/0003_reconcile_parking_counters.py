@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def reconcile(apps, schema_editor):
+    # Los parkings con tickets abiertos al desplegar no tendrían contador
+    # hasta su siguiente movimiento. Se usa el servicio (modelos actuales)
+    # para contar igual que él; en una base nueva no hay parkings.
+    Parking = apps.get_model("parkings", "Parking")
+    if not Parking.objects.using(schema_editor.connection.alias).exists():
+        return
+    from apps.tickets.services.counters import reconcile_counters
+    reconcile_counters()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parkings', '0002_parking_counter'),
+        ('tickets', '0007_ticket_code_sequence'),
+    ]
+
+    operations = [
+        migrations.RunPython(reconcile, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 # apps/parking/models.py
 from django.db import models
+from django.utils import timezone
 from apps.locations.models import Location
 
 
@@ -14,3 +15,41 @@ class Parking(models.Model):
 
     def __str__(self):
         return f"Parking @ {self.location.name}"
+
+
+class ParkingCounter(models.Model):
+    """
+    Contadores en vivo de un estacionamiento, mantenidos incrementalmente
+    con expresiones F() cada vez que un ticket se emite o cambia de estado.
+    Los contadores *_today corresponden al día local guardado en `day`.
+    """
+    parking = models.OneToOneField(
+        Parking,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="counter"
+    )
+    open_tickets = models.IntegerField(default=0)
+    day = models.DateField(default=timezone.localdate)
+    entries_today = models.PositiveIntegerField(default=0)
+    exits_today = models.PositiveIntegerField(default=0)
+    revenue_today = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Contadores de {self.parking_id} ({self.open_tickets} abiertos)"
+
+    def today(self, field_name):
+        """Valor de un contador diario; cero si corresponde a otro día."""
+        if self.day != timezone.localdate():
+            return 0
+        return getattr(self, field_name)
+
+    @property
+    def is_full(self):
+        capacity = self.parking.capacity
+        return bool(capacity) and self.open_tickets >= capacity
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.reports.services.rollups import build_rollups
+
+
+class Command(BaseCommand):
+    help = ("Actualiza los resúmenes horarios y diarios de tickets; por "
+            "defecto solo los días con tickets modificados desde la última corrida.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full", action="store_true",
+            help="Reconstruye todos los resúmenes desde cero.",
+        )
+
+    def handle(self, *args, **options):
+        days = build_rollups(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(f"{days} días recalculados."))
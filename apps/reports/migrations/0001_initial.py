@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('parkings', '0002_parking_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('last_run', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyTicketRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tickets', models.PositiveIntegerField(default=0)),
+                ('issued_count', models.PositiveIntegerField(default=0)),
+                ('validated_count', models.PositiveIntegerField(default=0)),
+                ('paid_count', models.PositiveIntegerField(default=0)),
+                ('exited_count', models.PositiveIntegerField(default=0)),
+                ('expired_count', models.PositiveIntegerField(default=0)),
+                ('lost_count', models.PositiveIntegerField(default=0)),
+                ('canceled_count', models.PositiveIntegerField(default=0)),
+                ('amount_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('discount_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('duration_total', models.DurationField(default=0, help_text='Suma de estadías de los tickets con hora de salida')),
+                ('finished_count', models.PositiveIntegerField(default=0, help_text='Tickets con hora de salida (base del promedio de estadía)')),
+                ('day', models.DateField(help_text='Día local (TIME_ZONE)')),
+                ('parking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parkings.parking')),
+            ],
+            options={
+                'verbose_name': 'Resumen diario de tickets',
+                'verbose_name_plural': 'Resúmenes diarios de tickets',
+                'ordering': ['parking', 'day'],
+                'indexes': [models.Index(fields=['day'], name='reports_dai_day_8604a7_idx')],
+                'constraints': [models.UniqueConstraint(fields=('parking', 'day'), name='daily_rollup_unique_day')],
+            },
+        ),
+        migrations.CreateModel(
+            name='HourlyTicketRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tickets', models.PositiveIntegerField(default=0)),
+                ('issued_count', models.PositiveIntegerField(default=0)),
+                ('validated_count', models.PositiveIntegerField(default=0)),
+                ('paid_count', models.PositiveIntegerField(default=0)),
+                ('exited_count', models.PositiveIntegerField(default=0)),
+                ('expired_count', models.PositiveIntegerField(default=0)),
+                ('lost_count', models.PositiveIntegerField(default=0)),
+                ('canceled_count', models.PositiveIntegerField(default=0)),
+                ('amount_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('discount_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('duration_total', models.DurationField(default=0, help_text='Suma de estadías de los tickets con hora de salida')),
+                ('finished_count', models.PositiveIntegerField(default=0, help_text='Tickets con hora de salida (base del promedio de estadía)')),
+                ('bucket', models.DateTimeField(help_text='Inicio de la hora local (TIME_ZONE)')),
+                ('parking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='parkings.parking')),
+            ],
+            options={
+                'verbose_name': 'Resumen horario de tickets',
+                'verbose_name_plural': 'Resúmenes horarios de tickets',
+                'ordering': ['parking', 'bucket'],
+                'indexes': [models.Index(fields=['bucket'], name='reports_hou_bucket_187696_idx')],
+                'constraints': [models.UniqueConstraint(fields=('parking', 'bucket'), name='hourly_rollup_unique_bucket')],
+            },
+        ),
+    ]
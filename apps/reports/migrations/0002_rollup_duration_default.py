@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:13
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailyticketrollup',
+            name='duration_total',
+            field=models.DurationField(default=datetime.timedelta(0), help_text='Suma de estadías de los tickets con hora de salida'),
+        ),
+        migrations.AlterField(
+            model_name='hourlyticketrollup',
+            name='duration_total',
+            field=models.DurationField(default=datetime.timedelta(0), help_text='Suma de estadías de los tickets con hora de salida'),
+        ),
+    ]
@@ -1,3 +1,91 @@
+from datetime import timedelta
+
 from django.db import models
 
-# Create your models here.
+from apps.parkings.models import Parking
+
+
+class TicketRollup(models.Model):
+    """
+    Totales precalculados de los tickets que entraron en un periodo.
+    Los contadores por estado reflejan el estado actual de esos tickets.
+    """
+    parking = models.ForeignKey(
+        Parking,
+        on_delete=models.CASCADE,
+        related_name="+"
+    )
+    tickets = models.PositiveIntegerField(default=0)
+    issued_count = models.PositiveIntegerField(default=0)
+    validated_count = models.PositiveIntegerField(default=0)
+    paid_count = models.PositiveIntegerField(default=0)
+    exited_count = models.PositiveIntegerField(default=0)
+    expired_count = models.PositiveIntegerField(default=0)
+    lost_count = models.PositiveIntegerField(default=0)
+    canceled_count = models.PositiveIntegerField(default=0)
+    amount_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    discount_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    duration_total = models.DurationField(
+        default=timedelta(0),
+        help_text="Suma de estadías de los tickets con hora de salida"
+    )
+    finished_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Tickets con hora de salida (base del promedio de estadía)"
+    )
+
+    class Meta:
+        abstract = True
+
+    @property
+    def average_stay(self):
+        if not self.finished_count:
+            return None
+        return self.duration_total / self.finished_count
+
+
+class HourlyTicketRollup(TicketRollup):
+    bucket = models.DateTimeField(help_text="Inicio de la hora local (TIME_ZONE)")
+
+    class Meta:
+        verbose_name = "Resumen horario de tickets"
+        verbose_name_plural = "Resúmenes horarios de tickets"
+        ordering = ["parking", "bucket"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["parking", "bucket"],
+                name="hourly_rollup_unique_bucket"
+            ),
+        ]
+        indexes = [models.Index(fields=["bucket"])]
+
+    def __str__(self):
+        return f"{self.parking_id} @ {self.bucket.isoformat()}: {self.tickets}"
+
+
+class DailyTicketRollup(TicketRollup):
+    day = models.DateField(help_text="Día local (TIME_ZONE)")
+
+    class Meta:
+        verbose_name = "Resumen diario de tickets"
+        verbose_name_plural = "Resúmenes diarios de tickets"
+        ordering = ["parking", "day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["parking", "day"],
+                name="daily_rollup_unique_day"
+            ),
+        ]
+        indexes = [models.Index(fields=["day"])]
+
+    def __str__(self):
+        return f"{self.parking_id} @ {self.day.isoformat()}: {self.tickets}"
+
+
+class RollupCheckpoint(models.Model):
+    """Último instante procesado por el constructor incremental."""
+    name = models.CharField(max_length=64, unique=True)
+    last_run = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name}: {self.last_run.isoformat()}"
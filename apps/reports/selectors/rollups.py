@@ -0,0 +1,26 @@
+from django.db.models import Sum
+
+from apps.reports.models import DailyTicketRollup
+
+_SUMMED = (
+    "tickets", "finished_count", "issued_count", "validated_count",
+    "paid_count", "exited_count", "expired_count", "lost_count",
+    "canceled_count", "amount_total", "discount_total", "duration_total",
+)
+
+
+def get_daily_summary(start_day, end_day, parking=None):
+    """
+    Totales por día local en [start_day, end_day], sumando los parkings
+    (o solo `parking`). Incluye el promedio de estadía de cada día.
+    """
+    qs = DailyTicketRollup.objects.filter(day__gte=start_day, day__lte=end_day)
+    if parking is not None:
+        qs = qs.filter(parking=parking)
+    rows = (qs.values("day")
+            .annotate(**{name: Sum(name) for name in _SUMMED})
+            .order_by("day"))
+    for row in rows:
+        finished = row["finished_count"]
+        row["average_stay"] = row["duration_total"] / finished if finished else None
+        yield row
@@ -0,0 +1 @@
+from .rollups import *
@@ -0,0 +1,153 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from apps.reports.models import DailyTicketRollup, HourlyTicketRollup, RollupCheckpoint
+from apps.tickets.models import ArchivedTicket, Ticket
+
+CHECKPOINT = "tickets"
+
+# Margen para no perder tickets actualizados mientras corre el constructor
+_SAFETY_MARGIN = timedelta(minutes=1)
+
+# Días por consulta al reconstruir un parking completo
+_DAYS_PER_QUERY = 31
+
+_COUNTERS = ["tickets", "finished_count"] + [
+    f"{status}_count" for status in Ticket.Status.values]
+_TOTALS = ["amount_total", "discount_total", "duration_total"]
+
+
+def build_rollups(full=False):
+    """
+    Actualiza los resúmenes horarios y diarios de tickets.
+
+    En modo incremental solo recalcula los días (por parking) que tienen
+    tickets modificados desde la última corrida; `full=True` reconstruye
+    todo. Los periodos se agrupan en la hora local de TIME_ZONE y se
+    suman tickets vivos y archivados. Cada día se reemplaza en su propia
+    transacción (rebuild_days): durante una reconstrucción completa los
+    lectores ven cada día con sus totales anteriores o con los nuevos,
+    nunca vacío. Devuelve el número de días recalculados.
+    """
+    started = timezone.now()
+    checkpoint = RollupCheckpoint.objects.filter(name=CHECKPOINT).first()
+
+    if full or checkpoint is None:
+        touched = _touched_days(Ticket.objects.all())
+        touched |= _touched_days(ArchivedTicket.objects.all())
+        # Días con resúmenes pero ya sin tickets (p. ej. purgados del
+        # archivo): rebuild_days los deja sin filas
+        touched |= _rollup_days()
+    else:
+        touched = _touched_days(Ticket.objects.filter(
+            updated_at__gte=checkpoint.last_run - _SAFETY_MARGIN))
+
+    days_by_parking = defaultdict(list)
+    for parking_id, day in touched:
+        days_by_parking[parking_id].append(day)
+    for parking_id, days in days_by_parking.items():
+        days.sort()
+        for i in range(0, len(days), _DAYS_PER_QUERY):
+            rebuild_days(parking_id, days[i:i + _DAYS_PER_QUERY])
+
+    RollupCheckpoint.objects.update_or_create(
+        name=CHECKPOINT, defaults={"last_run": started})
+    return len(touched)
+
+
+def rebuild_days(parking_id, days):
+    """Recalcula desde cero los resúmenes de esos días locales de un parking."""
+    tz = timezone.get_current_timezone()
+    ranges = _day_ranges("created_at", days, tz)
+
+    hourly = {}
+    for model in (Ticket, ArchivedTicket):
+        rows = (model.objects
+                .filter(ranges, parking_id=parking_id)
+                .annotate(bucket=TruncHour("created_at", tzinfo=tz))
+                .values("bucket")
+                .annotate(**_aggregates())
+                .order_by())
+        for row in rows:
+            bucket = row.pop("bucket")
+            rollup = hourly.setdefault(bucket, HourlyTicketRollup(
+                parking_id=parking_id, bucket=bucket, **_zeros()))
+            _accumulate(rollup, row)
+
+    daily = {}
+    for rollup in hourly.values():
+        day = timezone.localtime(rollup.bucket, tz).date()
+        summary = daily.setdefault(day, DailyTicketRollup(
+            parking_id=parking_id, day=day, **_zeros()))
+        _accumulate(summary, {name: getattr(rollup, name)
+                              for name in _COUNTERS + _TOTALS})
+
+    with transaction.atomic():
+        HourlyTicketRollup.objects.filter(
+            _day_ranges("bucket", days, tz), parking_id=parking_id).delete()
+        DailyTicketRollup.objects.filter(
+            parking_id=parking_id, day__in=days).delete()
+        HourlyTicketRollup.objects.bulk_create(hourly.values())
+        DailyTicketRollup.objects.bulk_create(daily.values())
+
+
+def _day_ranges(field, days, tz):
+    """Q que cubre esos días locales completos sobre `field`."""
+    ranges = Q()
+    for day in days:
+        start = timezone.make_aware(datetime.combine(day, time.min), tz)
+        ranges |= Q(**{f"{field}__gte": start,
+                       f"{field}__lt": start + timedelta(days=1)})
+    return ranges
+
+
+def _touched_days(queryset):
+    tz = timezone.get_current_timezone()
+    return set(queryset
+               .annotate(day=TruncDate("created_at", tzinfo=tz))
+               .values_list("parking_id", "day")
+               .distinct()
+               .order_by())
+
+
+def _rollup_days():
+    tz = timezone.get_current_timezone()
+    days = set(DailyTicketRollup.objects.values_list("parking_id", "day"))
+    return days | set(HourlyTicketRollup.objects
+                      .annotate(day=TruncDate("bucket", tzinfo=tz))
+                      .values_list("parking_id", "day")
+                      .distinct()
+                      .order_by())
+
+
+def _aggregates():
+    finished = Q(exit_time__isnull=False)
+    aggregates = {
+        "tickets": Count("pk"),
+        "finished_count": Count("pk", filter=finished),
+        "amount_total": Sum("amount"),
+        "discount_total": Sum("discount_applied"),
+        "duration_total": Sum(F("exit_time") - F("created_at"), filter=finished),
+    }
+    for status in Ticket.Status.values:
+        aggregates[f"{status}_count"] = Count("pk", filter=Q(status=status))
+    return aggregates
+
+
+def _zeros():
+    values = dict.fromkeys(_COUNTERS, 0)
+    values.update(amount_total=Decimal(0), discount_total=Decimal(0),
+                  duration_total=timedelta(0))
+    return values
+
+
+def _accumulate(rollup, values):
+    for name in _COUNTERS + _TOTALS:
+        if values.get(name):
+            setattr(rollup, name, getattr(rollup, name) + values[name])
@@ -1,3 +1,159 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.locations.models import Location
+from apps.parkings.models import Parking
+from apps.reports.models import DailyTicketRollup, HourlyTicketRollup
+from apps.reports.services import build_rollups, rebuild_days
+from apps.tickets.models import Ticket
+from apps.tickets.selectors.history import HISTORY_FIELDS
+from apps.tickets.services import TicketEntry, TicketStateMachine, issue_tickets
+from apps.tickets.services import codes
+
+
+def _parking(name="Norte"):
+    return Parking.objects.create(
+        location=Location.objects.create(name=name), capacity=100)
+
+
+class ReportTestCase(TestCase):
+    def setUp(self):
+        codes._blocks.clear()
+        self.user = get_user_model().objects.create_user("ops@example.com")
+        self.client.force_login(self.user)
+        self.parking = _parking()
+
+
+class TicketExportTests(ReportTestCase):
+    def setUp(self):
+        super().setUp()
+        other = _parking("Sur")
+        now = timezone.now()
+        self.tickets = issue_tickets(
+            [TicketEntry(self.parking, created_at=now - timedelta(hours=i)) for i in range(3)]
+            + [TicketEntry(other)]
+        ).created
+        TicketStateMachine(self.tickets[0]).cancel()
+        self.url = reverse("reports:tickets-export-csv")
+
+    def rows(self, response):
+        content = b"".join(response.streaming_content).decode()
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_csv_streams_every_ticket(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = self.rows(response)
+        self.assertEqual(rows[0], list(HISTORY_FIELDS))
+        self.assertEqual(len(rows), 5)
+
+    def test_filters(self):
+        response = self.client.get(self.url, {
+            "parking": self.parking.pk, "status": Ticket.Status.ISSUED})
+        codes_ = {row[1] for row in self.rows(response)[1:]}
+        self.assertEqual(codes_, {ticket.code for ticket in self.tickets[1:3]})
+
+    def test_ndjson(self):
+        response = self.client.get(reverse("reports:tickets-export-ndjson"))
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(set(json.loads(lines[0])), set(HISTORY_FIELDS))
+
+    def test_invalid_filters(self):
+        for params in ({"start": "2024-02-31"}, {"end": "ayer"},
+                       {"parking": "x"}, {"status": "nope"}):
+            with self.subTest(params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.url, {"start": "2024-02-31"})
+        self.assertEqual(response.content.decode(),
+                         "start debe tener formato YYYY-MM-DD.")
+
+    async def test_asgi_streams_asynchronously(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(self.url)
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(content.decode().splitlines()), 5)
+
+
+class RollupTests(ReportTestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.localtime()
+        self.yesterday = (now - timedelta(days=1)).replace(hour=12, minute=0)
+        self.tickets = issue_tickets([
+            TicketEntry(self.parking, created_at=self.yesterday),
+            TicketEntry(self.parking, created_at=self.yesterday - timedelta(minutes=5)),
+            TicketEntry(self.parking, created_at=now),
+        ]).created
+        TicketStateMachine(self.tickets[0]).pay(amount=Decimal("40"))
+        TicketStateMachine(self.tickets[0]).exit(at=self.yesterday + timedelta(hours=2))
+
+    def daily(self):
+        return {rollup.day: rollup for rollup in DailyTicketRollup.objects.all()}
+
+    def test_full_build(self):
+        self.assertEqual(build_rollups(full=True), 2)
+        daily = self.daily()
+        yesterday = daily[self.yesterday.date()]
+        self.assertEqual(yesterday.tickets, 2)
+        self.assertEqual(yesterday.exited_count, 1)
+        self.assertEqual(yesterday.issued_count, 1)
+        self.assertEqual(yesterday.amount_total, Decimal("40"))
+        self.assertEqual(yesterday.average_stay, timedelta(hours=2))
+        self.assertEqual(daily[timezone.localdate()].tickets, 1)
+        self.assertEqual(
+            sum(HourlyTicketRollup.objects.values_list("tickets", flat=True)), 3)
+
+    def test_incremental_build_picks_up_transitions(self):
+        build_rollups(full=True)
+        TicketStateMachine(self.tickets[1]).cancel()
+        build_rollups()
+        yesterday = self.daily()[self.yesterday.date()]
+        self.assertEqual(yesterday.canceled_count, 1)
+        self.assertEqual(yesterday.issued_count, 0)
+
+    def test_full_rebuild_keeps_days_until_replaced(self):
+        build_rollups(full=True)
+        stale_day = self.yesterday - timedelta(days=30)
+        DailyTicketRollup.objects.create(
+            parking=self.parking, day=stale_day.date(), tickets=5)
+        HourlyTicketRollup.objects.create(
+            parking=self.parking, bucket=stale_day.replace(minute=0, second=0, microsecond=0),
+            tickets=5)
+        before = DailyTicketRollup.objects.count()
+        calls = []
+
+        def rebuild(parking_id, days):
+            # Ningún día desaparece antes de su propio reemplazo
+            if not calls:
+                self.assertEqual(DailyTicketRollup.objects.count(), before)
+            calls.append(days)
+            return rebuild_days(parking_id, days)
+
+        with mock.patch("apps.reports.services.rollups.rebuild_days", rebuild):
+            build_rollups(full=True)
+        self.assertTrue(calls)
+        self.assertEqual(set(self.daily()), {self.yesterday.date(), timezone.localdate()})
+        self.assertFalse(HourlyTicketRollup.objects.filter(tickets=5).exists())
 
-# Create your tests here.
+    def test_daily_summary_view(self):
+        build_rollups(full=True)
+        url = reverse("reports:tickets-daily-summary")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        days = response.json()["days"]
+        self.assertEqual(sum(day["tickets"] for day in days), 3)
+        self.assertEqual(self.client.get(url, {"start": "2024-02-31"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"parking": "x"}).status_code, 400)
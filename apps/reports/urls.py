@@ -0,0 +1,15 @@
+from django.urls import path
+from . import views
+
+app_name = 'reports'
+
+urlpatterns = [
+    path('tickets/export.csv',
+         views.TicketExportView.as_view(format='csv'),
+         name='tickets-export-csv'),
+    path('tickets/export.ndjson',
+         views.TicketExportView.as_view(format='ndjson'),
+         name='tickets-export-ndjson'),
+    path('tickets/daily/', views.DailySummaryView.as_view(),
+         name='tickets-daily-summary'),
+]
@@ -1,3 +1,142 @@
-from django.shortcuts import render
+import csv
+from datetime import datetime, time, timedelta
+from itertools import islice
 
-# Create your views here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.views import View
+
+from apps.reports.selectors.rollups import get_daily_summary
+from apps.tickets.models import Ticket
+from apps.tickets.selectors.history import HISTORY_FIELDS, ticket_history
+
+
+class _Echo:
+    """Pseudo-buffer: csv.writer escribe y la fila se devuelve tal cual."""
+
+    def write(self, value):
+        return value
+
+
+class TicketExportView(LoginRequiredMixin, View):
+    """
+    Exporta tickets (vivos y archivados) en CSV o NDJSON por streaming.
+
+    Las filas se leen por bloques de chunk_size sobre values_list y se
+    escriben conforme llegan, así que la memoria del worker no crece con
+    el número de tickets y el encabezado sale de inmediato. Bajo ASGI el
+    contenido es un iterador asíncrono (_aiterate): Django consumiría uno
+    síncrono completo con sync_to_async(list) antes de enviarlo.
+
+    Filtros (querystring): parking, start y end (YYYY-MM-DD, hora local,
+    end inclusivo) y status (repetible).
+    """
+    format = "csv"
+    chunk_size = 2000
+    content_types = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+    def get(self, request, *args, **kwargs):
+        try:
+            filters = self._get_filters(request.GET)
+        except ValueError as e:
+            return HttpResponseBadRequest(str(e))
+
+        rows = ticket_history(**filters)
+        if isinstance(request, ASGIRequest):
+            content = self._astream(self._aiterate(rows))
+        else:
+            content = self._stream(rows.iterator(chunk_size=self.chunk_size))
+        response = StreamingHttpResponse(
+            content, content_type=self.content_types[self.format])
+        response["Content-Disposition"] = (
+            f'attachment; filename="tickets.{self.format}"')
+        return response
+
+    def _get_filters(self, params):
+        filters = {}
+        if params.get("parking"):
+            if not params["parking"].isdigit():
+                raise ValueError("parking debe ser numérico.")
+            filters["parking"] = int(params["parking"])
+        for name, days in (("start", 0), ("end", 1)):
+            if params.get(name):
+                try:
+                    day = parse_date(params[name])
+                except ValueError:
+                    # Bien formada pero imposible, p. ej. 2024-02-31
+                    day = None
+                if day is None:
+                    raise ValueError(f"{name} debe tener formato YYYY-MM-DD.")
+                filters[name] = timezone.make_aware(
+                    datetime.combine(day + timedelta(days=days), time.min))
+        statuses = params.getlist("status")
+        if statuses:
+            invalid = set(statuses) - set(Ticket.Status.values)
+            if invalid:
+                raise ValueError(f"Estados inválidos: {', '.join(sorted(invalid))}.")
+            filters["statuses"] = statuses
+        return filters
+
+    def _encoder(self):
+        """(encabezado o None, función fila -> línea) del formato."""
+        if self.format == "ndjson":
+            encoder = DjangoJSONEncoder()
+            return None, lambda row: encoder.encode(dict(zip(HISTORY_FIELDS, row))) + "\n"
+        writer = csv.writer(_Echo())
+        return writer.writerow(HISTORY_FIELDS), writer.writerow
+
+    def _stream(self, rows):
+        header, encode = self._encoder()
+        if header is not None:
+            yield header
+        for row in rows:
+            yield encode(row)
+
+    async def _aiterate(self, rows):
+        # Como QuerySet.aiterator(), que con values_list ejecuta la consulta
+        # en el hilo del event loop: cada bloque se lee en el hilo del ORM
+        iterator = rows.iterator(chunk_size=self.chunk_size)
+        next_chunk = sync_to_async(lambda: list(islice(iterator, self.chunk_size)))
+        while chunk := await next_chunk():
+            for row in chunk:
+                yield row
+
+    async def _astream(self, rows):
+        header, encode = self._encoder()
+        if header is not None:
+            yield header
+        async for row in rows:
+            yield encode(row)
+
+
+class DailySummaryView(LoginRequiredMixin, View):
+    """
+    Totales diarios leídos de los resúmenes precalculados (JSON).
+    Parámetros: start y end (YYYY-MM-DD, default: últimos 7 días), parking.
+    """
+
+    def get(self, request, *args, **kwargs):
+        today = timezone.localdate()
+        try:
+            start = parse_date(request.GET.get("start", "")) or today - timedelta(days=6)
+            end = parse_date(request.GET.get("end", "")) or today
+        except ValueError:
+            # Bien formada pero imposible, p. ej. 2024-02-31
+            return HttpResponseBadRequest("start y end deben ser fechas válidas.")
+        parking = request.GET.get("parking")
+        if parking is not None and not parking.isdigit():
+            return HttpResponseBadRequest("parking debe ser numérico.")
+
+        days = []
+        for row in get_daily_summary(start, end, parking=parking):
+            row["duration_total"] = row["duration_total"].total_seconds()
+            if row["average_stay"] is not None:
+                row["average_stay"] = row["average_stay"].total_seconds()
+            days.append(row)
+        return JsonResponse({"start": start, "end": end, "days": days},
+                            encoder=DjangoJSONEncoder)
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:44
+
+from django.db import migrations, models
+
+# Intervalos [start_date, end_date]; end_date null = abierto. Si hay datos
+# traslapados previos la migración falla y deben corregirse antes.
+# En SQLite, una migración posterior que reconstruya la tabla (AlterField,
+# AddConstraint...) descarta los triggers: hay que volver a crearlos ahí.
+
+POSTGRESQL_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    """
+    ALTER TABLE stores_unitoccupancy
+    ADD CONSTRAINT unit_occupancy_no_overlap
+    EXCLUDE USING gist (
+        unit_id WITH =,
+        tstzrange(start_date, end_date, '[]') WITH &&
+    )
+    """,
+]
+
+POSTGRESQL_BACKWARD = [
+    "ALTER TABLE stores_unitoccupancy DROP CONSTRAINT unit_occupancy_no_overlap",
+]
+
+_SQLITE_OVERLAP = """
+    EXISTS (
+        SELECT 1 FROM stores_unitoccupancy o
+        WHERE o.unit_id = NEW.unit_id
+          AND o.id IS NOT NEW.id
+          AND (NEW.end_date IS NULL OR o.start_date <= NEW.end_date)
+          AND (o.end_date IS NULL OR o.end_date >= NEW.start_date)
+    )
+"""
+
+SQLITE_FORWARD = [
+    f"""
+    CREATE TRIGGER unit_occupancy_no_overlap_insert
+    BEFORE INSERT ON stores_unitoccupancy
+    WHEN {_SQLITE_OVERLAP}
+    BEGIN SELECT RAISE(ABORT, 'unit_occupancy_no_overlap'); END
+    """,
+    f"""
+    CREATE TRIGGER unit_occupancy_no_overlap_update
+    BEFORE UPDATE OF unit_id, start_date, end_date ON stores_unitoccupancy
+    WHEN {_SQLITE_OVERLAP}
+    BEGIN SELECT RAISE(ABORT, 'unit_occupancy_no_overlap'); END
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS unit_occupancy_no_overlap_insert",
+    "DROP TRIGGER IF EXISTS unit_occupancy_no_overlap_update",
+]
+
+STATEMENTS = {
+    "postgresql": (POSTGRESQL_FORWARD, POSTGRESQL_BACKWARD),
+    "sqlite": (SQLITE_FORWARD, SQLITE_BACKWARD),
+}
+
+
+def _run(direction):
+    def run(apps, schema_editor):
+        statements = STATEMENTS.get(schema_editor.connection.vendor)
+        # Otros motores: solo queda la validación en servicios
+        for sql in statements[direction] if statements else []:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stores', '0002_alter_commercialunit_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='unitoccupancy',
+            constraint=models.CheckConstraint(condition=models.Q(('end_date__isnull', True), ('end_date__gt', models.F('start_date')), _connector='OR'), name='unit_occupancy_end_after_start'),
+        ),
+        migrations.RunPython(_run(0), _run(1)),
+    ]
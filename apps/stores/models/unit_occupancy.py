@@ -9,8 +9,15 @@ from apps.stores.models import CommercialUnit, Store
 class UnitOccupancy(models.Model):
     """
     Relación con vigencia entre una unidad y una tienda.
-    Maneja histórico. Evita traslapes por validación en clean().
+    Maneja histórico. Los intervalos son [start_date, end_date] (abierto si
+    end_date es null) y no pueden traslaparse en la misma unit: en
+    PostgreSQL lo garantiza una restricción EXCLUDE y en SQLite triggers
+    (migración 0003); clean() repite la regla con una consulta para dar
+    un mensaje en formularios y en otros motores.
     """
+    OVERLAP_CONSTRAINT = "unit_occupancy_no_overlap"
+    OVERLAP_MESSAGE = "Ya existe una ocupación que se solapa en esta unidad."
+
     unit = models.ForeignKey(
         CommercialUnit, on_delete=models.CASCADE,
         related_name="occupancies"
@@ -30,6 +37,13 @@ class UnitOccupancy(models.Model):
             models.Index(fields=["unit", "start_date"]),
             models.Index(fields=["unit", "end_date"]),
         ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(end_date__isnull=True)
+                | models.Q(end_date__gt=models.F("start_date")),
+                name="unit_occupancy_end_after_start",
+            ),
+        ]
 
     def __str__(self):
         fin = self.end_date.isoformat() if self.end_date else "present"
@@ -37,37 +51,29 @@ class UnitOccupancy(models.Model):
 
     def clean(self):
         """
-        Evita traslapes de ocupaciones en la misma unit.
-        Reglas:
-          - end_date puede ser None (ocupación actual).
-          - Intervalos se consideran [start_date, end_date] (si end_date) o abierto.
+        Valida fechas y traslapes para formularios y admin (mensaje en lugar
+        de IntegrityError). Es el mismo criterio que la restricción de la
+        base de datos, que sigue siendo la garantía ante escrituras
+        concurrentes y la única validación de los servicios de
+        apps.stores.services.
         """
-        if self.end_date and self.end_date <= self.start_date:
-            raise ValidationError(
-                {"end_date": "end_date debe ser posterior a start_date."})
-
-        # Query de solapamiento:
-        # Overlap si: (A.start <= B.end or B.end is null) AND (A.end is null or A.end >= B.start)
-        qs = UnitOccupancy.objects.filter(unit=self.unit).exclude(pk=self.pk)
-
+        self.clean_dates()
+        if self.unit_id is None or self.start_date is None:
+            return
+        overlapping = (UnitOccupancy.objects
+                       .filter(unit_id=self.unit_id)
+                       .exclude(pk=self.pk)
+                       .filter(models.Q(end_date__isnull=True)
+                               | models.Q(end_date__gte=self.start_date)))
         if self.end_date:
-            overlapping = qs.filter(
-                models.Q(end_date__isnull=True) | models.Q(
-                    start_date__lte=self.end_date),
-                # y además que su fin sea después/incluya mi inicio
-                models.Q(end_date__isnull=True) | models.Q(
-                    end_date__gte=self.start_date),
-            )
-        else:
-            # Ocupación abierta: choca con cualquier otra que no termine antes de mi inicio
-            overlapping = qs.filter(
-                models.Q(end_date__isnull=True) | models.Q(
-                    end_date__gte=self.start_date)
-            )
-
+            overlapping = overlapping.filter(start_date__lte=self.end_date)
         if overlapping.exists():
+            raise ValidationError(self.OVERLAP_MESSAGE)
+
+    def clean_dates(self):
+        if self.end_date and self.start_date and self.end_date <= self.start_date:
             raise ValidationError(
-                "Ya existe una ocupación que se solapa en esta unidad.")
+                {"end_date": "end_date debe ser posterior a start_date."})
 
     # Helper para saber si está vigente al momento 'at'
     def is_active_at(self, at=None):
@@ -1,7 +1,17 @@
-from django.db import models
+import threading
+import time
+from bisect import bisect_right
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 
-from apps.stores.models import CommercialUnit, UnitOccupancy
+from apps.stores.models import CommercialUnit, Store, UnitOccupancy
+
+_INDEX_VERSION_KEY = "stores:occupancy_index:version"
 
 
 def get_current_store_for_unit(unit: CommercialUnit, at=None):
@@ -16,3 +26,129 @@ def get_current_store_for_unit(unit: CommercialUnit, at=None):
            .order_by("-start_date")
            .first())
     return occ.store if occ else None
+
+
+def get_current_stores_for_units(units, at=None):
+    """
+    Store vigente de cada unidad en el instante 'at', en una sola consulta.
+
+    Acepta unidades o sus ids y devuelve un dict unit_id -> Store (o None
+    si la unidad estaba vacía). Con traslapes gana la ocupación que inició
+    más tarde, igual que get_current_store_for_unit().
+    """
+    at = at or timezone.now()
+    unit_ids = [getattr(unit, "pk", unit) for unit in units]
+    stores = dict.fromkeys(unit_ids)
+
+    occupancies = (UnitOccupancy.objects
+                   .filter(unit_id__in=unit_ids, start_date__lte=at)
+                   .filter(models.Q(end_date__isnull=True) | models.Q(end_date__gte=at))
+                   .select_related("store")
+                   .order_by("unit_id", "-start_date"))
+    for occ in occupancies:
+        if stores[occ.unit_id] is None:
+            stores[occ.unit_id] = occ.store
+    return stores
+
+
+class UnitOccupancyIndex:
+    """
+    Histórico de ocupaciones de una ubicación en memoria: por unidad,
+    arreglos de inicios, fines y tiendas ordenados por inicio. Como las
+    ocupaciones de una unidad no se traslapan, la vigente en 'at' es la
+    última que inicia en o antes de 'at' (bisect), si no ha terminado.
+    """
+
+    def __init__(self, occupancies):
+        self._units = {}
+        for occ in occupancies:
+            starts, ends, stores = self._units.setdefault(occ.unit_id, ([], [], []))
+            starts.append(occ.start_date)
+            ends.append(occ.end_date)
+            stores.append(occ.store)
+
+    @classmethod
+    def for_location(cls, location_id):
+        return cls(UnitOccupancy.objects
+                   .filter(unit__location_id=location_id)
+                   .select_related("store")
+                   .order_by("unit_id", "start_date"))
+
+    def store_at(self, unit_id, at):
+        if unit_id not in self._units:
+            return None
+        starts, ends, stores = self._units[unit_id]
+        i = bisect_right(starts, at) - 1
+        if i < 0 or (ends[i] is not None and ends[i] < at):
+            return None
+        return stores[i]
+
+    def stores_at(self, unit_ids, at):
+        return {unit_id: self.store_at(unit_id, at) for unit_id in unit_ids}
+
+    def __len__(self):
+        return sum(len(starts) for starts, _, _ in self._units.values())
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _index_version():
+    return cache.get_or_set(_INDEX_VERSION_KEY, 1, timeout=None)
+
+
+def get_occupancy_index(location_id):
+    """
+    UnitOccupancyIndex de la ubicación, cacheado en memoria del proceso.
+
+    Se reconstruye (una consulta) cuando cambia la versión guardada en el
+    cache de Django, que se incrementa con cada escritura de UnitOccupancy
+    o Store, o a los STORES_OCCUPANCY_INDEX_TTL segundos. La versión solo
+    llega a los demás procesos con un cache compartido (Redis); con el
+    LocMemCache por defecto ellos dependen del TTL.
+    Los update()/bulk_create() no emiten señales: después de usarlos hay
+    que llamar a invalidate_occupancy_index().
+    """
+    version = _index_version()
+    entry = _indexes.get(location_id)
+    if entry is not None and entry[0] == version and entry[1] > time.monotonic():
+        return entry[2]
+
+    index = UnitOccupancyIndex.for_location(location_id)
+    expires = time.monotonic() + settings.STORES_OCCUPANCY_INDEX_TTL
+    with _indexes_lock:
+        _indexes[location_id] = (version, expires, index)
+    return index
+
+
+def get_store_for_unit_at(unit: CommercialUnit, at=None):
+    """
+    Como get_current_store_for_unit(), pero resuelto con el índice en
+    memoria de la ubicación: las consultas repetidas no tocan la BD.
+    """
+    at = at or timezone.now()
+    return get_occupancy_index(unit.location_id).store_at(unit.pk, at)
+
+
+def invalidate_occupancy_index():
+    _bump_index_version()
+    # Una lectura concurrente pudo reconstruir el índice con datos previos
+    transaction.on_commit(_bump_index_version)
+
+
+def _bump_index_version():
+    try:
+        cache.incr(_INDEX_VERSION_KEY)
+    except ValueError:
+        cache.set(_INDEX_VERSION_KEY, 1, timeout=None)
+    with _indexes_lock:
+        _indexes.clear()
+
+
+@receiver(post_save, sender=UnitOccupancy)
+@receiver(post_delete, sender=UnitOccupancy)
+@receiver(post_save, sender=Store)
+@receiver(post_delete, sender=Store)
+def invalidate_on_write(sender, **kwargs):
+    invalidate_occupancy_index()
@@ -0,0 +1 @@
+from .unit_occupancy import *
@@ -0,0 +1,34 @@
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from apps.stores.models import UnitOccupancy
+
+
+def save_unit_occupancy(occupancy: UnitOccupancy):
+    """
+    Guarda la ocupación en una sola sentencia. El traslape lo detecta la
+    base de datos (también entre escrituras concurrentes) y se traduce al
+    mismo ValidationError que levanta clean(), sin su consulta previa.
+    """
+    occupancy.clean_dates()
+    try:
+        # Savepoint: el error no invalida la transacción del llamador
+        with transaction.atomic():
+            occupancy.save()
+    except IntegrityError as e:
+        if UnitOccupancy.OVERLAP_CONSTRAINT in str(e):
+            raise ValidationError(UnitOccupancy.OVERLAP_MESSAGE) from e
+        raise
+    return occupancy
+
+
+def create_unit_occupancy(unit, store, start_date, end_date=None):
+    return save_unit_occupancy(UnitOccupancy(
+        unit=unit, store=store, start_date=start_date, end_date=end_date))
+
+
+def close_unit_occupancy(occupancy: UnitOccupancy, end_date):
+    """Termina una ocupación vigente en `end_date`."""
+    occupancy.end_date = end_date
+    return save_unit_occupancy(occupancy)
+
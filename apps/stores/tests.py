@@ -1,3 +1,122 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.locations.models import Location
+from apps.stores.models import CommercialUnit, Store, UnitOccupancy
+from apps.stores.selectors import unit_occupancy as selectors
+from apps.stores.selectors import (
+    get_current_store_for_unit,
+    get_current_stores_for_units,
+    get_occupancy_index,
+    get_store_for_unit_at,
+)
+from apps.stores.services import close_unit_occupancy, create_unit_occupancy
+
+
+class StoreResolutionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        selectors._indexes.clear()
+        self.now = timezone.now()
+        self.location = Location.objects.create(name="Plaza")
+        self.units = [CommercialUnit.objects.create(location=self.location, code=f"L{i}")
+                      for i in range(3)]
+        self.old, self.new = Store.objects.create(name="Vieja"), Store.objects.create(name="Nueva")
+        # L0: "Vieja" hasta hace 10 días, luego "Nueva"; L1: "Vieja"; L2: vacía
+        UnitOccupancy.objects.create(
+            unit=self.units[0], store=self.old,
+            start_date=self.now - timedelta(days=30),
+            end_date=self.now - timedelta(days=10))
+        UnitOccupancy.objects.create(
+            unit=self.units[0], store=self.new,
+            start_date=self.now - timedelta(days=10) + timedelta(seconds=1))
+        UnitOccupancy.objects.create(
+            unit=self.units[1], store=self.old,
+            start_date=self.now - timedelta(days=30))
+
+    def expected(self, at):
+        return {unit.pk: get_current_store_for_unit(unit, at) for unit in self.units}
+
+    def test_batch_matches_per_unit_selector_in_one_query(self):
+        for days in (40, 20, 10, 0):
+            at = self.now - timedelta(days=days)
+            expected = self.expected(at)
+            with self.assertNumQueries(1):
+                self.assertEqual(get_current_stores_for_units(self.units, at), expected)
+
+    def test_index_answers_without_queries(self):
+        get_occupancy_index(self.location.pk)
+        for days in (40, 20, 10, 0):
+            at = self.now - timedelta(days=days)
+            expected = self.expected(at)
+            with self.assertNumQueries(0):
+                self.assertEqual(
+                    {unit.pk: get_store_for_unit_at(unit, at) for unit in self.units},
+                    expected)
+
+    def test_writes_invalidate_the_index(self):
+        self.assertIsNone(get_store_for_unit_at(self.units[2], self.now))
+        UnitOccupancy.objects.create(
+            unit=self.units[2], store=self.new, start_date=self.now - timedelta(days=1))
+        self.assertEqual(get_store_for_unit_at(self.units[2], self.now), self.new)
+
+    @override_settings(STORES_OCCUPANCY_INDEX_TTL=60)
+    def test_index_expires_without_invalidation(self):
+        # Una escritura de otro proceso: la versión local no cambia
+        self.assertIsNone(get_store_for_unit_at(self.units[2], self.now))
+        UnitOccupancy.objects.bulk_create([UnitOccupancy(
+            unit=self.units[2], store=self.new, start_date=self.now - timedelta(days=1))])
+        self.assertIsNone(get_store_for_unit_at(self.units[2], self.now))
+        later = selectors.time.monotonic() + 61
+        with mock.patch.object(selectors.time, "monotonic", return_value=later):
+            self.assertEqual(get_store_for_unit_at(self.units[2], self.now), self.new)
+
+
+class UnitOccupancyOverlapTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.unit = CommercialUnit.objects.create(
+            location=Location.objects.create(name="Plaza"), code="L1")
+        self.store = Store.objects.create(name="Tienda")
+        self.current = create_unit_occupancy(
+            self.unit, self.store, self.now - timedelta(days=30))
+
+    def assertOverlap(self, context):
+        self.assertEqual(context.exception.messages, [UnitOccupancy.OVERLAP_MESSAGE])
+
+    def test_database_rejects_overlap(self):
+        with self.assertRaises(ValidationError) as context:
+            create_unit_occupancy(self.unit, self.store, self.now - timedelta(days=1))
+        self.assertOverlap(context)
+        # Savepoint: la transacción del llamador sigue utilizable
+        self.assertEqual(UnitOccupancy.objects.count(), 1)
+
+    def test_close_then_reopen(self):
+        end = self.now - timedelta(days=1)
+        close_unit_occupancy(self.current, end)
+        # Intervalos cerrados: empezar justo en end_date se traslapa
+        with self.assertRaises(ValidationError) as context:
+            create_unit_occupancy(self.unit, self.store, end)
+        self.assertOverlap(context)
+        create_unit_occupancy(self.unit, self.store, end + timedelta(seconds=1))
+        self.assertEqual(UnitOccupancy.objects.count(), 2)
+
+    def test_clean_uses_the_same_rule(self):
+        with self.assertRaises(ValidationError) as context:
+            UnitOccupancy(unit=self.unit, store=self.store,
+                          start_date=self.now - timedelta(days=40),
+                          end_date=self.now - timedelta(days=30)).clean()
+        self.assertOverlap(context)
+        UnitOccupancy(unit=self.unit, store=self.store,
+                      start_date=self.now - timedelta(days=40),
+                      end_date=self.now - timedelta(days=31)).clean()
+
+    def test_dates_are_checked_before_saving(self):
+        with self.assertNumQueries(0), self.assertRaises(ValidationError) as context:
+            close_unit_occupancy(self.current, self.current.start_date)
+        self.assertIn("end_date", context.exception.message_dict)
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from apps.tickets.services.archive import archive_tickets, purge_archived_tickets
+
+
+class Command(BaseCommand):
+    help = ("Mueve los tickets cerrados antiguos a ArchivedTicket y purga "
+            "el archivo según la política de retención.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days", type=int,
+            help="Antigüedad mínima a archivar (default: TICKET_ARCHIVE_AFTER_DAYS).",
+        )
+        parser.add_argument(
+            "--retention-days", type=int,
+            help="Retención del archivo (default: TICKET_ARCHIVE_RETENTION_DAYS).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--time-budget", type=float,
+            help="Segundos máximos por fase; lo pendiente se retoma después.",
+        )
+        parser.add_argument(
+            "--skip-purge", action="store_true",
+            help="Solo archiva, sin purgar el archivo.",
+        )
+
+    def handle(self, *args, **options):
+        result = archive_tickets(
+            older_than_days=options["older_than_days"],
+            batch_size=options["batch_size"],
+            time_budget=options["time_budget"],
+        )
+        self._report("archivados", result)
+
+        if not options["skip_purge"]:
+            result = purge_archived_tickets(
+                older_than_days=options["retention_days"],
+                batch_size=options["batch_size"],
+                time_budget=options["time_budget"],
+            )
+            self._report("purgados del archivo", result)
+
+    def _report(self, action, result):
+        message = f"{result.rows} tickets {action} en {result.batches} lotes."
+        if result.complete:
+            self.stdout.write(self.style.SUCCESS(message))
+        else:
+            self.stdout.write(self.style.WARNING(message + " (incompleto)"))
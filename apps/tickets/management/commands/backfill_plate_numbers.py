@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from apps.tickets.models import Ticket, normalize_plate
+
+
+class Command(BaseCommand):
+    help = "Llena Ticket.plate_normalized en los tickets anteriores al campo."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        pending = (Ticket.objects
+                   .filter(plate_normalized="", plate_number__isnull=False)
+                   .exclude(plate_number="")
+                   .order_by("pk"))
+        total, last_pk = 0, None
+
+        while True:
+            qs = pending if last_pk is None else pending.filter(pk__gt=last_pk)
+            rows = list(qs.values_list("pk", "plate_number")[:options["batch_size"]])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            tickets = [Ticket(pk=pk, plate_normalized=normalize_plate(plate))
+                       for pk, plate in rows]
+            Ticket.objects.bulk_update(tickets, ["plate_normalized"])
+            total += len(tickets)
+
+        self.stdout.write(self.style.SUCCESS(f"{total} placas normalizadas."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from apps.tickets.services.expiry import expire_overdue_tickets
+
+
+class Command(BaseCommand):
+    help = "Marca como EXPIRED los tickets emitidos que excedieron la tolerancia."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=500,
+            help="Tickets por UPDATE (default: 500).",
+        )
+        parser.add_argument(
+            "--time-budget", type=float, default=50,
+            help="Segundos máximos por ejecución (default: 50).",
+        )
+
+    def handle(self, *args, **options):
+        result = expire_overdue_tickets(
+            batch_size=options["batch_size"],
+            time_budget=options["time_budget"],
+        )
+        message = f"{result.expired} tickets expirados en {result.batches} lotes."
+        if result.complete:
+            self.stdout.write(self.style.SUCCESS(message))
+        else:
+            self.stdout.write(self.style.WARNING(
+                message + " Presupuesto agotado; quedan tickets pendientes."))
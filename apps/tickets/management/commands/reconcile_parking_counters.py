@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.tickets.services.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Reconstruye los contadores en vivo de cada parking desde Ticket."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--parking", type=int, action="append", dest="parkings",
+            help="Limita la reconstrucción a este parking (repetible).",
+        )
+
+    def handle(self, *args, **options):
+        counters = reconcile_counters(parkings=options["parkings"])
+        for counter in counters:
+            self.stdout.write(
+                f"Parking {counter.parking_id}: {counter.open_tickets} abiertos, "
+                f"{counter.entries_today} entradas, {counter.exits_today} salidas, "
+                f"${counter.revenue_today} hoy"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(counters)} contadores reconciliados."))
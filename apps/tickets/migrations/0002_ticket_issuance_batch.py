@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:31
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketIssuanceBatch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('idempotency_key', models.CharField(max_length=128, unique=True)),
+                ('codes', models.JSONField(blank=True, default=list)),
+                ('errors', models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                'verbose_name': 'Lote de emisión',
+                'verbose_name_plural': 'Lotes de emisión',
+            },
+        ),
+        migrations.AlterField(
+            model_name='ticket',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:34
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parkings', '0002_parking_counter'),
+        ('stores', '0002_alter_commercialunit_created_at_and_more'),
+        ('tickets', '0002_ticket_issuance_batch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTicket',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('code', models.CharField(db_index=True, max_length=64)),
+                ('paid_at', models.DateTimeField(blank=True, null=True)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('discount_applied', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('exit_time', models.DateTimeField(blank=True, null=True)),
+                ('plate_number', models.CharField(blank=True, max_length=20, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('issued', 'Issued'), ('validated', 'Validated'), ('paid', 'Paid'), ('exited', 'Exited'), ('expired', 'Expired'), ('lost', 'Lost'), ('canceled', 'Canceled')], max_length=16)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('parking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tickets', to='parkings.parking')),
+                ('validated_by_store', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_validated_tickets', to='stores.store')),
+            ],
+            options={
+                'verbose_name': 'Ticket archivado',
+                'verbose_name_plural': 'Tickets archivados',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['parking', 'created_at'], name='tickets_arc_parking_bc2f31_idx'), models.Index(fields=['created_at'], name='tickets_arc_created_63c3e9_idx')],
+            },
+        ),
+    ]
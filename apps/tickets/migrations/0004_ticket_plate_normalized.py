@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parkings', '0002_parking_counter'),
+        ('stores', '0002_alter_commercialunit_created_at_and_more'),
+        ('tickets', '0003_archived_ticket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedticket',
+            name='plate_normalized',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='plate_normalized',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Placa normalizada para búsquedas (ver normalize_plate)', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['plate_normalized'], name='tickets_tic_plate_n_bb8121_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parkings', '0002_parking_counter'),
+        ('stores', '0002_alter_commercialunit_created_at_and_more'),
+        ('tickets', '0004_ticket_plate_normalized'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['updated_at'], name='tickets_tic_updated_c8331d_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parkings', '0002_parking_counter'),
+        ('tickets', '0006_uuid_primary_key_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketCodeSequence',
+            fields=[
+                ('parking', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='code_sequence', serialize=False, to='parkings.parking')),
+                ('next_value', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Secuencia de códigos',
+                'verbose_name_plural': 'Secuencias de códigos',
+            },
+        ),
+    ]
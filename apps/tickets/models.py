@@ -1,4 +1,7 @@
+import re
 from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
@@ -8,6 +11,24 @@ from apps.parkings.models import Parking
 from apps.stores.models import Store
 
 
+def normalize_plate(value):
+    """Placa en mayúsculas y sin espacios, guiones ni otros separadores."""
+    return re.sub(r"[^0-9A-Z]", "", (value or "").upper())
+
+
+def fee_for_duration(duration, hourly_rate=None):
+    """
+    Tarifa de una estadía (implementación básica): por hora, mínimo una.
+    La usan Ticket y TicketRow. Devuelve un Decimal al centavo, como
+    Ticket.amount.
+    """
+    if not hourly_rate:
+        hourly_rate = 20  # Tarifa por defecto
+    hours = max(Decimal(1), Decimal(duration.total_seconds()) / 3600)  # Mínimo 1 hora
+    fee = hours * Decimal(str(hourly_rate))
+    return fee.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
 class Ticket(BaseModel):
     class Status(models.TextChoices):
         ISSUED = "issued", "Issued"
@@ -50,6 +71,13 @@ class Ticket(BaseModel):
         null=True,
         help_text="Placa del vehículo"
     )
+    plate_normalized = models.CharField(
+        max_length=20,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Placa normalizada para búsquedas (ver normalize_plate)"
+    )
     notes = models.TextField(
         blank=True,
         help_text="Observaciones adicionales"
@@ -70,6 +98,8 @@ class Ticket(BaseModel):
             models.Index(fields=["status", "created_at"]),
             models.Index(fields=["exit_time"]),
             models.Index(fields=["plate_number"]),
+            models.Index(fields=["plate_normalized"]),
+            models.Index(fields=["updated_at"]),
         ]
         constraints = [
             models.CheckConstraint(
@@ -84,6 +114,13 @@ class Ticket(BaseModel):
 
     def __str__(self):
         return f"Ticket {self.code} ({self.status})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Estado leído de la BD, para detectar cambios de estado al guardar
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
     
     @property
     def entry_time(self):
@@ -108,11 +145,8 @@ class Ticket(BaseModel):
         return self.duration > timedelta(minutes=self.parking.tolerance_minutes)
     
     def calculate_fee(self, hourly_rate=None):
-        """Calcula la tarifa basada en la duración (implementación básica)"""
-        if not hourly_rate:
-            hourly_rate = 20  # Tarifa por defecto
-        hours = max(1.0, self.duration.total_seconds() / 3600)  # Mínimo 1 hora
-        return round(hours * hourly_rate, 2)
+        """Calcula la tarifa basada en la duración (ver fee_for_duration)"""
+        return fee_for_duration(self.duration, hourly_rate)
     
     def can_exit(self):
         """Verifica si el ticket puede ser usado para salir"""
@@ -147,5 +181,97 @@ class Ticket(BaseModel):
     
     def save(self, *args, **kwargs):
         """Override save para ejecutar validaciones"""
+        self.plate_normalized = normalize_plate(self.plate_number)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "plate_number" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "plate_normalized"}
         self.clean()
         super().save(*args, **kwargs)
+
+
+class TicketIssuanceBatch(BaseModel):
+    """
+    Registro de un lote de emisión enviado por una caseta de entrada.
+    La idempotency_key evita duplicar tickets cuando la caseta reintenta.
+    """
+    idempotency_key = models.CharField(max_length=128, unique=True)
+    codes = models.JSONField(default=list, blank=True)
+    errors = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        verbose_name = "Lote de emisión"
+        verbose_name_plural = "Lotes de emisión"
+
+    def __str__(self):
+        return f"Lote {self.idempotency_key} ({len(self.codes)} tickets)"
+
+
+class TicketCodeSequence(models.Model):
+    """
+    Siguiente número de secuencia de códigos de ticket por parking. Cada
+    proceso reserva bloques con un UPDATE F() (ver
+    apps.tickets.services.codes), así que no hay dos procesos con el
+    mismo número.
+    """
+    parking = models.OneToOneField(
+        Parking,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="code_sequence"
+    )
+    next_value = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Secuencia de códigos"
+        verbose_name_plural = "Secuencias de códigos"
+
+    def __str__(self):
+        return f"Secuencia de {self.parking} ({self.next_value})"
+
+
+class ArchivedTicket(models.Model):
+    """
+    Tickets cerrados movidos fuera de la tabla caliente. Mismas columnas
+    que Ticket (incluido su id) más la fecha en que se archivaron.
+    """
+    id = models.UUIDField(primary_key=True, editable=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    parking = models.ForeignKey(
+        Parking,
+        on_delete=models.CASCADE,
+        related_name="archived_tickets"
+    )
+    code = models.CharField(max_length=64, db_index=True)
+    paid_at = models.DateTimeField(blank=True, null=True)
+    validated_by_store = models.ForeignKey(
+        Store,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_validated_tickets"
+    )
+    amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    discount_applied = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=0
+    )
+    exit_time = models.DateTimeField(null=True, blank=True)
+    plate_number = models.CharField(max_length=20, blank=True, null=True)
+    plate_normalized = models.CharField(max_length=20, blank=True, default="")
+    notes = models.TextField(blank=True)
+    status = models.CharField(max_length=16, choices=Ticket.Status.choices)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Ticket archivado"
+        verbose_name_plural = "Tickets archivados"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["parking", "created_at"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Ticket archivado {self.code} ({self.status})"
@@ -0,0 +1,5 @@
+from .tickets import *
+from .lookup import *
+from .history import *
+from .plates import *
+from .occupancy import *
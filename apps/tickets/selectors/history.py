@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.tickets.models import ArchivedTicket, Ticket
+
+HISTORY_FIELDS = (
+    "id", "code", "parking_id", "status", "created_at", "paid_at",
+    "exit_time", "amount", "discount_applied", "validated_by_store_id",
+    "plate_number",
+)
+
+
+def ticket_history(parking=None, start=None, end=None, statuses=None,
+                   fields=HISTORY_FIELDS):
+    """
+    values_list de tickets vivos y archivados con los mismos filtros.
+
+    Si `start` es más reciente que la antigüedad mínima de archivo, la
+    consulta no toca ArchivedTicket.
+    """
+    def filtered(qs):
+        if parking is not None:
+            qs = qs.filter(parking=parking)
+        if start is not None:
+            qs = qs.filter(created_at__gte=start)
+        if end is not None:
+            qs = qs.filter(created_at__lt=end)
+        if statuses:
+            qs = qs.filter(status__in=statuses)
+        return qs.order_by().values_list(*fields)
+
+    live = filtered(Ticket.objects.all())
+    archive_horizon = (timezone.now()
+                       - timedelta(days=settings.TICKET_ARCHIVE_AFTER_DAYS))
+    if start is not None and start >= archive_horizon:
+        return live
+    return live.union(filtered(ArchivedTicket.objects.all()), all=True)
@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.tickets.models import Ticket
+from apps.tickets.selectors.tickets import TicketRow, get_ticket_row
+from apps.tickets.signals import ticket_status_changed
+
+
+class LocalTTLCache:
+    """LRU en memoria del proceso, con expiración por entrada."""
+
+    def __init__(self, maxsize=1024, ttl=5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class _LookupStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.local_hits = self.shared_hits = self.misses = 0
+
+    def incr(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+_options = getattr(settings, "TICKET_LOOKUP_CACHE", {})
+_local = LocalTTLCache(
+    maxsize=_options.get("LOCAL_MAXSIZE", 1024),
+    ttl=_options.get("LOCAL_TTL", 5),
+)
+_shared_alias = _options.get("ALIAS", "default")
+_shared_ttl = _options.get("SHARED_TTL", 60)
+_stats = _LookupStats()
+
+
+def _cache_key(code):
+    return f"tickets:code:{code}"
+
+
+def get_ticket_by_code(code: str):
+    """
+    TicketRow para el código escaneado, o None si no existe.
+
+    Primero consulta el LRU local del proceso, luego el cache de Django
+    (compartido entre procesos) y solo en último caso la base de datos.
+    Los cambios de estado invalidan ambos niveles en este proceso; los LRU
+    de otros procesos caducan por TTL (LOCAL_TTL, unos segundos).
+    """
+    key = _cache_key(code)
+
+    row = _local.get(key)
+    if row is not None:
+        _stats.incr("local_hits")
+        return row
+
+    values = caches[_shared_alias].get(key)
+    if values is not None:
+        _stats.incr("shared_hits")
+        row = TicketRow(*values)
+        _local.set(key, row)
+        return row
+
+    _stats.incr("misses")
+    row = get_ticket_row(code)
+    if row is not None:
+        caches[_shared_alias].set(
+            key, [getattr(row, name) for name in row.attributes], _shared_ttl)
+        _local.set(key, row)
+    return row
+
+
+async def aget_ticket_by_code(code: str):
+    """Versión asíncrona de get_ticket_by_code() para las vistas ASGI."""
+    key = _cache_key(code)
+
+    row = _local.get(key)
+    if row is not None:
+        _stats.incr("local_hits")
+        return row
+
+    values = await caches[_shared_alias].aget(key)
+    if values is not None:
+        _stats.incr("shared_hits")
+        row = TicketRow(*values)
+        _local.set(key, row)
+        return row
+
+    _stats.incr("misses")
+    values = await (Ticket.objects
+                    .filter(code=code)
+                    .values_list(*TicketRow.fields)
+                    .afirst())
+    if values is None:
+        return None
+    row = TicketRow(*values)
+    await caches[_shared_alias].aset(key, list(values), _shared_ttl)
+    _local.set(key, row)
+    return row
+
+
+def invalidate_ticket_code(*codes):
+    keys = [_cache_key(code) for code in codes]
+    _delete_keys(keys)
+    # Una lectura concurrente pudo volver a cachear el valor anterior antes
+    # del commit; se borra otra vez al confirmar la transacción.
+    transaction.on_commit(lambda: _delete_keys(keys))
+
+
+def _delete_keys(keys):
+    for key in keys:
+        _local.delete(key)
+    caches[_shared_alias].delete_many(keys)
+
+
+def get_ticket_lookup_stats():
+    """Aciertos por nivel y fallos, para dimensionar el cache."""
+    total = _stats.local_hits + _stats.shared_hits + _stats.misses
+    hits = _stats.local_hits + _stats.shared_hits
+    return {
+        "local_hits": _stats.local_hits,
+        "shared_hits": _stats.shared_hits,
+        "misses": _stats.misses,
+        "hit_ratio": hits / total if total else 0.0,
+        "local_size": len(_local),
+        "local_maxsize": _local.maxsize,
+    }
+
+
+def reset_ticket_lookup_stats():
+    _stats.reset()
+
+
+def reset_ticket_lookup_cache():
+    _local.clear()
+    _stats.reset()
+
+
+@receiver(ticket_status_changed)
+def invalidate_on_status_change(sender, changes, **kwargs):
+    invalidate_ticket_code(*(change.code for change in changes))
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def invalidate_on_write(sender, instance, **kwargs):
+    invalidate_ticket_code(instance.code)
@@ -0,0 +1,91 @@
+from django.db.models.functions import Length
+
+from apps.tickets.models import Ticket, normalize_plate
+from apps.tickets.selectors.tickets import TicketRow
+from apps.tickets.services.counters import ACTIVE_STATUSES
+
+# Caracteres que las cámaras de placas confunden entre sí
+_OCR_CONFUSIONS = str.maketrans("OQDILZSBG", "000112586")
+
+
+class TicketPlateRow(TicketRow):
+    fields = TicketRow.fields + ("plate_number",)
+    __slots__ = ("plate_number",)
+    attributes = TicketRow.attributes + __slots__
+
+
+def _open_tickets():
+    return Ticket.objects.filter(status__in=ACTIVE_STATUSES, exit_time__isnull=True)
+
+
+def _rows(queryset, limit):
+    return [TicketPlateRow(*values) for values
+            in queryset.values_list(*TicketPlateRow.fields)[:limit]]
+
+
+def find_tickets_by_plate(plate, open_only=True, limit=20):
+    """Coincidencia exacta sobre la placa normalizada (usa su índice)."""
+    qs = _open_tickets() if open_only else Ticket.objects.all()
+    return _rows(qs.filter(plate_normalized=normalize_plate(plate)), limit)
+
+
+def find_tickets_by_plate_prefix(prefix, open_only=True, limit=20):
+    """
+    Placas que empiezan con `prefix`. Se expresa como rango (>= prefijo y
+    < prefijo + carácter máximo) para que cualquier motor use el btree.
+    """
+    prefix = normalize_plate(prefix)
+    if not prefix:
+        return []
+    qs = _open_tickets() if open_only else Ticket.objects.all()
+    qs = qs.filter(plate_normalized__gte=prefix,
+                   plate_normalized__lt=prefix + "\uffff")
+    return _rows(qs.order_by("plate_normalized"), limit)
+
+
+def find_open_tickets_by_plate_fuzzy(plate, limit=20):
+    """
+    Tickets abiertos cuya placa coincide tolerando errores de lectura:
+    cualquier número de confusiones típicas de OCR (0/O, 1/I, 8/B, ...)
+    más un carácter sustituido, sobrante o faltante.
+
+    Primero intenta la coincidencia exacta; si no hay, compara solo contra
+    los tickets abiertos de longitud similar, un conjunto acotado por la
+    capacidad de los estacionamientos.
+    """
+    exact = find_tickets_by_plate(plate, limit=limit)
+    if exact:
+        return exact
+
+    target = normalize_plate(plate)
+    if not target:
+        return []
+    skeleton = target.translate(_OCR_CONFUSIONS)
+    candidates = (_open_tickets()
+                  .annotate(plate_length=Length("plate_normalized"))
+                  .filter(plate_length__gte=len(target) - 1,
+                          plate_length__lte=len(target) + 1)
+                  .values_list("plate_normalized", flat=True)
+                  .distinct())
+    matches = [
+        candidate for candidate in candidates
+        if _within_one_edit(candidate.translate(_OCR_CONFUSIONS), skeleton)
+    ]
+    if not matches:
+        return []
+    return _rows(_open_tickets().filter(plate_normalized__in=matches), limit)
+
+
+def _within_one_edit(a, b):
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            if len(a) == len(b):
+                return a[i + 1:] == b[i + 1:]
+            return a[i:] == b[i + 1:]
+    return True
@@ -0,0 +1,104 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from apps.tickets.models import Ticket, fee_for_duration
+
+
+class TicketRow:
+    """
+    Proyección de solo lectura de un Ticket construida desde values_list.
+    Evita construir la instancia del ORM en las rutas calientes (casetas,
+    listados); replica las reglas de negocio que esas rutas necesitan.
+    """
+    fields = (
+        "id", "code", "status", "parking_id", "created_at", "exit_time",
+        "amount", "discount_applied", "parking__tolerance_minutes",
+    )
+    __slots__ = (
+        "id", "code", "status", "parking_id", "created_at", "exit_time",
+        "amount", "discount_applied", "tolerance_minutes",
+    )
+    attributes = __slots__
+
+    def __init__(self, *values):
+        for name, value in zip(self.attributes, values):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.code} ({self.status})>"
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def entry_time(self):
+        return self.created_at
+
+    @property
+    def duration(self):
+        """Duración de la estadía en el estacionamiento"""
+        end_time = self.exit_time or timezone.now()
+        return end_time - self.created_at
+
+    @property
+    def total_amount(self):
+        """Monto total después de aplicar descuentos"""
+        return max(Decimal(0), self.amount - self.discount_applied)
+
+    def is_expired(self):
+        """Verifica si el ticket ha excedido el tiempo de tolerancia"""
+        if self.tolerance_minutes is None:
+            return False
+        return self.duration > timedelta(minutes=self.tolerance_minutes)
+
+    def calculate_fee(self, hourly_rate=None):
+        """Calcula la tarifa basada en la duración (ver fee_for_duration)"""
+        return fee_for_duration(self.duration, hourly_rate)
+
+    def can_exit(self):
+        """Verifica si el ticket puede ser usado para salir"""
+        return self.status in (Ticket.Status.PAID, Ticket.Status.VALIDATED)
+
+    def get_status_display(self):
+        return Ticket.Status(self.status).label
+
+
+class TicketListRow(TicketRow):
+    """TicketRow con los nombres que muestran las tablas del dashboard."""
+    fields = TicketRow.fields + (
+        "parking__location__name", "validated_by_store__name",
+    )
+    __slots__ = ("location_name", "store_name")
+    attributes = TicketRow.attributes + __slots__
+
+
+def _rows(queryset, row_class=TicketRow):
+    return [row_class(*values)
+            for values in queryset.values_list(*row_class.fields)]
+
+
+def get_ticket_row(code: str):
+    """Ticket por código como TicketRow, o None si no existe."""
+    values = (Ticket.objects
+              .filter(code=code)
+              .values_list(*TicketRow.fields)
+              .first())
+    return TicketRow(*values) if values else None
+
+
+def list_ticket_rows(parking=None, statuses=None, limit=50):
+    """Listado liviano de tickets, más recientes primero."""
+    qs = Ticket.objects.all()
+    if parking is not None:
+        qs = qs.filter(parking=parking)
+    if statuses:
+        qs = qs.filter(status__in=statuses)
+    return _rows(qs.order_by("-created_at")[:limit], TicketListRow)
+
+
+def get_recent_ticket_rows(limit=10):
+    """Tickets recientes para la tabla del dashboard."""
+    return list_ticket_rows(limit=limit)
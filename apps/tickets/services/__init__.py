@@ -0,0 +1,7 @@
+from .issuance import *
+from .counters import *
+from .state_machine import *
+from .expiry import *
+from .archive import *
+from .validation import *
+from .codes import *
@@ -0,0 +1,103 @@
+import time
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.tickets.models import ArchivedTicket, Ticket
+
+ARCHIVABLE_STATUSES = (
+    Ticket.Status.EXITED,
+    Ticket.Status.CANCELED,
+    Ticket.Status.EXPIRED,
+)
+
+# Columnas que comparten Ticket y ArchivedTicket
+ARCHIVE_FIELDS = [field.attname for field in Ticket._meta.concrete_fields]
+
+
+class ArchiveMismatch(Exception):
+    pass
+
+
+class ArchiveResult(NamedTuple):
+    rows: int
+    batches: int
+    complete: bool  # False si se agotó el presupuesto de tiempo
+
+
+def archive_tickets(older_than_days=None, batch_size=1000, time_budget=None):
+    """
+    Mueve tickets cerrados y antiguos a ArchivedTicket por lotes.
+
+    Cada lote lee (con select_for_update), copia y borra en una misma
+    transacción, así que el proceso puede interrumpirse y retomarse en
+    cualquier momento sin perder ni duplicar tickets. Si el número de
+    borrados no coincide con el de copiados se revierte el lote y se
+    levanta ArchiveMismatch.
+    """
+    if older_than_days is None:
+        older_than_days = settings.TICKET_ARCHIVE_AFTER_DAYS
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    candidates = (Ticket.objects
+                  .filter(status__in=ARCHIVABLE_STATUSES, created_at__lt=cutoff)
+                  .order_by("created_at"))
+
+    def move_batch():
+        with transaction.atomic():
+            # Lectura, copia y borrado en la misma transacción con las filas
+            # bloqueadas: un ticket no puede cambiar de estado a la mitad
+            rows = list(candidates.select_for_update()
+                        .values(*ARCHIVE_FIELDS)[:batch_size])
+            if not rows:
+                return 0
+            now = timezone.now()
+            ArchivedTicket.objects.bulk_create(
+                [ArchivedTicket(archived_at=now, **row) for row in rows],
+                ignore_conflicts=True,
+            )
+            _, deleted = Ticket.objects.filter(
+                pk__in=[row["id"] for row in rows],
+                status__in=ARCHIVABLE_STATUSES,
+            ).delete()
+            if deleted.get(Ticket._meta.label, 0) != len(rows):
+                # Se revierte el lote completo: ni copia ni borrado
+                raise ArchiveMismatch(
+                    f"Se archivaron {len(rows)} tickets pero se borraron "
+                    f"{deleted.get(Ticket._meta.label, 0)}.")
+        return len(rows)
+
+    return _run_batches(move_batch, time_budget)
+
+
+def purge_archived_tickets(older_than_days=None, batch_size=1000, time_budget=None):
+    """Borra del archivo los tickets que superan el periodo de retención."""
+    if older_than_days is None:
+        older_than_days = settings.TICKET_ARCHIVE_RETENTION_DAYS
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    expired = (ArchivedTicket.objects
+               .filter(created_at__lt=cutoff)
+               .order_by("created_at"))
+
+    def purge_batch():
+        ids = list(expired.values_list("pk", flat=True)[:batch_size])
+        if ids:
+            ArchivedTicket.objects.filter(pk__in=ids).delete()
+        return len(ids)
+
+    return _run_batches(purge_batch, time_budget)
+
+
+def _run_batches(run_batch, time_budget):
+    started = time.monotonic()
+    rows = batches = 0
+    while True:
+        if time_budget is not None and time.monotonic() - started > time_budget:
+            return ArchiveResult(rows, batches, complete=False)
+        count = run_batch()
+        if not count:
+            return ArchiveResult(rows, batches, complete=True)
+        rows += count
+        batches += 1
@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, router, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from apps.tickets.models import TicketCodeSequence
+
+# Código de ticket: 17 caracteres Crockford base32 (85 bits)
+#   parking (20) | minuto de emisión desde CODE_EPOCH (24) | secuencia (20) | firma (21)
+# La firma es un HMAC-SHA256 truncado de los 64 bits anteriores con
+# SECRET_KEY: una caseta rechaza códigos falsos o mal leídos sin consultar
+# la BD (1 en 2 millones pasa por azar) y sabe el parking desde el código.
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+CODE_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+PARKING_BITS = 20
+MINUTE_BITS = 24  # ~31 años desde CODE_EPOCH
+SEQUENCE_BITS = 20
+TAG_BITS = 21
+CODE_LENGTH = (PARKING_BITS + MINUTE_BITS + SEQUENCE_BITS + TAG_BITS) // 5
+
+_KEY_SALT = "apps.tickets.services.codes"
+_DECODE = {char: value for value, char in enumerate(ALPHABET)}
+# Crockford: O se lee como 0; I y L como 1. Los guiones solo agrupan.
+_DECODE.update({"O": 0, "I": 1, "L": 1})
+
+
+class TicketCode(NamedTuple):
+    code: str  # forma canónica, la que se guarda en Ticket.code
+    parking_id: int
+    issued_at: datetime  # al minuto
+    sequence: int
+
+
+def encode_ticket_code(parking_id, issued_at, sequence):
+    if timezone.is_naive(issued_at):
+        raise ValueError(f"La fecha del código debe tener zona horaria: {issued_at}")
+    minute = int((issued_at - CODE_EPOCH).total_seconds()) // 60
+    if not 0 <= parking_id < 1 << PARKING_BITS:
+        raise ValueError(f"parking_id fuera de rango para el código: {parking_id}")
+    if not 0 <= minute < 1 << MINUTE_BITS:
+        raise ValueError(f"Fecha fuera de rango para el código: {issued_at}")
+    payload = ((parking_id << MINUTE_BITS | minute) << SEQUENCE_BITS
+               | sequence % (1 << SEQUENCE_BITS))
+    value = payload << TAG_BITS | _tag(payload, settings.SECRET_KEY)
+    chars = []
+    for _ in range(CODE_LENGTH):
+        value, index = divmod(value, 32)
+        chars.append(ALPHABET[index])
+    return "".join(reversed(chars))
+
+
+def decode_ticket_code(code):
+    """
+    TicketCode si `code` tiene el formato y su firma es válida (con
+    SECRET_KEY o alguna de SECRET_KEY_FALLBACKS); None si no. No consulta
+    la BD.
+    """
+    parsed = _parse(code)
+    if parsed is None:
+        return None
+    normalized, value = parsed
+    payload, tag = value >> TAG_BITS, value & ((1 << TAG_BITS) - 1)
+    if not any(constant_time_compare(str(tag), str(_tag(payload, secret)))
+               for secret in [settings.SECRET_KEY, *settings.SECRET_KEY_FALLBACKS]):
+        return None
+    minute = (payload >> SEQUENCE_BITS) & ((1 << MINUTE_BITS) - 1)
+    return TicketCode(
+        code=normalized,
+        parking_id=payload >> (SEQUENCE_BITS + MINUTE_BITS),
+        issued_at=CODE_EPOCH + timedelta(minutes=minute),
+        sequence=payload & ((1 << SEQUENCE_BITS) - 1),
+    )
+
+
+def looks_like_ticket_code(code):
+    """True si `code` tiene el formato de estos códigos (sin revisar la firma)."""
+    return _parse(code) is not None
+
+
+def canonical_ticket_code(code):
+    """
+    Código a buscar en la BD, o None si se puede rechazar sin consultarla.
+    Los códigos con formato deben tener firma válida; los demás (códigos
+    libres emitidos antes de este formato) se aceptan tal cual mientras
+    TICKET_CODE_ACCEPT_LEGACY esté activo.
+    """
+    ticket_code = decode_ticket_code(code)
+    if ticket_code is not None:
+        return ticket_code.code
+    if settings.TICKET_CODE_ACCEPT_LEGACY and not looks_like_ticket_code(code):
+        return code
+    return None
+
+
+def _parse(code):
+    """(forma canónica, valor) o None si `code` no tiene el formato."""
+    code = code.upper().replace("-", "").replace(" ", "")
+    if len(code) != CODE_LENGTH:
+        return None
+    value = 0
+    for char in code:
+        digit = _DECODE.get(char)
+        if digit is None:
+            return None
+        value = value << 5 | digit
+    # Canónica: los alias de Crockford (O, I, L) se guardan como dígitos
+    return "".join(ALPHABET[_DECODE[char]] for char in code), value
+
+
+def _tag(payload, secret):
+    digest = salted_hmac(_KEY_SALT, payload.to_bytes(8, "big"),
+                         secret=secret, algorithm="sha256").digest()
+    return int.from_bytes(digest[:3], "big") >> (24 - TAG_BITS)
+
+
+class _SequenceBlocks:
+    """
+    Bloques de secuencia reservados por este proceso, por parking. Un
+    bloque se descarta a los TICKET_CODE_BLOCK_TTL segundos aunque no se
+    haya agotado: así un número de secuencia (módulo 2**20) solo se usa
+    cerca de cuando se reservó y dos códigos del mismo parking y minuto
+    no pueden coincidir salvo que se reserven más de un millón de números
+    en ese lapso.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blocks = {}  # parking_id -> [siguiente, fin, expira]
+
+    def take(self, parking_id):
+        with self._lock:
+            block = self._blocks.get(parking_id)
+            if block is None or block[0] >= block[1] or block[2] < time.monotonic():
+                return None
+            block[0] += 1
+            return block[0] - 1
+
+    def put(self, parking_id, start, end):
+        with self._lock:
+            self._blocks[parking_id] = [
+                start, end, time.monotonic() + settings.TICKET_CODE_BLOCK_TTL]
+
+    def clear(self):
+        with self._lock:
+            self._blocks.clear()
+
+
+_blocks = _SequenceBlocks()
+# Un proceso hijo (p. ej. gunicorn con --preload) no debe heredar los
+# bloques del padre: ambos emitirían los mismos números
+os.register_at_fork(after_in_child=_blocks.clear)
+
+
+def reserve_sequence_block(parking_id, size):
+    """
+    Reserva `size` números de secuencia del parking y devuelve el primero.
+    El UPDATE con F() bloquea la fila hasta el final de la transacción,
+    así que procesos concurrentes reciben bloques disjuntos. Se llama
+    fuera de la transacción de emisión para no retener ese bloqueo.
+    """
+    sequences = TicketCodeSequence.objects.using(router.db_for_write(TicketCodeSequence))
+    with transaction.atomic(using=sequences.db):
+        updated = sequences.filter(parking_id=parking_id).update(
+            next_value=F("next_value") + size)
+        if not updated:
+            try:
+                # Primera reserva del parking
+                with transaction.atomic(using=sequences.db):
+                    sequences.create(parking_id=parking_id, next_value=size)
+                return 0
+            except IntegrityError:
+                # Otro proceso la creó primero
+                sequences.filter(parking_id=parking_id).update(
+                    next_value=F("next_value") + size)
+        end = sequences.filter(parking_id=parking_id).values_list(
+            "next_value", flat=True).get()
+    return end - size
+
+
+def new_ticket_code(parking_id, issued_at=None):
+    """
+    Código nuevo para un ticket del parking emitido en `issued_at` (ahora
+    por omisión; debe coincidir con su created_at). Solo consulta la BD
+    cuando se agota el bloque de secuencia del proceso.
+    """
+    sequence = _blocks.take(parking_id)
+    if sequence is None:
+        sequence = _store_block(parking_id, reserve_sequence_block(
+            parking_id, settings.TICKET_CODE_BLOCK_SIZE))
+    return encode_ticket_code(parking_id, issued_at or timezone.now(), sequence)
+
+
+async def anew_ticket_code(parking_id, issued_at=None):
+    sequence = _blocks.take(parking_id)
+    if sequence is None:
+        sequence = _store_block(parking_id, await sync_to_async(reserve_sequence_block)(
+            parking_id, settings.TICKET_CODE_BLOCK_SIZE))
+    return encode_ticket_code(parking_id, issued_at or timezone.now(), sequence)
+
+
+def _store_block(parking_id, start):
+    # Usa el primer número y guarda el resto del bloque
+    _blocks.put(parking_id, start + 1, start + settings.TICKET_CODE_BLOCK_SIZE)
+    return start
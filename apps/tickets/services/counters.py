@@ -0,0 +1,154 @@
+from collections import defaultdict
+from datetime import datetime, time
+from decimal import Decimal
+
+from django.db.models import Case, Count, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import Greatest
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.parkings.models import Parking, ParkingCounter
+from apps.tickets.models import Ticket
+from apps.tickets.signals import ticket_status_changed
+
+ACTIVE_STATUSES = (
+    Ticket.Status.ISSUED,
+    Ticket.Status.VALIDATED,
+    Ticket.Status.PAID,
+)
+
+# Un ticket está abierto según su estado, nada más: apply_status_changes
+# solo ve cambios de estado y reconcile_counters debe contar igual
+OPEN_TICKETS = Q(status__in=ACTIVE_STATUSES)
+
+
+class CounterDelta:
+    """Cambio en los contadores de un parking por un lote de StatusChange."""
+    __slots__ = ("open", "entries", "exits", "revenue")
+
+    def __init__(self):
+        self.open = self.entries = self.exits = 0
+        self.revenue = Decimal(0)
+
+    def __bool__(self):
+        return bool(self.open or self.entries or self.exits or self.revenue)
+
+    def as_dict(self):
+        return {
+            "open_tickets": self.open,
+            "entries_today": self.entries,
+            "exits_today": self.exits,
+            "revenue_today": self.revenue,
+        }
+
+
+@receiver(ticket_status_changed)
+def update_counters_on_status_change(sender, changes, **kwargs):
+    apply_status_changes(changes)
+
+
+def counter_deltas(changes, today=None):
+    """Agrupa los cambios por parking: {parking_id: CounterDelta}, sin consultas."""
+    today = today or timezone.localdate()
+    deltas = defaultdict(CounterDelta)
+
+    for change in changes:
+        delta = deltas[change.parking_id]
+        was_open = change.old_status in ACTIVE_STATUSES
+        is_open = change.new_status in ACTIVE_STATUSES
+        delta.open += int(is_open) - int(was_open)
+        if change.old_status is None and timezone.localdate(change.at) == today:
+            delta.entries += 1
+        if change.new_status == Ticket.Status.EXITED:
+            delta.exits += 1
+        if change.new_status == Ticket.Status.PAID:
+            delta.revenue += change.total_amount
+    return deltas
+
+
+def apply_status_changes(changes):
+    """Agrupa los cambios por parking y aplica un UPDATE por parking."""
+    today = timezone.localdate()
+    for parking_id, delta in counter_deltas(changes, today).items():
+        if delta:
+            _apply_delta(parking_id, delta, today)
+
+
+def _apply_delta(parking_id, delta, today):
+    same_day = Q(day=today)
+    updated = ParkingCounter.objects.filter(parking_id=parking_id).update(
+        open_tickets=F("open_tickets") + delta.open,
+        entries_today=Case(
+            When(same_day, then=F("entries_today") + delta.entries),
+            default=Value(delta.entries),
+        ),
+        exits_today=Case(
+            When(same_day, then=F("exits_today") + delta.exits),
+            default=Value(delta.exits),
+        ),
+        revenue_today=Case(
+            When(same_day, then=F("revenue_today") + delta.revenue),
+            default=Value(delta.revenue),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+        day=today,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        # Primer movimiento del parking: el contador nace reconciliado,
+        # lo que ya incluye los tickets de este cambio.
+        reconcile_counters(parkings=[parking_id])
+
+
+def reconcile_counters(parkings=None):
+    """
+    Reconstruye los contadores desde Ticket con una consulta agregada.
+    `parkings` limita la reconstrucción a esos parkings (pk o instancias).
+    """
+    today = timezone.localdate()
+    day_start = timezone.make_aware(datetime.combine(today, time.min))
+
+    parking_ids = Parking.objects.values_list("pk", flat=True)
+    if parkings is not None:
+        parking_ids = parking_ids.filter(
+            pk__in=[getattr(p, "pk", p) for p in parkings])
+
+    totals = {
+        row["parking_id"]: row
+        for row in Ticket.objects
+        .filter(parking_id__in=parking_ids)
+        .values("parking_id")
+        .annotate(
+            open_tickets=Count("pk", filter=OPEN_TICKETS),
+            entries_today=Count("pk", filter=Q(created_at__gte=day_start)),
+            exits_today=Count("pk", filter=Q(
+                status=Ticket.Status.EXITED, exit_time__gte=day_start)),
+            revenue_today=Sum(
+                Greatest(F("amount") - F("discount_applied"), Value(0),
+                         output_field=DecimalField()),
+                filter=Q(paid_at__gte=day_start),
+            ),
+        )
+        .order_by()
+    }
+
+    counters = []
+    for parking_id in parking_ids:
+        row = totals.get(parking_id, {})
+        counters.append(ParkingCounter(
+            parking_id=parking_id,
+            open_tickets=row.get("open_tickets", 0),
+            day=today,
+            entries_today=row.get("entries_today", 0),
+            exits_today=row.get("exits_today", 0),
+            revenue_today=row.get("revenue_today") or 0,
+        ))
+
+    ParkingCounter.objects.bulk_create(
+        counters,
+        update_conflicts=True,
+        unique_fields=["parking"],
+        update_fields=["open_tickets", "day", "entries_today",
+                       "exits_today", "revenue_today", "updated_at"],
+    )
+    return counters
@@ -0,0 +1,79 @@
+import time
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.parkings.models import Parking
+from apps.tickets.models import Ticket
+from apps.tickets.signals import StatusChange, ticket_status_changed
+
+
+class SweepResult(NamedTuple):
+    expired: int
+    batches: int
+    complete: bool  # False si se agotó el presupuesto de tiempo
+
+
+def expire_overdue_tickets(batch_size=500, time_budget=None, now=None):
+    """
+    Marca EXPIRED los tickets ISSUED que excedieron la tolerancia de su parking.
+
+    Trabaja por grupos de tolerancia (Ticket unido a Parking.tolerance_minutes)
+    y en lotes de `batch_size`: cada lote es una transacción corta con un
+    UPDATE por conjunto de ids, así que nunca bloquea la tabla por mucho
+    tiempo. `time_budget` (segundos) corta el barrido entre lotes; lo que
+    quede pendiente lo toma la siguiente ejecución.
+    """
+    now = now or timezone.now()
+    started = time.monotonic()
+    expired = batches = 0
+
+    tolerances = (Parking.objects
+                  .values_list("tolerance_minutes", flat=True)
+                  .distinct())
+    for tolerance in tolerances:
+        overdue = (Ticket.objects
+                   .filter(status=Ticket.Status.ISSUED,
+                           parking__tolerance_minutes=tolerance,
+                           created_at__lt=now - timedelta(minutes=tolerance))
+                   .order_by("created_at"))
+        while True:
+            if time_budget is not None and time.monotonic() - started > time_budget:
+                return SweepResult(expired, batches, complete=False)
+            fetched, count = _expire_batch(overdue, batch_size, now)
+            if not fetched:
+                break
+            expired += count
+            batches += 1
+
+    return SweepResult(expired, batches, complete=True)
+
+
+def _expire_batch(overdue, batch_size, now):
+    rows = list(overdue.values_list(
+        "pk", "code", "parking_id", "amount", "discount_applied")[:batch_size])
+    if not rows:
+        return 0, 0
+
+    ids = [row[0] for row in rows]
+    with transaction.atomic():
+        updated = (Ticket.objects
+                   .filter(pk__in=ids, status=Ticket.Status.ISSUED)
+                   .update(status=Ticket.Status.EXPIRED, updated_at=now))
+        if updated != len(ids):
+            # Algunos tickets cambiaron de estado entre la lectura y el UPDATE
+            changed = set(Ticket.objects
+                          .filter(pk__in=ids, status=Ticket.Status.EXPIRED,
+                                  updated_at=now)
+                          .values_list("pk", flat=True))
+            rows = [row for row in rows if row[0] in changed]
+
+        ticket_status_changed.send(sender=Ticket, changes=[
+            StatusChange(pk, code, parking_id, Ticket.Status.ISSUED,
+                         Ticket.Status.EXPIRED,
+                         max(0, amount - discount), now)
+            for pk, code, parking_id, amount, discount in rows
+        ])
+    return len(ids), len(rows)
@@ -0,0 +1,161 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, NamedTuple
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.parkings.models import Parking
+from apps.tickets.models import Ticket, TicketIssuanceBatch, normalize_plate
+from apps.tickets.services.codes import canonical_ticket_code, new_ticket_code
+from apps.tickets.signals import StatusChange, ticket_status_changed
+
+
+class TicketEntry(NamedTuple):
+    """
+    Una entrada registrada por la caseta: parking, código, placa y hora.
+    Sin código se genera uno firmado (ver services.codes).
+    """
+    parking: object  # Parking o su pk
+    code: str | None = None
+    plate_number: str | None = None
+    created_at: datetime | None = None
+
+
+@dataclass
+class BulkIssueResult:
+    created: list = field(default_factory=list)
+    errors: dict = field(default_factory=dict)  # índice de fila -> errores
+    replayed: bool = False
+
+
+def issue_tickets(entries: Iterable, idempotency_key: str | None = None) -> BulkIssueResult:
+    """
+    Emite un lote de tickets con un solo bulk_create dentro de una transacción.
+
+    Cada fila se valida en memoria con las mismas reglas que Ticket.clean();
+    las filas inválidas se reportan en `errors` y no impiden emitir las demás.
+    Si se repite una idempotency_key ya procesada se devuelve el resultado
+    original en lugar de crear tickets nuevos.
+    """
+    entries = [_coerce_entry(entry) for entry in entries]
+
+    if idempotency_key:
+        batch = TicketIssuanceBatch.objects.filter(
+            idempotency_key=idempotency_key).first()
+        if batch:
+            return _replay(batch)
+
+    tickets, errors = _build_tickets(entries)
+
+    try:
+        with transaction.atomic():
+            if idempotency_key:
+                TicketIssuanceBatch.objects.create(
+                    idempotency_key=idempotency_key,
+                    codes=[ticket.code for ticket in tickets],
+                    errors=errors,
+                )
+            Ticket.objects.bulk_create(tickets)
+            for ticket in tickets:
+                ticket._loaded_status = ticket.status
+            # bulk_create no dispara post_save
+            ticket_status_changed.send(
+                sender=Ticket,
+                changes=[StatusChange.from_ticket(t) for t in tickets],
+            )
+    except IntegrityError:
+        # Otra petición con la misma llave ganó la carrera
+        if idempotency_key:
+            batch = TicketIssuanceBatch.objects.filter(
+                idempotency_key=idempotency_key).first()
+            if batch:
+                return _replay(batch)
+        raise
+
+    return BulkIssueResult(created=tickets, errors=errors)
+
+
+def _coerce_entry(entry):
+    if isinstance(entry, TicketEntry):
+        return entry
+    if isinstance(entry, dict):
+        return TicketEntry(**entry)
+    return TicketEntry(*entry)
+
+
+def _build_tickets(entries):
+    """
+    Construye y valida los tickets en memoria; dos consultas en total más
+    una por bloque de secuencia si hay que generar códigos.
+    """
+    parking_ids = {getattr(e.parking, "pk", e.parking) for e in entries}
+    known_parkings = set(Parking.objects.filter(
+        pk__in=parking_ids).values_list("pk", flat=True))
+    # Código recibido -> forma canónica (None si la caseta no lo aceptaría)
+    canonical = {e.code: canonical_ticket_code(e.code) for e in entries if e.code}
+    existing_codes = set(Ticket.objects.filter(
+        code__in=[code for code in canonical.values() if code]
+    ).values_list("code", flat=True))
+
+    now = timezone.now()
+    seen_codes = set()
+    tickets, errors = [], {}
+
+    for index, entry in enumerate(entries):
+        parking_id = getattr(entry.parking, "pk", entry.parking)
+        created_at = entry.created_at or now
+        row_errors = {}
+        code = canonical.get(entry.code)
+        if entry.code and code is None:
+            # Con formato de código firmado pero firma inválida: nadie
+            # podría buscarlo después
+            row_errors["code"] = ["Código de ticket inválido."]
+        elif not code and parking_id in known_parkings:
+            try:
+                code = new_ticket_code(parking_id, created_at)
+            except ValueError as e:
+                # Fecha sin zona horaria o fuera del rango del código
+                row_errors["created_at"] = [str(e)]
+        ticket = Ticket(
+            parking_id=parking_id,
+            code=code,
+            plate_number=entry.plate_number,
+            plate_normalized=normalize_plate(entry.plate_number),
+            created_at=created_at,
+            status=Ticket.Status.ISSUED,
+        )
+
+        if parking_id not in known_parkings:
+            row_errors["parking"] = ["El estacionamiento no existe."]
+        if code is not None and (code in existing_codes or code in seen_codes):
+            row_errors["code"] = ["Ya existe un ticket con este código."]
+        try:
+            # Se excluyen las FK: su validación haría una consulta por fila.
+            # Sin código (inválido o no generado) ya hay un error de la fila
+            exclude = {"parking", "validated_by_store"}
+            if code is None:
+                exclude.add("code")
+            ticket.clean_fields(exclude=exclude)
+            ticket.clean()
+        except ValidationError as e:
+            for name, messages in e.message_dict.items():
+                row_errors.setdefault(name, []).extend(messages)
+
+        if row_errors:
+            errors[index] = row_errors
+            continue
+
+        seen_codes.add(code)
+        tickets.append(ticket)
+
+    return tickets, errors
+
+
+def _replay(batch):
+    # En el orden de batch.codes, el de la respuesta original
+    tickets = Ticket.objects.in_bulk(batch.codes, field_name="code")
+    created = [tickets[code] for code in batch.codes if code in tickets]
+    errors = {int(index): row for index, row in batch.errors.items()}
+    return BulkIssueResult(created=created, errors=errors, replayed=True)
@@ -0,0 +1,150 @@
+from typing import NamedTuple
+
+from django.db import router, transaction
+from django.utils import timezone
+
+from apps.tickets.models import Ticket
+from apps.tickets.signals import StatusChange, ticket_status_changed
+
+Status = Ticket.Status
+
+
+class TransitionResult(NamedTuple):
+    ok: bool
+    status: str | None  # estado vigente tras el intento (None si no existe)
+
+
+class TicketStateMachine:
+    """
+    Transiciones de estado de un ticket como UPDATE condicionales.
+
+    Cada transición es un único `UPDATE ... WHERE id=<pk> AND status=<esperado>`
+    que escribe solo las columnas que cambian; no corre clean() ni toma
+    bloqueos de fila previos. Si otra petición cambió el ticket primero el
+    UPDATE no afecta filas y se devuelve un conflicto con el estado vigente.
+
+    Acepta un Ticket o un TicketRow; el estado esperado es el que trae.
+    """
+    TRANSITIONS = {
+        Status.ISSUED: {Status.VALIDATED, Status.PAID, Status.EXPIRED,
+                        Status.LOST, Status.CANCELED},
+        Status.VALIDATED: {Status.PAID, Status.EXITED, Status.EXPIRED,
+                           Status.LOST, Status.CANCELED},
+        Status.PAID: {Status.EXITED, Status.LOST},
+        Status.EXPIRED: {Status.PAID, Status.LOST, Status.CANCELED},
+        Status.LOST: {Status.PAID, Status.CANCELED},
+        Status.EXITED: set(),
+        Status.CANCELED: set(),
+    }
+
+    def __init__(self, ticket):
+        self.ticket = ticket
+
+    @classmethod
+    def sources_for(cls, status):
+        """Estados desde los que se puede llegar a `status`."""
+        return [source for source, targets in cls.TRANSITIONS.items()
+                if status in targets]
+
+    def can(self, status):
+        return status in self.TRANSITIONS.get(self.ticket.status, ())
+
+    def transition(self, status, **values):
+        expected = self.ticket.status
+        if not self.can(status):
+            return TransitionResult(False, expected)
+
+        now = timezone.now()
+        values.update(status=status, updated_at=now)
+        with transaction.atomic():
+            updated = (Ticket.objects
+                       .filter(pk=self.ticket.pk, status=expected)
+                       .update(**values))
+            if not updated:
+                # El estado vigente se lee del primario, nunca de una réplica
+                current = (Ticket.objects
+                           .using(router.db_for_write(Ticket))
+                           .filter(pk=self.ticket.pk)
+                           .values_list("status", flat=True)
+                           .first())
+                return TransitionResult(False, current)
+
+            self._apply(values)
+            ticket_status_changed.send(
+                sender=Ticket,
+                changes=[StatusChange.from_ticket(self.ticket, expected, now)],
+            )
+        return TransitionResult(True, status)
+
+    async def atransition(self, status, **values):
+        """
+        Versión asíncrona de transition() con el ORM asíncrono. El UPDATE
+        condicional sigue siendo atómico; los contadores se actualizan
+        después en su propia sentencia (reconcile_parking_counters corrige
+        cualquier desfase si el proceso muere en medio).
+        """
+        expected = self.ticket.status
+        if not self.can(status):
+            return TransitionResult(False, expected)
+
+        now = timezone.now()
+        values.update(status=status, updated_at=now)
+        updated = await (Ticket.objects
+                         .filter(pk=self.ticket.pk, status=expected)
+                         .aupdate(**values))
+        if not updated:
+            current = await (Ticket.objects
+                             .using(router.db_for_write(Ticket))
+                             .filter(pk=self.ticket.pk)
+                             .values_list("status", flat=True)
+                             .afirst())
+            return TransitionResult(False, current)
+
+        self._apply(values)
+        await ticket_status_changed.asend(
+            sender=Ticket,
+            changes=[StatusChange.from_ticket(self.ticket, expected, now)],
+        )
+        return TransitionResult(True, status)
+
+    def _apply(self, values):
+        # Ticket tiene todos los campos; TicketRow solo algunos
+        for name, value in values.items():
+            if hasattr(self.ticket, name):
+                setattr(self.ticket, name, value)
+        if isinstance(self.ticket, Ticket):
+            self.ticket._loaded_status = self.ticket.status
+
+    def validate(self, store, discount=0):
+        return self.transition(
+            Status.VALIDATED,
+            validated_by_store_id=getattr(store, "pk", store),
+            discount_applied=discount,
+        )
+
+    def pay(self, amount=None, at=None):
+        values = {"paid_at": at or timezone.now()}
+        if amount is not None:
+            values["amount"] = amount
+        return self.transition(Status.PAID, **values)
+
+    def exit(self, at=None):
+        return self.transition(Status.EXITED, exit_time=at or timezone.now())
+
+    async def apay(self, amount=None, at=None):
+        values = {"paid_at": at or timezone.now()}
+        if amount is not None:
+            values["amount"] = amount
+        return await self.atransition(Status.PAID, **values)
+
+    async def aexit(self, at=None):
+        return await self.atransition(Status.EXITED, exit_time=at or timezone.now())
+
+    def expire(self):
+        return self.transition(Status.EXPIRED)
+
+    def mark_lost(self):
+        return self.transition(Status.LOST)
+
+    def cancel(self):
+        return self.transition(Status.CANCELED)
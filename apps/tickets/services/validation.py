@@ -0,0 +1,91 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Iterable
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from apps.tickets.models import Ticket
+from apps.tickets.services.codes import canonical_ticket_code
+from apps.tickets.signals import StatusChange, ticket_status_changed
+
+Status = Ticket.Status
+
+
+class ValidationOutcome(models.TextChoices):
+    VALIDATED = "validated", "Validado"
+    ALREADY_VALIDATED = "already_validated", "Ya validado"
+    NOT_FOUND = "not_found", "No encontrado"
+    INVALID = "invalid", "Código inválido"
+    WRONG_STATUS = "wrong_status", "Estado no válido"
+
+
+@dataclass
+class BulkValidationResult:
+    outcomes: dict = field(default_factory=dict)  # código -> ValidationOutcome
+
+    @property
+    def validated(self):
+        return [code for code, outcome in self.outcomes.items()
+                if outcome == ValidationOutcome.VALIDATED]
+
+    def counts(self):
+        counts = dict.fromkeys(ValidationOutcome.values, 0)
+        for outcome in self.outcomes.values():
+            counts[outcome] += 1
+        return counts
+
+
+def validate_tickets(store, codes: Iterable[str], discount=Decimal(0)) -> BulkValidationResult:
+    """
+    Valida un lote de tickets para una tienda.
+
+    Un solo UPDATE pasa a VALIDATED todos los tickets emitidos del lote con
+    el descuento de la tienda y una lectura posterior (solo columnas, sin
+    instanciar tickets) clasifica cada código. Las filas que cambió este
+    UPDATE se reconocen por su updated_at exacto. Los códigos con firma
+    inválida quedan como INVALID sin llegar a la BD. Envía
+    ticket_status_changed con los tickets validados.
+    """
+    store_id = getattr(store, "pk", store)
+    codes = list(dict.fromkeys(codes))
+    now = timezone.now()
+    result = BulkValidationResult(
+        outcomes=dict.fromkeys(codes, ValidationOutcome.NOT_FOUND))
+
+    sent = {}  # código canónico -> código recibido
+    for code in codes:
+        canonical = canonical_ticket_code(code)
+        if canonical is None:
+            result.outcomes[code] = ValidationOutcome.INVALID
+        else:
+            sent.setdefault(canonical, code)
+    if not sent:
+        return result
+    codes = list(sent)
+
+    with transaction.atomic():
+        (Ticket.objects
+         .filter(code__in=codes, status=Status.ISSUED)
+         .update(status=Status.VALIDATED, validated_by_store_id=store_id,
+                 discount_applied=discount, updated_at=now))
+
+        rows = (Ticket.objects
+                .filter(code__in=codes)
+                .values_list("pk", "code", "parking_id", "status",
+                             "updated_at", "amount", "discount_applied"))
+        changes = []
+        for pk, code, parking_id, status, updated_at, amount, applied in rows:
+            if status == Status.VALIDATED and updated_at == now:
+                result.outcomes[sent[code]] = ValidationOutcome.VALIDATED
+                changes.append(StatusChange(
+                    pk, code, parking_id, Status.ISSUED, Status.VALIDATED,
+                    max(0, amount - applied), now))
+            elif status == Status.VALIDATED:
+                result.outcomes[sent[code]] = ValidationOutcome.ALREADY_VALIDATED
+            else:
+                result.outcomes[sent[code]] = ValidationOutcome.WRONG_STATUS
+
+        if changes:
+            ticket_status_changed.send(sender=Ticket, changes=changes)
+    return result
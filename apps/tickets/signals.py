@@ -0,0 +1,47 @@
+from typing import NamedTuple
+
+from django.db.models.signals import post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from apps.tickets.models import Ticket
+
+
+class StatusChange(NamedTuple):
+    """Cambio de estado de un ticket; old_status es None al emitirse."""
+    ticket_id: object
+    code: str
+    parking_id: int
+    old_status: str | None
+    new_status: str
+    total_amount: object
+    at: object
+
+    @classmethod
+    def from_ticket(cls, ticket, old_status=None, at=None):
+        return cls(
+            ticket.pk, ticket.code, ticket.parking_id, old_status,
+            ticket.status, ticket.total_amount,
+            at or (ticket.created_at if old_status is None else timezone.now()),
+        )
+
+
+# Se envía con sender=Ticket y changes=[StatusChange, ...] cada vez que se
+# emiten tickets o cambian de estado, también desde rutas que usan
+# bulk_create() o update() y que por lo tanto no disparan post_save.
+ticket_status_changed = Signal()
+
+
+@receiver(post_save, sender=Ticket)
+def notify_status_change_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_status = getattr(instance, "_loaded_status", None)
+    if not created and (old_status is None or old_status == instance.status):
+        return
+    instance._loaded_status = instance.status
+    ticket_status_changed.send(
+        sender=Ticket,
+        changes=[StatusChange.from_ticket(
+            instance, None if created else old_status)],
+    )
@@ -1,3 +1,533 @@
-from django.test import TestCase
+import inspect
+import json
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.locations.models import Location
+from apps.parkings.models import Parking, ParkingCounter
+from apps.stores.models import Store
+from apps.tickets import views
+from apps.tickets.models import ArchivedTicket, Ticket, normalize_plate
+from apps.tickets.selectors import (
+    find_open_tickets_by_plate_fuzzy,
+    find_tickets_by_plate,
+    find_tickets_by_plate_prefix,
+    get_occupancy,
+    get_ticket_by_code,
+    get_ticket_lookup_stats,
+    reset_ticket_lookup_cache,
+    ticket_history,
+)
+from apps.tickets.services import (
+    ArchiveMismatch,
+    TicketEntry,
+    TicketStateMachine,
+    ValidationOutcome,
+    archive_tickets,
+    expire_overdue_tickets,
+    issue_tickets,
+    purge_archived_tickets,
+    reconcile_counters,
+    validate_tickets,
+)
+from apps.tickets.services import codes
+from apps.tickets.services.codes import (
+    CODE_LENGTH,
+    canonical_ticket_code,
+    decode_ticket_code,
+    encode_ticket_code,
+    new_ticket_code,
+)
+
+Status = Ticket.Status
+COUNTER_FIELDS = ("open_tickets", "entries_today", "exits_today", "revenue_today")
+
+
+def _parking(name="Norte"):
+    return Parking.objects.create(
+        location=Location.objects.create(name=name), capacity=100)
+
+
+class CounterInvariantTests(TestCase):
+    """Los contadores incrementales deben coincidir con reconcile_counters."""
+
+    def setUp(self):
+        codes._blocks.clear()
+        self.parking = _parking()
+
+    def counters(self):
+        return ParkingCounter.objects.filter(
+            parking=self.parking).values(*COUNTER_FIELDS).get()
+
+    def assertMatchesReconcile(self):
+        incremental = self.counters()
+        reconcile_counters(parkings=[self.parking])
+        self.assertEqual(incremental, self.counters())
+
+    def test_issue_pay_exit(self):
+        tickets = issue_tickets([TicketEntry(self.parking) for _ in range(3)]).created
+        self.assertEqual(self.counters()["open_tickets"], 3)
+        self.assertEqual(self.counters()["entries_today"], 3)
+        self.assertMatchesReconcile()
+
+        TicketStateMachine(tickets[0]).pay(amount=Decimal("30"))
+        TicketStateMachine(tickets[0]).exit()
+        TicketStateMachine(tickets[1]).cancel()
+        counters = self.counters()
+        self.assertEqual(counters["open_tickets"], 1)
+        self.assertEqual(counters["exits_today"], 1)
+        self.assertEqual(counters["revenue_today"], Decimal("30"))
+        self.assertMatchesReconcile()
+
+    def test_expired_ticket_is_closed_until_paid(self):
+        ticket = issue_tickets([TicketEntry(self.parking)]).created[0]
+        TicketStateMachine(ticket).expire()
+        self.assertEqual(self.counters()["open_tickets"], 0)
+        self.assertMatchesReconcile()
+
+        TicketStateMachine(ticket).pay(amount=Decimal("20"))
+        self.assertEqual(self.counters()["open_tickets"], 1)
+        self.assertMatchesReconcile()
+
+    def test_validation(self):
+        ticket = issue_tickets([TicketEntry(self.parking)]).created[0]
+        TicketStateMachine(ticket).validate(store=None, discount=Decimal("5"))
+        self.assertEqual(self.counters()["open_tickets"], 1)
+        self.assertMatchesReconcile()
+
+
+class TicketStateMachineTests(TestCase):
+    def setUp(self):
+        codes._blocks.clear()
+        self.ticket = issue_tickets([TicketEntry(_parking())]).created[0]
+
+    def test_allowed_transition(self):
+        result = TicketStateMachine(self.ticket).pay(amount=Decimal("10"))
+        self.assertEqual(result, (True, Status.PAID))
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.status, Status.PAID)
+        self.assertIsNotNone(self.ticket.paid_at)
+
+    def test_forbidden_transition(self):
+        result = TicketStateMachine(self.ticket).exit()
+        self.assertEqual(result, (False, Status.ISSUED))
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.status, Status.ISSUED)
+
+    def test_final_states(self):
+        machine = TicketStateMachine(self.ticket)
+        self.assertTrue(machine.cancel().ok)
+        for status in Status.values:
+            self.assertFalse(machine.can(status))
+
+    def test_conflict_returns_current_status(self):
+        stale = Ticket.objects.get(pk=self.ticket.pk)
+        TicketStateMachine(self.ticket).cancel()
+        result = TicketStateMachine(stale).pay(amount=Decimal("10"))
+        self.assertEqual(result, (False, Status.CANCELED))
+        stale.refresh_from_db()
+        self.assertIsNone(stale.paid_at)
+
+    async def test_async_transition(self):
+        result = await TicketStateMachine(self.ticket).apay(amount=Decimal("10"))
+        self.assertEqual(result, (True, Status.PAID))
+        status = await Ticket.objects.values_list("status", flat=True).aget(pk=self.ticket.pk)
+        self.assertEqual(status, Status.PAID)
+        result = await TicketStateMachine(self.ticket).apay(amount=Decimal("10"))
+        self.assertEqual(result, (False, Status.PAID))
+
+
+class ExpirySweepTests(TestCase):
+    def setUp(self):
+        codes._blocks.clear()
+        self.now = timezone.now()
+        self.strict = _parking("Estricto")
+        self.lenient = Parking.objects.create(
+            location=Location.objects.create(name="Holgado"), tolerance_minutes=120)
+        # Vencidos: 0, 1 y 4; en tolerancia: 2 y 3; el 5 se paga
+        stays = [(self.strict, 30), (self.strict, 40), (self.strict, 5),
+                 (self.lenient, 60), (self.lenient, 180), (self.strict, 50)]
+        self.tickets = issue_tickets([
+            TicketEntry(parking, created_at=self.now - timedelta(minutes=minutes))
+            for parking, minutes in stays
+        ]).created
+        TicketStateMachine(self.tickets[5]).pay(amount=Decimal("20"))
+
+    def statuses(self):
+        return [Ticket.objects.get(pk=t.pk).status for t in self.tickets]
+
+    def test_expires_only_overdue_issued_tickets(self):
+        result = expire_overdue_tickets(batch_size=1, now=self.now)
+        self.assertEqual(result, (3, 3, True))
+        self.assertEqual(self.statuses(), [
+            Status.EXPIRED, Status.EXPIRED, Status.ISSUED,
+            Status.ISSUED, Status.EXPIRED, Status.PAID])
+        open_tickets = dict(ParkingCounter.objects.values_list("parking", "open_tickets"))
+        self.assertEqual(open_tickets, {self.strict.pk: 2, self.lenient.pk: 1})
+
+    def test_time_budget_leaves_the_rest_for_the_next_run(self):
+        result = expire_overdue_tickets(time_budget=0, now=self.now)
+        self.assertFalse(result.complete)
+        self.assertEqual(expire_overdue_tickets(now=self.now).expired, 3)
+        self.assertEqual(expire_overdue_tickets(now=self.now), (0, 0, True))
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        codes._blocks.clear()
+        parking = _parking()
+        old = timezone.now() - timedelta(days=40)
+        self.tickets = issue_tickets([
+            TicketEntry(parking, created_at=old),
+            TicketEntry(parking, created_at=old),
+            TicketEntry(parking, created_at=old),  # abierto
+            TicketEntry(parking),                  # reciente
+        ]).created
+        TicketStateMachine(self.tickets[0]).cancel()
+        TicketStateMachine(self.tickets[1]).pay(amount=Decimal("15"))
+        TicketStateMachine(self.tickets[1]).exit()
+        TicketStateMachine(self.tickets[3]).cancel()
+
+    def test_moves_old_closed_tickets(self):
+        result = archive_tickets(older_than_days=30, batch_size=1)
+        self.assertEqual(result, (2, 2, True))
+        self.assertEqual(set(Ticket.objects.values_list("pk", flat=True)),
+                         {self.tickets[2].pk, self.tickets[3].pk})
+        archived = ArchivedTicket.objects.get(pk=self.tickets[1].pk)
+        self.assertEqual(archived.code, self.tickets[1].code)
+        self.assertEqual(archived.amount, Decimal("15"))
+        self.assertEqual(archived.status, Status.EXITED)
+        # El histórico (exportaciones) sigue viendo los archivados
+        self.assertEqual(ticket_history(start=timezone.now() - timedelta(days=60)).count(), 4)
+
+    def test_mismatch_rolls_back_the_batch(self):
+        with mock.patch("django.db.models.query.QuerySet.delete", return_value=(0, {})):
+            with self.assertRaises(ArchiveMismatch):
+                archive_tickets(older_than_days=30)
+        self.assertFalse(ArchivedTicket.objects.exists())
+        self.assertEqual(Ticket.objects.count(), 4)
+
+    def test_purge_by_retention(self):
+        archive_tickets(older_than_days=30)
+        self.assertEqual(purge_archived_tickets(older_than_days=60).rows, 0)
+        self.assertEqual(purge_archived_tickets(older_than_days=30).rows, 2)
+        self.assertFalse(ArchivedTicket.objects.exists())
+
+
+class PlateSearchTests(TestCase):
+    def setUp(self):
+        codes._blocks.clear()
+        parking = _parking()
+        self.tickets = issue_tickets([
+            TicketEntry(parking, plate_number=plate)
+            for plate in ("ABC-123", "abc 124", "XYZ-987", "B0B-111", "ABC-123")
+        ]).created
+        TicketStateMachine(self.tickets[4]).cancel()
+
+    def plates(self, rows):
+        return sorted(row.plate_number for row in rows)
+
+    def test_normalize_plate(self):
+        self.assertEqual(normalize_plate(" abc-12 3 "), "ABC123")
+        self.assertEqual(normalize_plate(None), "")
+
+    def test_exact_match_ignores_format_and_closed_tickets(self):
+        self.assertEqual(self.plates(find_tickets_by_plate("abc123")), ["ABC-123"])
+        self.assertEqual(len(find_tickets_by_plate("ABC 123", open_only=False)), 2)
+
+    def test_prefix(self):
+        self.assertEqual(self.plates(find_tickets_by_plate_prefix("ab-c")),
+                         ["ABC-123", "abc 124"])
+        self.assertEqual(find_tickets_by_plate_prefix("--"), [])
+
+    def test_fuzzy(self):
+        # Confusiones de OCR (8/B, O/0) más un carácter sustituido o faltante
+        self.assertEqual(self.plates(find_open_tickets_by_plate_fuzzy("8OB111")), ["B0B-111"])
+        self.assertEqual(self.plates(find_open_tickets_by_plate_fuzzy("XYZ98")), ["XYZ-987"])
+        self.assertEqual(self.plates(find_open_tickets_by_plate_fuzzy("XY-Z988")), ["XYZ-987"])
+        self.assertEqual(find_open_tickets_by_plate_fuzzy("QQQ000"), [])
+        # Con coincidencia exacta no se amplía la búsqueda
+        self.assertEqual(self.plates(find_open_tickets_by_plate_fuzzy("ABC124")), ["abc 124"])
+
+
+class OccupancyTests(TestCase):
+    def setUp(self):
+        codes._blocks.clear()
+        self.parking = _parking()
+        self.start = (timezone.now() - timedelta(hours=3)).replace(
+            minute=0, second=0, microsecond=0)
+        at = lambda minutes: self.start + timedelta(minutes=minutes)
+        # Minutos desde el inicio de la ventana: (entrada, salida)
+        stays = [(-30, 30), (15, None), (60, 90), (-120, -60)]
+        self.tickets = issue_tickets([
+            TicketEntry(self.parking, created_at=at(entered)) for entered, _ in stays
+        ]).created
+        for ticket, (_, exited) in zip(self.tickets, stays):
+            if exited is not None:
+                Ticket.objects.filter(pk=ticket.pk).update(
+                    status=Status.EXITED, exit_time=at(exited))
+        # Cancelado sin salida: cuenta hasta su última actualización
+        Ticket.objects.filter(pk=self.tickets[2].pk).update(
+            status=Status.CANCELED, exit_time=None, updated_at=at(90))
+        self.other = _parking("Sur")
+        issue_tickets([TicketEntry(self.other, created_at=at(0))])
+
+    def test_average_and_peak_per_bucket(self):
+        series = get_occupancy(self.start, self.start + timedelta(hours=2),
+                               parking=self.parking)
+        self.assertEqual(series.buckets, [self.start, self.start + timedelta(hours=1)])
+        self.assertEqual(series.average, [1.25, 1.5])
+        self.assertEqual(series.peak, [2, 2])
+        self.assertEqual(series.overall_peak, 2)
+
+    def test_by_parking(self):
+        series = get_occupancy(self.start, self.start + timedelta(hours=2),
+                               step=timedelta(minutes=30), by_parking=True)
+        self.assertEqual(series[self.other.pk].average, [1.0] * 4)
+        self.assertEqual(series[self.parking.pk].peak, [2, 1, 2, 1])
+
+
+class TicketLookupTests(TestCase):
+    def setUp(self):
+        codes._blocks.clear()
+        cache.clear()
+        reset_ticket_lookup_cache()
+        self.ticket = issue_tickets([TicketEntry(_parking())]).created[0]
+
+    def test_levels_and_stats(self):
+        with self.assertNumQueries(1):
+            row = get_ticket_by_code(self.ticket.code)
+        self.assertEqual(row.pk, self.ticket.pk)
+        with self.assertNumQueries(0):
+            get_ticket_by_code(self.ticket.code)
+        reset_ticket_lookup_cache()  # como otro proceso: solo el cache compartido
+        with self.assertNumQueries(0):
+            get_ticket_by_code(self.ticket.code)
+        self.assertIsNone(get_ticket_by_code("NO-EXISTE"))
+        stats = get_ticket_lookup_stats()
+        self.assertEqual((stats["local_hits"], stats["shared_hits"], stats["misses"]),
+                         (0, 1, 1))
+
+    def test_status_change_invalidates(self):
+        get_ticket_by_code(self.ticket.code)
+        TicketStateMachine(self.ticket).pay(amount=Decimal("10"))
+        self.assertEqual(get_ticket_by_code(self.ticket.code).status, Status.PAID)
+
+    def test_stats_endpoint(self):
+        get_ticket_by_code(self.ticket.code)
+        staff = get_user_model().objects.create_user("staff@example.com", is_staff=True)
+        self.client.force_login(staff)
+        url = reverse("common:request-stats")
+        self.assertEqual(self.client.get(url).json()["ticket_lookup"]["misses"], 1)
+        self.client.post(url)
+        self.assertEqual(self.client.get(url).json()["ticket_lookup"]["misses"], 0)
+
+
+class BulkIssuanceTests(TestCase):
+    def setUp(self):
+        codes._blocks.clear()
+        self.parking = _parking()
+
+    def test_invalid_rows_do_not_block_the_rest(self):
+        result = issue_tickets([
+            TicketEntry(self.parking, plate_number="abc-123"),
+            TicketEntry(10 ** 6),
+            {"parking": self.parking.pk, "code": "LIBRE-1"},
+            (self.parking.pk, "LIBRE-1"),
+        ])
+        self.assertEqual(sorted(result.errors), [1, 3])
+        self.assertIn("parking", result.errors[1])
+        self.assertIn("code", result.errors[3])
+        self.assertEqual(result.created[1].code, "LIBRE-1")
+        self.assertEqual(result.created[0].plate_normalized, "ABC123")
+        self.assertEqual(Ticket.objects.count(), 2)
+
+    def test_idempotency_key_replays_the_original_result(self):
+        entries = [TicketEntry(self.parking, f"LIBRE-{i}") for i in (3, 1, 2)]
+        entries.append(TicketEntry(10 ** 6))
+        first = issue_tickets(entries, idempotency_key="caseta-1:42")
+        again = issue_tickets(entries, idempotency_key="caseta-1:42")
+        self.assertFalse(first.replayed)
+        self.assertTrue(again.replayed)
+        self.assertEqual([t.pk for t in again.created], [t.pk for t in first.created])
+        self.assertEqual(again.errors, first.errors)
+        self.assertEqual(Ticket.objects.count(), 3)
+
+
+class BulkValidationTests(TestCase):
+    def setUp(self):
+        codes._blocks.clear()
+        self.parking = _parking()
+        self.store = Store.objects.create(name="Tienda")
+        self.tickets = issue_tickets([TicketEntry(self.parking)] * 4).created
+        TicketStateMachine(self.tickets[2]).pay(amount=Decimal("20"))
+        validate_tickets(self.store, [self.tickets[3].code])
+
+    def test_outcome_per_code(self):
+        t0, t1, t2, t3 = self.tickets
+        missing = new_ticket_code(self.parking.pk)
+        tampered = t1.code[:-1] + ("0" if t1.code[-1] != "0" else "1")
+        result = validate_tickets(
+            self.store, [t0.code.lower(), t1.code, t1.code, t2.code, t3.code,
+                         missing, tampered], Decimal("5"))
+        # Cada código con el resultado bajo la forma en que se recibió
+        self.assertEqual(result.outcomes, {
+            t0.code.lower(): ValidationOutcome.VALIDATED,
+            t1.code: ValidationOutcome.VALIDATED,
+            t2.code: ValidationOutcome.WRONG_STATUS,
+            t3.code: ValidationOutcome.ALREADY_VALIDATED,
+            missing: ValidationOutcome.NOT_FOUND,
+            tampered: ValidationOutcome.INVALID,
+        })
+        self.assertEqual(result.counts()[ValidationOutcome.VALIDATED], 2)
+        ticket = Ticket.objects.get(pk=t0.pk)
+        self.assertEqual(ticket.validated_by_store, self.store)
+        self.assertEqual(ticket.discount_applied, Decimal("5"))
+        self.assertEqual(Ticket.objects.get(pk=t2.pk).status, Status.PAID)
+
+    def test_invalid_codes_skip_the_database(self):
+        with self.assertNumQueries(0):
+            result = validate_tickets(self.store, ["0" * CODE_LENGTH])
+        self.assertEqual(result.counts()[ValidationOutcome.INVALID], 1)
+
+
+@override_settings(GATE_API_TOKEN="token")
+class GateAPITests(TestCase):
+    """Cada caso corre contra las vistas asíncronas y las síncronas."""
+    VIEWS = {
+        "async": {"issue": views.IssueTicketView, "pay": views.PayTicketView},
+        "sync": {"issue": views.IssueTicketSyncView, "pay": views.PayTicketSyncView},
+    }
+
+    def setUp(self):
+        codes._blocks.clear()
+        cache.clear()
+        reset_ticket_lookup_cache()
+        self.parking = _parking()
+
+    def counter(self):
+        return ParkingCounter.objects.get(parking=self.parking)
+
+    def call(self, view_class, body, **kwargs):
+        request = RequestFactory().post(
+            "/gate/", body if isinstance(body, str) else json.dumps(body),
+            content_type="application/json", HTTP_AUTHORIZATION="Bearer token")
+        response = view_class.as_view()(request, **kwargs)
+        if inspect.isawaitable(response):
+            async def wait():
+                return await response
+
+            response = async_to_sync(wait)()
+        return response.status_code, json.loads(response.content)
+
+    def test_pay_without_amount_charges_the_fee(self):
+        for mode, gate in self.VIEWS.items():
+            with self.subTest(mode):
+                ticket = issue_tickets([TicketEntry(self.parking)]).created[0]
+                revenue = self.counter().revenue_today
+                status, data = self.call(gate["pay"], {}, code=ticket.code)
+                self.assertEqual(status, 200, data)
+                self.assertEqual(data["status"], Status.PAID)
+                self.assertEqual(data["total_amount"], "20.00")
+                ticket.refresh_from_db()
+                self.assertEqual(ticket.amount, Decimal("20.00"))
+                # Los receptores de la transición corrieron
+                self.assertEqual(self.counter().revenue_today, revenue + 20)
+
+    def test_rejects_malformed_payloads(self):
+        ticket = issue_tickets([TicketEntry(self.parking)]).created[0]
+        for mode, gate in self.VIEWS.items():
+            for body in ("[1]", '"x"', "3"):
+                with self.subTest(mode, body=body):
+                    status, data = self.call(gate["issue"], body)
+                    self.assertEqual(status, 400, data)
+            for amount in ("NaN", "Infinity", "-Infinity", "abc", "-1"):
+                with self.subTest(mode, amount=amount):
+                    status, data = self.call(
+                        gate["pay"], {"amount": amount}, code=ticket.code)
+                    self.assertEqual(status, 400, data)
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.status, Status.ISSUED)
+
+
+class TicketCodeTests(TestCase):
+    def setUp(self):
+        codes._blocks.clear()
+        self.parking = _parking()
+
+    def test_round_trip(self):
+        issued_at = datetime(2025, 3, 4, 10, 30, 45, tzinfo=dt_timezone.utc)
+        code = encode_ticket_code(42, issued_at, 7)
+        self.assertEqual(len(code), CODE_LENGTH)
+        decoded = decode_ticket_code(code)
+        self.assertEqual(decoded.code, code)
+        self.assertEqual(decoded.parking_id, 42)
+        self.assertEqual(decoded.issued_at, issued_at.replace(second=0))
+        self.assertEqual(decoded.sequence, 7)
+
+    def test_scanner_variants_are_canonicalized(self):
+        code = encode_ticket_code(1, timezone.now(), 0)
+        variant = code.lower().replace("0", "o").replace("1", "l")
+        variant = f"{variant[:6]}-{variant[6:]}"
+        self.assertEqual(decode_ticket_code(variant).code, code)
+
+    def test_corrupt_code_is_rejected(self):
+        code = encode_ticket_code(1, timezone.now(), 0)
+        for index in range(CODE_LENGTH):
+            replacement = "1" if code[index] != "1" else "2"
+            corrupt = code[:index] + replacement + code[index + 1:]
+            self.assertIsNone(decode_ticket_code(corrupt))
+            self.assertIsNone(canonical_ticket_code(corrupt))
+
+    def test_signing_key_fallbacks(self):
+        code = encode_ticket_code(1, timezone.now(), 0)
+        with override_settings(SECRET_KEY="nueva", SECRET_KEY_FALLBACKS=[]):
+            self.assertIsNone(decode_ticket_code(code))
+        with override_settings(SECRET_KEY="nueva",
+                               SECRET_KEY_FALLBACKS=[settings.SECRET_KEY]):
+            self.assertEqual(decode_ticket_code(code).code, code)
+
+    def test_legacy_codes(self):
+        self.assertEqual(canonical_ticket_code("A1B2C3"), "A1B2C3")
+        with override_settings(TICKET_CODE_ACCEPT_LEGACY=False):
+            self.assertIsNone(canonical_ticket_code("A1B2C3"))
+
+    def test_out_of_range(self):
+        with self.assertRaises(ValueError):
+            encode_ticket_code(1, datetime(2023, 6, 1, tzinfo=dt_timezone.utc), 0)
+        with self.assertRaises(ValueError):
+            encode_ticket_code(1, datetime(2025, 6, 1), 0)
+        with self.assertRaises(ValueError):
+            encode_ticket_code(1 << 20, timezone.now(), 0)
+
+    @override_settings(TICKET_CODE_BLOCK_SIZE=4)
+    def test_generated_codes_are_unique_across_blocks(self):
+        issued_at = timezone.now()
+        generated = [new_ticket_code(self.parking.pk, issued_at) for _ in range(10)]
+        self.assertEqual(len(set(generated)), 10)
+        self.assertEqual(self.parking.code_sequence.next_value, 12)
+
+    def test_bulk_issuance_row_errors(self):
+        result = issue_tickets([
+            TicketEntry(self.parking, None, None,
+                        datetime(2023, 6, 1, tzinfo=dt_timezone.utc)),
+            TicketEntry(self.parking, None, None, datetime(2025, 6, 1)),
+            TicketEntry(self.parking, "X" * CODE_LENGTH),
+            TicketEntry(self.parking),
+        ])
+        self.assertEqual(sorted(result.errors), [0, 1, 2])
+        self.assertIn("created_at", result.errors[0])
+        self.assertIn("created_at", result.errors[1])
+        self.assertIn("code", result.errors[2])
+        self.assertEqual(len(result.created), 1)
+        self.assertIsNotNone(decode_ticket_code(result.created[0].code))
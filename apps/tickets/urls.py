@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.urls import path
+from . import views
+
+app_name = 'tickets'
+
+if settings.GATE_API_ASYNC:
+    issue_view = views.IssueTicketView
+    lookup_view = views.TicketLookupView
+    pay_view = views.PayTicketView
+    exit_view = views.ExitTicketView
+    validate_view = views.ValidateTicketsView
+else:
+    issue_view = views.IssueTicketSyncView
+    lookup_view = views.TicketLookupSyncView
+    pay_view = views.PayTicketSyncView
+    exit_view = views.ExitTicketSyncView
+    validate_view = views.ValidateTicketsSyncView
+
+urlpatterns = [
+    path('tickets/', issue_view.as_view(), name='issue'),
+    path('tickets/<str:code>/', lookup_view.as_view(), name='lookup'),
+    path('tickets/<str:code>/pay/', pay_view.as_view(), name='pay'),
+    path('tickets/<str:code>/exit/', exit_view.as_view(), name='exit'),
+    path('validations/', validate_view.as_view(), name='validate'),
+]
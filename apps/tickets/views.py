@@ -1,3 +1,385 @@
-from django.shortcuts import render
+import json
+import secrets
+import uuid
+from decimal import Decimal, InvalidOperation
 
-# Create your views here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from apps.parkings.models import Parking
+from apps.stores.models import Store
+from apps.tickets.models import Ticket, normalize_plate
+from apps.tickets.selectors.lookup import (
+    aget_ticket_by_code,
+    get_ticket_by_code,
+    invalidate_ticket_code,
+)
+from apps.tickets.selectors.tickets import TicketRow
+from apps.tickets.services.codes import (
+    anew_ticket_code,
+    canonical_ticket_code,
+    decode_ticket_code,
+    new_ticket_code,
+)
+from apps.tickets.services.state_machine import TicketStateMachine
+from apps.tickets.services.validation import validate_tickets
+
+
+class GateAPIError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _ticket_payload(ticket):
+    return {
+        'code': ticket.code,
+        'status': ticket.status,
+        'parking_id': ticket.parking_id,
+        'created_at': ticket.created_at,
+        'exit_time': ticket.exit_time,
+        'amount': ticket.amount,
+        'total_amount': ticket.total_amount,
+        'can_exit': ticket.can_exit(),
+    }
+
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, json_dumps_params={'default': str})
+
+
+def _row_from_ticket(ticket, tolerance_minutes):
+    return TicketRow(*[
+        tolerance_minutes if name == 'tolerance_minutes' else getattr(ticket, name)
+        for name in TicketRow.attributes
+    ])
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class GateView(View):
+    """
+    Base de la API de casetas: autenticación por token compartido, cuerpo
+    JSON y errores uniformes ({"error": ...}). Las subclases definen post()
+    o get() síncronos o asíncronos (sin mezclar).
+    """
+    http_method_names = ['get', 'post']
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.payload = {}
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            self._authenticate(request)
+            if request.method == 'POST' and request.body:
+                self.payload = json.loads(request.body)
+                if not isinstance(self.payload, dict):
+                    raise GateAPIError('El cuerpo debe ser un objeto JSON.')
+        except GateAPIError as e:
+            return self._early_response(self._error(e))
+        except ValueError:
+            return self._early_response(self._error(GateAPIError('JSON inválido.')))
+        return super().dispatch(request, *args, **kwargs)
+
+    def _early_response(self, response):
+        # Las vistas asíncronas deben devolver una corrutina desde dispatch
+        if not self.view_is_async:
+            return response
+
+        async def func():
+            return response
+
+        return func()
+
+    def _authenticate(self, request):
+        token = settings.GATE_API_TOKEN
+        if not token:
+            if settings.DEBUG:
+                return
+            raise GateAPIError('API de casetas sin token configurado.', 403)
+        header = request.headers.get('Authorization', '')
+        if not secrets.compare_digest(header, f'Bearer {token}'):
+            raise GateAPIError('Token inválido.', 401)
+
+    @staticmethod
+    def _error(error):
+        return _json({'error': error.args[0]}, status=error.status)
+
+    def _parking_id(self):
+        parking_id = self.payload.get('parking')
+        if not isinstance(parking_id, int):
+            raise GateAPIError('parking es requerido y debe ser numérico.')
+        return parking_id
+
+    def _amount(self, name='amount'):
+        amount = self.payload.get(name)
+        if amount is None:
+            return None
+        try:
+            amount = Decimal(str(amount))
+        except InvalidOperation:
+            raise GateAPIError(f'{name} inválido.')
+        if not amount.is_finite():
+            # NaN e Infinity son Decimal válidos pero no montos
+            raise GateAPIError(f'{name} inválido.')
+        if amount < 0:
+            raise GateAPIError(f'{name} no puede ser negativo.')
+        return amount
+
+    def _new_ticket(self, parking):
+        if parking is None:
+            raise GateAPIError('El estacionamiento no existe.', 404)
+        counter = getattr(parking, 'counter', None)
+        if counter is not None and counter.is_full:
+            raise GateAPIError('Estacionamiento lleno.', 409)
+        code = self.payload.get('code') or ''
+        if code:
+            # Un código que después no pasaría _code() dejaría el ticket
+            # inaccesible
+            code = canonical_ticket_code(code) if isinstance(code, str) else None
+            if code is None:
+                raise GateAPIError('Código de ticket inválido.')
+        plate_number = self.payload.get('plate_number') or None
+        # Sin código de la caseta se genera uno firmado (new_ticket_code)
+        # con la misma hora que created_at
+        return Ticket(
+            parking=parking,
+            code=code,
+            created_at=timezone.now(),
+            plate_number=plate_number,
+            plate_normalized=normalize_plate(plate_number),
+        )
+
+    def _code(self, code):
+        """
+        Código canónico a buscar (canonical_ticket_code): los falsos o mal
+        leídos se rechazan sin consultar la BD, igual que los firmados de
+        otro parking si el cuerpo trae `parking`.
+        """
+        canonical = canonical_ticket_code(code)
+        if canonical is None:
+            raise GateAPIError('Código de ticket inválido.')
+        parking_id = self.payload.get('parking')
+        if isinstance(parking_id, int):
+            ticket_code = decode_ticket_code(canonical)
+            if ticket_code is not None and ticket_code.parking_id != parking_id:
+                raise GateAPIError('El ticket es de otro estacionamiento.', 409)
+        return canonical
+
+    def _validation_request(self):
+        codes = self.payload.get('codes')
+        if (not isinstance(codes, list) or not codes
+                or not all(isinstance(code, str) for code in codes)):
+            raise GateAPIError('codes debe ser una lista de códigos.')
+        if len(codes) > settings.TICKET_VALIDATION_MAX_CODES:
+            raise GateAPIError(
+                f'Máximo {settings.TICKET_VALIDATION_MAX_CODES} códigos por petición.')
+        try:
+            store_id = uuid.UUID(str(self.payload.get('store')))
+        except ValueError:
+            raise GateAPIError('store es requerido y debe ser un UUID.')
+        return store_id, codes, self._amount('discount') or Decimal(0)
+
+    @staticmethod
+    def _check_store(store):
+        if store is None:
+            raise GateAPIError('La tienda no existe.', 404)
+        if not store.is_active:
+            raise GateAPIError('La tienda no está activa.', 409)
+
+    @staticmethod
+    def _validation_response(result):
+        return _json({
+            'outcomes': result.outcomes,
+            'counts': result.counts(),
+        })
+
+    @staticmethod
+    def _clean(ticket):
+        # save() ya corre clean(); aquí solo longitudes y choices, sin
+        # las consultas de validación de FK
+        try:
+            ticket.clean_fields(exclude={'parking', 'validated_by_store'})
+        except ValidationError as e:
+            raise GateAPIError(e.message_dict)
+
+    @staticmethod
+    def _exit_check(row):
+        if row is None:
+            raise GateAPIError('Ticket no encontrado.', 404)
+        if not row.can_exit():
+            raise GateAPIError(
+                f'El ticket no puede salir en estado {row.status}.', 409)
+
+    @staticmethod
+    def _found(row):
+        if row is None:
+            raise GateAPIError('Ticket no encontrado.', 404)
+        return row
+
+    @staticmethod
+    def _transition_response(row, result):
+        if not result.ok:
+            return _json({
+                'error': 'Conflicto de estado.',
+                'status': result.status,
+            }, status=409)
+        return _json(_ticket_payload(row))
+
+
+# Vistas asíncronas (servidor ASGI, config.asgi)
+
+class IssueTicketView(GateView):
+    async def post(self, request, *args, **kwargs):
+        try:
+            parking = await (Parking.objects
+                             .select_related('counter')
+                             .filter(pk=self._parking_id())
+                             .afirst())
+            ticket = self._new_ticket(parking)
+            if not ticket.code:
+                ticket.code = await anew_ticket_code(parking.pk, ticket.created_at)
+            self._clean(ticket)
+            await ticket.asave()
+        except GateAPIError as e:
+            return self._error(e)
+        except IntegrityError:
+            return self._error(GateAPIError('Ya existe un ticket con este código.', 409))
+        row = _row_from_ticket(ticket, parking.tolerance_minutes)
+        return _json(_ticket_payload(row), status=201)
+
+
+class TicketLookupView(GateView):
+    async def get(self, request, code, *args, **kwargs):
+        try:
+            code = self._code(code)
+            row = self._found(await aget_ticket_by_code(code))
+        except GateAPIError as e:
+            return self._error(e)
+        return _json(_ticket_payload(row))
+
+
+class PayTicketView(GateView):
+    async def post(self, request, code, *args, **kwargs):
+        try:
+            code = self._code(code)
+            row = self._found(await aget_ticket_by_code(code))
+            amount = self._amount()
+        except GateAPIError as e:
+            return self._error(e)
+        if amount is None:
+            amount = row.calculate_fee()
+        result = await TicketStateMachine(row).apay(amount=amount)
+        if not result.ok:
+            # El LRU local pudo tener un estado viejo; el reintento irá a la BD
+            await sync_to_async(invalidate_ticket_code)(code)
+        return self._transition_response(row, result)
+
+
+class ExitTicketView(GateView):
+    async def post(self, request, code, *args, **kwargs):
+        try:
+            code = self._code(code)
+            row = await aget_ticket_by_code(code)
+            self._exit_check(row)
+        except GateAPIError as e:
+            return self._error(e)
+        result = await TicketStateMachine(row).aexit()
+        if not result.ok:
+            # El LRU local pudo tener un estado viejo; el reintento irá a la BD
+            await sync_to_async(invalidate_ticket_code)(code)
+        return self._transition_response(row, result)
+
+
+class ValidateTicketsView(GateView):
+    async def post(self, request, *args, **kwargs):
+        try:
+            store_id, codes, discount = self._validation_request()
+            store = await Store.objects.filter(pk=store_id).afirst()
+            self._check_store(store)
+        except GateAPIError as e:
+            return self._error(e)
+        # Un UPDATE y una lectura en una transacción: se corre en el hilo
+        # del ORM en lugar de partirlo en llamadas asíncronas
+        result = await sync_to_async(validate_tickets)(store, codes, discount)
+        return self._validation_response(result)
+
+
+# Alternativa síncrona para despliegues WSGI (GATE_API_ASYNC = False)
+
+class IssueTicketSyncView(GateView):
+    def post(self, request, *args, **kwargs):
+        try:
+            parking = (Parking.objects
+                       .select_related('counter')
+                       .filter(pk=self._parking_id())
+                       .first())
+            ticket = self._new_ticket(parking)
+            if not ticket.code:
+                ticket.code = new_ticket_code(parking.pk, ticket.created_at)
+            self._clean(ticket)
+            ticket.save()
+        except GateAPIError as e:
+            return self._error(e)
+        except IntegrityError:
+            return self._error(GateAPIError('Ya existe un ticket con este código.', 409))
+        row = _row_from_ticket(ticket, parking.tolerance_minutes)
+        return _json(_ticket_payload(row), status=201)
+
+
+class TicketLookupSyncView(GateView):
+    def get(self, request, code, *args, **kwargs):
+        try:
+            code = self._code(code)
+            row = self._found(get_ticket_by_code(code))
+        except GateAPIError as e:
+            return self._error(e)
+        return _json(_ticket_payload(row))
+
+
+class PayTicketSyncView(GateView):
+    def post(self, request, code, *args, **kwargs):
+        try:
+            code = self._code(code)
+            row = self._found(get_ticket_by_code(code))
+            amount = self._amount()
+        except GateAPIError as e:
+            return self._error(e)
+        if amount is None:
+            amount = row.calculate_fee()
+        result = TicketStateMachine(row).pay(amount=amount)
+        if not result.ok:
+            invalidate_ticket_code(code)
+        return self._transition_response(row, result)
+
+
+class ExitTicketSyncView(GateView):
+    def post(self, request, code, *args, **kwargs):
+        try:
+            code = self._code(code)
+            row = get_ticket_by_code(code)
+            self._exit_check(row)
+        except GateAPIError as e:
+            return self._error(e)
+        result = TicketStateMachine(row).exit()
+        if not result.ok:
+            invalidate_ticket_code(code)
+        return self._transition_response(row, result)
+
+
+class ValidateTicketsSyncView(GateView):
+    def post(self, request, *args, **kwargs):
+        try:
+            store_id, codes, discount = self._validation_request()
+            store = Store.objects.filter(pk=store_id).first()
+            self._check_store(store)
+        except GateAPIError as e:
+            return self._error(e)
+        return self._validation_response(validate_tickets(store, codes, discount))
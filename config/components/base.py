@@ -29,9 +29,11 @@ THIRD_PARTY_APPS = [
 
 CUSTOM_APPS = [
     'apps.accounts',
+    'apps.common',
     'apps.dashboard',
     'apps.locations',
     'apps.parkings',
+    'apps.reports',
     'apps.stores',
     'apps.tickets',
 ]
@@ -39,6 +41,8 @@ CUSTOM_APPS = [
 INSTALLED_APPS += THIRD_PARTY_APPS + CUSTOM_APPS
 
 MIDDLEWARE = [
+    'apps.common.middleware.QueryInstrumentationMiddleware',
+    'apps.common.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -112,3 +116,9 @@ MEDIA_ROOT = BASE_DIR / "media"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Versión de UUID para las llaves de BaseModel (apps.common.ids):
+# 4 = aleatorio; 7 = ordenado por tiempo, los INSERT van al final del
+# índice de la llave (ver `manage.py benchmark_uuid_keys`). Se puede
+# cambiar en cualquier momento: las llaves existentes no se tocan.
+UUID_PRIMARY_KEY_VERSION = config("UUID_PRIMARY_KEY_VERSION", cast=int, default=4)
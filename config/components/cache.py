@@ -0,0 +1,31 @@
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'symt-parking',
+    }
+}
+
+# Redis (compartido entre procesos)
+# CACHES = {
+#     'default': {
+#         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+#         'LOCATION': config('REDIS_URL'),
+#     }
+# }
+
+# Búsqueda de tickets por código en casetas: LRU local + cache de Django
+TICKET_LOOKUP_CACHE = {
+    'ALIAS': 'default',
+    'LOCAL_MAXSIZE': 2048,  # entradas por proceso
+    'LOCAL_TTL': 5,  # segundos
+    'SHARED_TTL': 60,  # segundos
+}
+
+# Índice en memoria de ocupaciones de unidades por ubicación
+# (apps.stores.selectors). Las escrituras lo descartan en el proceso que
+# las hace; con el cache por defecto (local a cada proceso) los demás lo
+# reconstruyen a más tardar a los STORES_OCCUPANCY_INDEX_TTL segundos.
+STORES_OCCUPANCY_INDEX_TTL = 60  # segundos
@@ -0,0 +1,12 @@
+# Dashboard: métricas, gráfico y fragmentos cacheados por versión; las
+# señales de Ticket, UnitOccupancy, Store y Parking cambian la versión.
+DASHBOARD_METRICS_TTL = 15  # segundos
+DASHBOARD_CHART_TTL = 60  # segundos
+DASHBOARD_FRAGMENT_TTL = 30  # segundos
+
+# Eventos en vivo (SSE, requiere ASGI): eventos encolados por pantalla y
+# segundos entre keepalives. Si una pantalla acumula más de
+# DASHBOARD_LIVE_MAX_DROPPED eventos descartados se cierra su conexión.
+DASHBOARD_LIVE_QUEUE_SIZE = 100
+DASHBOARD_LIVE_HEARTBEAT = 15
+DASHBOARD_LIVE_MAX_DROPPED = 1000
@@ -1,15 +1,44 @@
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+from decouple import Csv, config
+
+# Perfil de SQLite para producción en sitios pequeños (varios workers):
+# - WAL: las lecturas no bloquean a la escritura ni al revés.
+# - synchronous=NORMAL: con WAL no hay riesgo de corrupción; solo se
+#   pueden perder las últimas transacciones ante un corte de luz.
+# - cache_size (KiB si es negativo), mmap_size y temp_store en memoria.
+# - transaction_mode IMMEDIATE: atomic() toma el candado de escritura al
+#   empezar; sin esto dos transacciones que leen y luego escriben chocan
+#   con "database is locked" sin que sirva el busy timeout. El costo: todo
+#   atomic(), aunque solo lea, se serializa con las escrituras.
+# - timeout: segundos que una conexión espera el candado (busy_timeout).
+# Es opcional (SQLITE_TUNED=True) por ese costo; conviene en sitios con
+# varios workers que emiten tickets a la vez.
+# `manage.py measure_sqlite_concurrency` compara este perfil con el plano.
+SQLITE_TUNED = config("SQLITE_TUNED", cast=bool, default=False)
+SQLITE_TUNED_OPTIONS = {
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA cache_size=-65536;'
+        'PRAGMA mmap_size=268435456;'
+        'PRAGMA temp_store=MEMORY;'
+    ),
+    'transaction_mode': 'IMMEDIATE',
+    'timeout': 20,
+}
+
 #sqlite3
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_TUNED_OPTIONS if SQLITE_TUNED else {},
     }
 }
 
-# PostgreSQL
+# PostgreSQL (réplica en streaming como alias 'replica1')
 # DATABASES = {
 #     "default": {
 #         "ENGINE": "django.db.backends.postgresql",
@@ -19,4 +48,39 @@ DATABASES = {
 #         "HOST": config("DB_HOST"),
 #         "PORT": config("DB_PORT"),
 #     },
-# }
\ No newline at end of file
+#     "replica1": {
+#         "ENGINE": "django.db.backends.postgresql",
+#         "NAME": config("DB_NAME"),
+#         "USER": config("DB_USER"),
+#         "PASSWORD": config("DB_PASSWORD"),
+#         "HOST": config("DB_REPLICA_HOST"),
+#         "PORT": config("DB_PORT"),
+#         "TEST": {"MIRROR": "default"},
+#     },
+# }
+
+# Réplicas de lectura (apps.common.db.ReadReplicaRouter): alias extra en
+# DATABASES. Las vistas de REPLICA_READ_VIEWS leen de una réplica al azar;
+# las escrituras y todo lo demás van a default. Tras escribir, la cookie
+# REPLICA_STICKY_COOKIE deja al navegador en el primario
+# REPLICA_STICKY_SECONDS segundos (leer lo propio aunque haya retraso).
+# Local: SQLITE_REPLICAS=replica.sqlite3 y `manage.py refresh_sqlite_replicas`.
+# El dashboard no va a réplicas: su cache es por versión y la versión
+# cambia al confirmar en el primario, así que una réplica atrasada dejaría
+# guardadas métricas viejas bajo la versión nueva hasta la siguiente
+# escritura; su Last-Modified/ETag también se lee de la BD.
+for index, name in enumerate(config("SQLITE_REPLICAS", cast=Csv(), default=""), start=1):
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / name,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['apps.common.db.ReadReplicaRouter']
+REPLICA_READ_VIEWS = [
+    'reports:*',
+    'admin:*_changelist',
+]
+REPLICA_STICKY_COOKIE = 'primary_pin'
+REPLICA_STICKY_SECONDS = 10
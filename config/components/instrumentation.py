@@ -0,0 +1,24 @@
+from decouple import config
+
+# Instrumentación por petición (apps.common.middleware): consultas, tiempo
+# de BD, render, total y tamaño de respuesta por nombre de URL. Los
+# percentiles se ven en /instrumentation/requests/ (solo staff).
+REQUEST_INSTRUMENTATION = config(
+    "REQUEST_INSTRUMENTATION", cast=bool, default=True)
+REQUEST_STATS_SAMPLES = 1000  # últimas peticiones por vista
+
+# Presupuestos por nombre de URL ("namespace:name"); "*" aplica al resto.
+# Métricas: queries, db_ms, render_ms, total_ms, bytes. Al excederse se
+# registra un warning ('log') o se levanta RequestBudgetExceeded ('raise',
+# útil en desarrollo para detectar N+1 de inmediato).
+REQUEST_BUDGETS = {
+    '*': {'queries': 50, 'total_ms': 1000},
+    'dashboard:index': {'queries': 8, 'total_ms': 500},
+    'dashboard:metrics': {'queries': 8, 'total_ms': 300},
+    'tickets:issue': {'queries': 6, 'total_ms': 100},
+    'tickets:lookup': {'queries': 2, 'total_ms': 50},
+    'tickets:pay': {'queries': 6, 'total_ms': 100},
+    'tickets:exit': {'queries': 6, 'total_ms': 100},
+    'tickets:validate': {'queries': 8, 'total_ms': 1000},
+}
+REQUEST_BUDGET_ACTION = config("REQUEST_BUDGET_ACTION", default="log")
@@ -0,0 +1,28 @@
+from decouple import config
+
+# Archivo de tickets: los tickets cerrados con más de N días pasan a
+# ArchivedTicket y el archivo se purga tras el periodo de retención.
+TICKET_ARCHIVE_AFTER_DAYS = config(
+    "TICKET_ARCHIVE_AFTER_DAYS", cast=int, default=30)
+TICKET_ARCHIVE_RETENTION_DAYS = config(
+    "TICKET_ARCHIVE_RETENTION_DAYS", cast=int, default=730)
+
+# API de casetas: token compartido (Authorization: Bearer <token>). Vacío
+# solo se permite con DEBUG. GATE_API_ASYNC elige las vistas asíncronas
+# (servidor ASGI, config.asgi) o las síncronas (WSGI, config.wsgi).
+GATE_API_TOKEN = config("GATE_API_TOKEN", default="")
+GATE_API_ASYNC = config("GATE_API_ASYNC", cast=bool, default=True)
+
+# Validación en lote de tiendas: códigos máximos por petición
+TICKET_VALIDATION_MAX_CODES = config(
+    "TICKET_VALIDATION_MAX_CODES", cast=int, default=1000)
+
+# Códigos de ticket firmados (apps.tickets.services.codes). Cada proceso
+# reserva TICKET_CODE_BLOCK_SIZE números de secuencia por parking y
+# descarta el bloque a los TICKET_CODE_BLOCK_TTL segundos. Con
+# TICKET_CODE_ACCEPT_LEGACY las casetas siguen aceptando (con consulta)
+# los códigos libres emitidos antes de este formato.
+TICKET_CODE_BLOCK_SIZE = config("TICKET_CODE_BLOCK_SIZE", cast=int, default=32)
+TICKET_CODE_BLOCK_TTL = config("TICKET_CODE_BLOCK_TTL", cast=int, default=60)
+TICKET_CODE_ACCEPT_LEGACY = config(
+    "TICKET_CODE_ACCEPT_LEGACY", cast=bool, default=True)
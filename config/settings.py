@@ -3,8 +3,12 @@ from split_settings.tools import optional, include
 include(
     'components/base.py',
     'components/database.py',
+    'components/cache.py',
     'components/auth.py',
     'components/email.py',
+    'components/tickets.py',
+    'components/dashboard.py',
+    'components/instrumentation.py',
 
     optional('local_settings.py')
 )
\ No newline at end of file
@@ -4,5 +4,8 @@ from django.urls import path, include
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/', include('allauth.urls')),
+    path('gate/', include('apps.tickets.urls')),
+    path('instrumentation/', include('apps.common.urls')),
+    path('reports/', include('apps.reports.urls')),
     path('', include('apps.dashboard.urls')),
 ]
@@ -3,46 +3,88 @@
 (() => {
   'use strict'
 
-  // Graphs
-  const ctx = document.getElementById('myChart')
-  new Chart(ctx, {
-    type: 'line',
-    data: {
-      labels: [
-        'Sunday',
-        'Monday',
-        'Tuesday',
-        'Wednesday',
-        'Thursday',
-        'Friday',
-        'Saturday'
-      ],
-      datasets: [{
-        data: [
-          15339,
-          21345,
-          18483,
-          24003,
-          23489,
-          24092,
-          12034
-        ],
-        lineTension: 0,
-        backgroundColor: 'transparent',
-        borderColor: '#007bff',
-        borderWidth: 4,
-        pointBackgroundColor: '#007bff'
-      }]
-    },
-    options: {
-      plugins: {
-        legend: {
-          display: false
-        },
-        tooltip: {
-          boxPadding: 3
-        }
+  // Métricas en vivo: con el flujo SSE los eventos `counters` traen los
+  // incrementos y se suman a las tarjetas sin consultar al servidor; solo
+  // se pide /metrics/ al conectar, ante un `resync` (eventos perdidos) y
+  // cada chart-interval para el gráfico. Sin SSE (p. ej. bajo WSGI) se
+  // hace polling periódico. Se envía el ETag de la última respuesta y el
+  // servidor contesta 304 si nada cambió.
+  const container = document.getElementById('dashboard-metrics')
+  if (!container) {
+    return
+  }
+
+  const url = container.dataset.url
+  const interval = parseInt(container.dataset.interval, 10) || 15000
+  const chartInterval = parseInt(container.dataset.chartInterval, 10) || 60000
+  let etag = null
+
+  const render = (payload) => {
+    Object.entries(payload.metrics).forEach(([name, value]) => {
+      const element = container.querySelector(`[data-metric="${name}"]`)
+      if (element) {
+        element.textContent = value
+      }
+    })
+
+    const chart = window.occupancyChart
+    if (chart) {
+      chart.data.labels = payload.occupancy.labels
+      chart.data.datasets[0].data = payload.occupancy.average
+      chart.data.datasets[1].data = payload.occupancy.peak
+      chart.update('none')
+    }
+  }
+
+  const poll = async () => {
+    if (document.hidden) {
+      return
+    }
+    const headers = etag ? { 'If-None-Match': etag } : {}
+    try {
+      const response = await fetch(url, { headers, cache: 'no-store' })
+      if (response.status === 200) {
+        etag = response.headers.get('ETag')
+        render(await response.json())
+      }
+    } catch (error) {
+      // Sin conexión: se reintenta en el siguiente ciclo
+    }
+  }
+
+  const applyCounters = (event) => {
+    const payload = JSON.parse(event.data)
+    Object.entries(payload.metrics).forEach(([name, delta]) => {
+      const element = container.querySelector(`[data-metric="${name}"]`)
+      if (element) {
+        element.textContent = (parseInt(element.textContent, 10) || 0) + delta
+      }
+    })
+  }
+
+  let timer = null
+
+  const startPolling = (every) => {
+    clearInterval(timer)
+    timer = setInterval(poll, every)
+  }
+
+  const eventsUrl = container.dataset.eventsUrl
+  if (eventsUrl && window.EventSource) {
+    const source = new EventSource(eventsUrl)
+    source.onopen = () => {
+      // Valores absolutos al (re)conectar; luego solo incrementos
+      poll()
+      startPolling(chartInterval)
+    }
+    source.addEventListener('counters', applyCounters)
+    source.addEventListener('resync', poll)
+    source.onerror = () => {
+      startPolling(interval)
+      if (source.readyState === EventSource.CLOSED) {
+        source.close()
       }
     }
-  })
+  }
+  startPolling(interval)
 })()